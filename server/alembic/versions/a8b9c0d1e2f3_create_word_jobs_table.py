@@ -0,0 +1,49 @@
+"""create word_jobs table
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-16 00:00:00.000000
+
+Persistent queue for deferred word generation (/words/generate with defer=true).
+Workers (app/services/word_jobs.py) claim rows with FOR UPDATE SKIP LOCKED, so
+several instances can drain the queue without double-processing a word.
+
+RLS enabled with no policies (default-deny): word_jobs is the workers' queue state
+(attempts, last_error, locks); clients only see a job's outcome through the API.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, Sequence[str], None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create word_jobs table."""
+    op.create_table(
+        'word_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('word', sa.String(100), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.String(255), nullable=True),
+        sa.Column('available_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_word_jobs_word', 'word_jobs', ['word'], unique=True)
+    op.create_index('ix_word_jobs_status_available_at', 'word_jobs', ['status', 'available_at'])
+    op.execute("ALTER TABLE word_jobs ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop word_jobs table."""
+    op.drop_index('ix_word_jobs_status_available_at', table_name='word_jobs')
+    op.drop_index('ix_word_jobs_word', table_name='word_jobs')
+    op.drop_table('word_jobs')
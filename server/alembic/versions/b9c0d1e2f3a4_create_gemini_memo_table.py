@@ -0,0 +1,53 @@
+"""create gemini_memo table
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-17 00:00:00.000000
+
+Content-addressed store for GeminiService generations (app/services/gemini_memo.py):
+identical (method, model, prompt, generation config) requests reuse the stored
+response instead of calling the model again. TTL via expires_at, LRU eviction via
+last_used_at.
+
+RLS enabled with no policies (default-deny): gemini_memo holds full prompt and
+response bodies, which can include user-submitted text — backend-only.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, Sequence[str], None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create gemini_memo table."""
+    op.create_table(
+        'gemini_memo',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('key', sa.String(64), nullable=False),
+        sa.Column('method', sa.String(100), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('response_text', sa.Text(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_gemini_memo_key', 'gemini_memo', ['key'], unique=True)
+    op.create_index('ix_gemini_memo_method', 'gemini_memo', ['method'])
+    op.create_index('ix_gemini_memo_last_used_at', 'gemini_memo', ['last_used_at'])
+    op.execute("ALTER TABLE gemini_memo ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop gemini_memo table."""
+    op.drop_index('ix_gemini_memo_last_used_at', table_name='gemini_memo')
+    op.drop_index('ix_gemini_memo_method', table_name='gemini_memo')
+    op.drop_index('ix_gemini_memo_key', table_name='gemini_memo')
+    op.drop_table('gemini_memo')
@@ -0,0 +1,49 @@
+"""create word_stats table
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-17 00:00:00.000000
+
+Single-row running totals over words (count, gpt_generated count, usage sum) so
+/words/stats no longer aggregates the whole table on every call. Seeded here from
+the current table; app/services/word_stats.py keeps it in step afterwards.
+
+RLS enabled with no policies (default-deny): word_stats is a derived counter row
+that only the backend writes; /words/stats serves it to clients.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d1e2f3a4b5'
+down_revision: Union[str, Sequence[str], None] = 'b9c0d1e2f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create word_stats table and seed it from words."""
+    op.create_table(
+        'word_stats',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('total_words', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('gpt_generated', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_usage', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        INSERT INTO word_stats (id, total_words, gpt_generated, total_usage, updated_at)
+        SELECT 1, COUNT(*), COUNT(*) FILTER (WHERE gpt_generated), COALESCE(SUM(usage_count), 0), now()
+        FROM words
+        """
+    )
+    op.execute("ALTER TABLE word_stats ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop word_stats table."""
+    op.drop_table('word_stats')
@@ -0,0 +1,42 @@
+"""create rejected_words table
+
+Revision ID: c4d5e6f7a8b9
+Revises: 2c79a8bb7d61
+Create Date: 2026-10-16 00:00:00.000000
+
+Persistent negative cache for OCR tokens Gemini rejected as not-a-word (is_valid=false).
+WordService checks it (behind a long-TTL Redis key) before the Gemini stage.
+
+RLS enabled with no policies (default-deny), same as blog_topics/visits: internal data
+with no end-user PostgREST access path; the backend connects as the table owner.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, Sequence[str], None] = '2c79a8bb7d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create rejected_words table."""
+    op.create_table(
+        'rejected_words',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('word', sa.String(100), nullable=False),
+        sa.Column('reason', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_rejected_words_word', 'rejected_words', ['word'], unique=True)
+    op.execute("ALTER TABLE rejected_words ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop rejected_words table."""
+    op.drop_index('ix_rejected_words_word', table_name='rejected_words')
+    op.drop_table('rejected_words')
@@ -0,0 +1,63 @@
+"""create ocr_cache tables
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-17 00:00:00.000000
+
+Perceptual-hash cache of Gemini Vision OCR results (app/services/ocr_cache.py):
+near-duplicate photos of the same page reuse the stored word list. Each entry's
+144-bit dHash is also stored as 12 indexed 12-bit bands for the Hamming-distance
+candidate lookup; candidates are confirmed against the stored 32x32 page thumbnail
+(detail).
+
+RLS enabled with no policies (default-deny): ocr_cache_entries holds the text of
+pages users photographed (and their thumbnails) — it must never be readable outside
+the backend, and ocr_cache_bands is only its lookup index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, Sequence[str], None] = 'c0d1e2f3a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create ocr_cache_entries and ocr_cache_bands tables."""
+    op.create_table(
+        'ocr_cache_entries',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('image_hash', sa.String(64), nullable=False),
+        sa.Column('detail', sa.LargeBinary(), nullable=False),
+        sa.Column('words', sa.JSON(), nullable=False),
+        sa.Column('raw_text', sa.Text(), nullable=False, server_default=''),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_ocr_cache_entries_expires_at', 'ocr_cache_entries', ['expires_at'])
+    op.create_table(
+        'ocr_cache_bands',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('entry_id', sa.Integer(), sa.ForeignKey('ocr_cache_entries.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('band', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_ocr_cache_bands_entry_id', 'ocr_cache_bands', ['entry_id'])
+    op.create_index('ix_ocr_cache_bands_band_value', 'ocr_cache_bands', ['band', 'value'])
+    op.execute("ALTER TABLE ocr_cache_entries ENABLE ROW LEVEL SECURITY;")
+    op.execute("ALTER TABLE ocr_cache_bands ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop ocr_cache tables."""
+    op.drop_index('ix_ocr_cache_bands_band_value', table_name='ocr_cache_bands')
+    op.drop_index('ix_ocr_cache_bands_entry_id', table_name='ocr_cache_bands')
+    op.drop_table('ocr_cache_bands')
+    op.drop_index('ix_ocr_cache_entries_expires_at', table_name='ocr_cache_entries')
+    op.drop_table('ocr_cache_entries')
@@ -0,0 +1,36 @@
+"""add text_pattern_ops prefix index on words.word
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-16 00:00:00.000000
+
+The existing unique index on words.word uses the database collation, so under a
+non-C collation PostgreSQL can't use it for `LIKE 'q%'`. A text_pattern_ops index
+can. /words/search is served from the in-memory autocomplete index
+(app/services/word_index.py); this index keeps the direct SQL prefix queries
+(admin tools, ad-hoc lookups) off a sequential scan. postgresql_ops is ignored on
+other dialects (plain index).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, Sequence[str], None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create ix_words_word_pattern."""
+    op.create_index(
+        'ix_words_word_pattern', 'words', ['word'],
+        postgresql_ops={'word': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Drop ix_words_word_pattern."""
+    op.drop_index('ix_words_word_pattern', table_name='words')
@@ -0,0 +1,46 @@
+"""create word_forms table
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-16 00:00:00.000000
+
+Headword links for alternate forms (spelling variants / derivatives), filled from the
+파생어 column of seed_3000words.txt by seed_word_forms.py. WordService answers a variant
+("colour") with its headword's entry instead of generating a new word.
+
+RLS enabled with no policies (default-deny): word_forms is seed data only WordService
+reads — clients see a variant's headword entry, never the link rows themselves.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, Sequence[str], None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create word_forms table."""
+    op.create_table(
+        'word_forms',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('form', sa.String(100), nullable=False),
+        sa.Column('headword', sa.String(100), nullable=False),
+        sa.Column('relation', sa.String(20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_word_forms_form', 'word_forms', ['form'], unique=True)
+    op.create_index('ix_word_forms_headword', 'word_forms', ['headword'])
+    op.execute("ALTER TABLE word_forms ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop word_forms table."""
+    op.drop_index('ix_word_forms_headword', table_name='word_forms')
+    op.drop_index('ix_word_forms_form', table_name='word_forms')
+    op.drop_table('word_forms')
@@ -0,0 +1,46 @@
+"""add word_tombstones table and (updated_at, id) index on words
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-16 00:00:00.000000
+
+Backs GET /words/changes (app/services/word_changes.py): clients page through words
+created/updated after a cursor in (updated_at, id) order, and through word_tombstones
+for deletions in (deleted_at, id) order.
+
+RLS enabled with no policies (default-deny): word_tombstones feeds the public
+/words/changes sync endpoint, but only through the API (which pages and encodes the
+cursor) — no client should read or write the rows directly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, Sequence[str], None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create ix_words_updated_at_id and word_tombstones."""
+    op.create_index('ix_words_updated_at_id', 'words', ['updated_at', 'id'])
+    op.create_table(
+        'word_tombstones',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('word_id', sa.Integer(), nullable=False),
+        sa.Column('word', sa.String(100), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_word_tombstones_deleted_at_id', 'word_tombstones', ['deleted_at', 'id'])
+    op.execute("ALTER TABLE word_tombstones ENABLE ROW LEVEL SECURITY;")
+
+
+def downgrade() -> None:
+    """Drop word_tombstones and ix_words_updated_at_id."""
+    op.drop_index('ix_word_tombstones_deleted_at_id', table_name='word_tombstones')
+    op.drop_table('word_tombstones')
+    op.drop_index('ix_words_updated_at_id', table_name='words')
@@ -4,11 +4,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin_user
+from app.core.redis_client import get_redis_stats
+from app.services import gemini_memo, gemini_metrics, ocr_cache, word_cache
+from app.services.word_cache import word_l1
 from app.models.user import User
 from app.models.post import Post
 from app.schemas.post import PostCreate, PostUpdate, PostResponse
 from app.schemas.admin import (
     AdminStatsResponse, AdminUserListResponse, AdminPointListResponse,
+    AdminRejectedWordListResponse,
 )
 from app.schemas.visit import VisitStatsResponse
 from app.services.post_service import PostService
@@ -174,3 +178,68 @@ async def get_notifications(
 ):
     """Get notification counts for admin menu badges (admin only)"""
     return AdminService.get_notifications(db)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Word cache health: L1/Redis hit-miss counters, Redis state and DB-fallbacks, OCR cache hit rate (admin only)"""
+    return {
+        "word_l1": word_l1.stats(),
+        "redis": get_redis_stats(),
+        "ocr_cache": ocr_cache.get_stats(),
+        "gemini": gemini_metrics.get_stats()["totals"],
+    }
+
+
+@router.get("/gemini-metrics")
+async def get_gemini_metrics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Per-method Gemini latency histogram, tokens, cost, retries and parse failures on this instance (admin only)"""
+    return gemini_metrics.get_stats()
+
+
+@router.get("/gemini-memo")
+async def get_gemini_memo_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Memoized Gemini generations: entries and replay hits per method (admin only)"""
+    return {"methods": gemini_memo.stats(db)}
+
+
+@router.delete("/gemini-memo")
+async def invalidate_gemini_memo(
+    method: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Drop memoized Gemini generations — one method (e.g. tag_exam_passage) or all (admin only)"""
+    return {"deleted": gemini_memo.invalidate(db, method)}
+
+
+@router.get("/rejected-words", response_model=AdminRejectedWordListResponse)
+async def list_rejected_words(
+    limit: int = 20,
+    offset: int = 0,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """List tokens recorded as not English words (skipped before the Gemini stage) — admin only"""
+    items, total = AdminService.list_rejected_words(db, limit=limit, offset=offset, search=search)
+    return {"items": items, "total": total}
+
+
+@router.delete("/rejected-words/{word}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rejected_word(
+    word: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Admin override: forget a rejection so the word is generated on its next lookup"""
+    word = AdminService.delete_rejected_word(db, word)
+    # 모든 인스턴스의 음성 캐시(L1/Redis)에서도 지운다
+    await word_cache.invalidate([word])
@@ -54,6 +54,7 @@ from app.services.blog_service import (
     MAX_IMAGE_BYTES,
     MAX_ATTACHMENT_BYTES,
 )
+from app.services import gemini_memo
 from app.services.email_service import send_auto_publish_failure_email
 from app.services.gemini_service import GeminiService
 
@@ -822,12 +823,13 @@ async def generate_post(
     recent_posts = BlogService.get_recent_posts_for_prompt(db, category=category_hint, limit=12)
 
     gemini = GeminiService()
-    result = await gemini.generate_blog_post(
-        title=title,
-        angle=angle,
-        custom_prompt=payload.custom_prompt,
-        recent_posts=recent_posts,
-    )
+    with gemini_memo.bypass(payload.fresh):
+        result = await gemini.generate_blog_post(
+            title=title,
+            angle=angle,
+            custom_prompt=payload.custom_prompt,
+            recent_posts=recent_posts,
+        )
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -864,7 +866,8 @@ async def plan_images(
     Anchors that don't match a real `##` heading are dropped; hero is capped at 1.
     """
     gemini = GeminiService()
-    raw_plans = await gemini.plan_blog_images(payload.markdown)
+    with gemini_memo.bypass(payload.fresh):
+        raw_plans = await gemini.plan_blog_images(payload.markdown)
     validated = BlogService.validate_image_plans(raw_plans or [], payload.markdown)
     return BlogImagePlanResponse(
         plans=[BlogImagePlanItem(**p) for p in validated]
@@ -1007,7 +1010,8 @@ async def naver_version(
     source_url = f"https://scanvoca.com/blog/{payload.slug}"
 
     gemini = GeminiService()
-    result = await gemini.generate_naver_version(title=title, body=body, source_url=source_url)
+    with gemini_memo.bypass(payload.fresh):
+        result = await gemini.generate_naver_version(title=title, body=body, source_url=source_url)
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
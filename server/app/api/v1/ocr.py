@@ -1,12 +1,17 @@
 """OCR endpoints - Gemini Vision 기반 이미지에서 영단어 추출"""
+import asyncio
+import os
 import time
-from typing import List, Optional
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, sibling_session
 from app.core.dependencies import get_current_user
 from app.core.rate_limit import RateLimiter
+from app.core.streaming import ndjson_response
 from app.models.user import User
+from app.services import image_preprocess, ocr_cache, pdf_text
 from app.services.gemini_service import GeminiService
 from app.services.word_service import WordService
 from pydantic import BaseModel
@@ -15,6 +20,24 @@ router = APIRouter()
 
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_WORDS_PER_IMAGE = 50  # 비용 통제
+PDF_MIME_TYPE = "application/pdf"
+MAX_PDF_PAGES = 20
+MAX_PDF_WORDS = 200  # 텍스트 레이어는 Vision 비용이 없으니 더 받지만, 정의 생성은 여전히 비용
+PDF_RASTER_DPI = 150  # 텍스트 레이어 없는 페이지를 Vision에 보낼 때 (이후 image_preprocess가 다시 줄임)
+MAX_BATCH_PAGES = 10
+BATCH_VISION_CONCURRENCY = 3  # 한 요청에서 동시에 진행하는 Vision 호출 수
+_MULTIPART_SLACK = 64 * 1024  # 파트 헤더/경계 문자열
+
+# 요청 본문 한도 — main.py의 BodySizeLimitMiddleware가 받는 도중에 센다 (라우터 기준 경로)
+MAX_BODY_SIZES = {
+    "/scan": MAX_FILE_SIZE + _MULTIPART_SLACK,
+    "/scan/stream": MAX_FILE_SIZE + _MULTIPART_SLACK,
+    "/scan/batch": MAX_BATCH_PAGES * (MAX_FILE_SIZE + _MULTIPART_SLACK),
+}
+
+# /scan, /scan/stream, /scan/batch가 같은 한도를 쓴다 (batch는 페이지 수만큼 센다)
+_scan_limiter = RateLimiter(max_requests=20, window_seconds=3600, scope="ocr_scan")
 
 
 class WordResult(BaseModel):
@@ -25,56 +48,98 @@ class WordResult(BaseModel):
     source: str
 
 
+class OCRPageError(BaseModel):
+    page: int  # PDF 페이지 번호 (1부터)
+    error: str
+
+
 class OCRScanResponse(BaseModel):
     words: List[WordResult]
     raw_text: str
     processing_time: float
     total_extracted: int
     total_with_definitions: int
+    failed_pages: List[OCRPageError] = []  # PDF에서 Vision이 실패해 단어가 빠진 이미지 페이지
 
 
-@router.post("/scan", response_model=OCRScanResponse)
-async def scan_image(
-    image: UploadFile = File(..., description="영단어가 포함된 이미지 파일"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(RateLimiter(max_requests=20, window_seconds=3600, scope="ocr_scan")),
-):
-    """
-    이미지에서 영단어를 추출하고 각 단어의 정의를 반환합니다.
+class OCRPageResult(BaseModel):
+    page: int  # 업로드 순서 (0부터)
+    filename: Optional[str] = None
+    words: List[str]  # 이 페이지에서 추출한 단어 (읽는 순서)
+    raw_text: str = ""
+    error: Optional[str] = None  # 이 페이지만 Vision이 실패한 경우
 
-    🔒 인증 필수 (Bearer token)
 
-    - 이미지를 AI Vision으로 분석해 영단어 목록 추출
-    - 각 단어를 DB에서 검색하거나 AI로 정의 생성
-    - 지원 형식: JPEG, PNG, WebP, GIF (최대 10MB)
-    """
-    start_time = time.time()
+class BatchWordResult(WordResult):
+    pages: List[int]  # 이 단어가 나온 페이지들
+
+
+class OCRBatchScanResponse(BaseModel):
+    pages: List[OCRPageResult]
+    words: List[BatchWordResult]
+    processing_time: float
+    total_pages: int
+    total_extracted: int  # 페이지별 추출 수의 합 (페이지 간 중복 포함)
+    total_unique: int
+    total_with_definitions: int
+
+
+async def _open_upload(image: UploadFile, allow_pdf: bool = False) -> Tuple[BinaryIO, str]:
+    """Validate an upload without reading it into memory. Returns (file, content_type).
 
+    multipart 파일 파트는 이미 SpooledTemporaryFile(1MB가 넘으면 디스크)이므로 read()로 통째로
+    메모리에 올리지 않고 파일 그대로 전처리(image_preprocess)/PDF 파서에 넘긴다. 크기는 seek로 잰다.
+    """
     # 파일 타입 검증
     content_type = image.content_type or "image/jpeg"
-    if content_type not in ALLOWED_MIME_TYPES:
+    if content_type not in ALLOWED_MIME_TYPES and not (allow_pdf and content_type == PDF_MIME_TYPE):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"지원하지 않는 파일 형식입니다. 지원 형식: JPEG, PNG, WebP, GIF"
+            detail=f"지원하지 않는 파일 형식입니다. 지원 형식: JPEG, PNG, WebP, GIF{', PDF' if allow_pdf else ''}"
         )
 
-    # 파일 읽기
-    image_bytes = await image.read()
-    if len(image_bytes) > MAX_FILE_SIZE:
+    # 파일 크기 (읽지 않고 — multipart 파서가 채운 size, 없으면 끝으로 seek)
+    size = image.size
+    if size is None:
+        size = image.file.seek(0, os.SEEK_END)
+    image.file.seek(0)
+    if size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="파일 크기는 10MB를 초과할 수 없습니다."
         )
 
-    if len(image_bytes) == 0:
+    if size == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="빈 파일입니다."
         )
 
+    return image.file, content_type
+
+
+async def _ocr_image(
+    db: Session,
+    image: Union[bytes, BinaryIO],
+    content_type: str,
+    on_word: Optional[Callable[[str], None]] = None,
+) -> Tuple[List[str], str]:
+    """Run Vision OCR (or reuse a near-duplicate page's result). Returns (words — at most 50, raw_text).
+
+    on_word streams the Vision response (see extract_words_from_image); it isn't called on a cache hit.
+    """
+    # 회전/흑백/여백 자르기/축소 후 JPEG로 (워커 스레드, 실패하면 원본 그대로)
+    image_bytes, content_type = await image_preprocess.prepare(image, content_type)
+
+    # 같은 페이지를 다시 찍은 사진이면 이전 추출 결과를 쓴다 (지각 해시 캐시)
+    page_print = await ocr_cache.hash_upload(image_bytes)
+    cached = ocr_cache.lookup(db, page_print) if page_print is not None else None
+    if cached is not None:
+        return cached.words[:MAX_WORDS_PER_IMAGE], cached.raw_text
+
     # Gemini Vision으로 단어 추출
     gemini_service = GeminiService()
-    vision_result = await gemini_service.extract_words_from_image(image_bytes, content_type)
+    vision_result = await gemini_service.extract_words_from_image(image_bytes, content_type, on_word=on_word)
 
     if vision_result is None:
         raise HTTPException(
@@ -84,34 +149,198 @@ async def scan_image(
 
     extracted_words: List[str] = vision_result.get("words", [])
     raw_text: str = vision_result.get("raw_text", "")
+    if page_print is not None:
+        ocr_cache.store(db, page_print, extracted_words, raw_text)
+
+    # 최대 50개로 제한 (비용 통제)
+    return extracted_words[:MAX_WORDS_PER_IMAGE], raw_text
+
+
+async def _extract_words(
+    db: Session, image: UploadFile, on_word: Optional[Callable[[str], None]] = None
+) -> Tuple[List[str], str]:
+    """Validate the upload and run Vision OCR. Returns (words — at most 50, raw_text)."""
+    upload, content_type = await _open_upload(image)
+    return await _ocr_image(db, upload, content_type, on_word=on_word)
+
+
+async def _ocr_pdf(
+    db: Session,
+    pdf: Union[bytes, BinaryIO],
+    current_user: User,
+    on_word: Optional[Callable[[str], None]] = None,
+) -> Tuple[List[str], str, List[OCRPageError]]:
+    """Words of a PDF: the text layer is read locally; only pages without one go to Vision.
+    Returns (words — at most MAX_PDF_WORDS, page order, raw_text, image pages whose Vision call failed).
 
-    if not extracted_words:
-        return OCRScanResponse(
-            words=[],
-            raw_text=raw_text,
-            processing_time=round(time.time() - start_time, 2),
-            total_extracted=0,
-            total_with_definitions=0,
+    텍스트 레이어는 ingest_exam_pdfs와 같은 2단 재조합(pdf_text)으로 읽는다. 이미지뿐인 페이지는
+    렌더링해서 사진과 같은 경로(_ocr_image — 전처리, OCR 캐시, Vision)로 보내고, 그런 페이지가
+    여러 장이면 두 번째 장부터 스캔 한도를 한 장씩 더 센다 (/scan/batch와 같은 기준). 한도는
+    미리 세고, Vision이 실패한 페이지만큼 돌려준다. 이미지 페이지가 모두 실패하면 (텍스트
+    페이지가 있어도) 그 오류로 응답한다.
+    on_word: 첫 이미지 페이지 앞쪽 페이지들의 단어는 Vision을 기다리지 않고 바로 넘긴다.
+    """
+    try:
+        pages = await asyncio.to_thread(
+            pdf_text.read_pages, pdf, MAX_PDF_PAGES, PDF_RASTER_DPI, settings.OCR_JPEG_QUALITY
         )
+    except pdf_text.PdfError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    # 최대 50개로 제한 (비용 통제)
-    extracted_words = extracted_words[:50]
+    image_pages = [page for page in pages if page.image is not None]
+    if len(image_pages) > 1:
+        await _scan_limiter.charge(current_user, len(image_pages) - 1)
+
+    page_words: Dict[int, List[str]] = {}
+    page_texts: Dict[int, str] = {}
+    for page in pages:
+        if page.image is None:
+            page_words[page.number] = pdf_text.words_from_text(page.text)
+            page_texts[page.number] = page.text
+    if on_word:
+        first_image = image_pages[0].number if image_pages else len(pages) + 1
+        for number in range(1, first_image):
+            for word in page_words[number]:
+                on_word(word)
+
+    semaphore = asyncio.Semaphore(BATCH_VISION_CONCURRENCY)
+    errors: Dict[int, HTTPException] = {}
+
+    async def scan_page(page: pdf_text.PdfPage) -> None:
+        # 이미지 페이지들이 동시에 돌므로 OCR 캐시 조회/저장은 페이지마다 세션을 따로 쓴다
+        async with semaphore:
+            try:
+                with sibling_session(db) as page_db:
+                    page_words[page.number], page_texts[page.number] = await _ocr_image(
+                        page_db, page.image, "image/jpeg"
+                    )
+            except HTTPException as e:
+                errors[page.number] = e
+                page_words[page.number], page_texts[page.number] = [], ""
+
+    await asyncio.gather(*(scan_page(page) for page in image_pages))
+    if errors:
+        # 실패한 페이지는 한도에서 돌려준다 (요청 자체의 1회는 /scan과 같이 남긴다)
+        await _scan_limiter.refund(current_user, min(len(errors), len(image_pages) - 1))
+        if len(errors) == len(image_pages):
+            raise next(iter(errors.values()))  # 이미지 페이지의 Vision이 모두 실패
+
+    words: Dict[str, None] = {}
+    for number in sorted(page_words):
+        words.update(dict.fromkeys(page_words[number]))
+    raw_text = "\n".join(page_texts[number] for number in sorted(page_texts) if page_texts[number])
+    failed = [OCRPageError(page=number, error=str(errors[number].detail)) for number in sorted(errors)]
+    return list(words)[:MAX_PDF_WORDS], raw_text, failed
 
-    # 각 단어의 정의 조회/생성
+
+async def _define_batches(db: Session, queue: "asyncio.Queue[Optional[str]]", limit: int) -> Dict[str, dict]:
+    """Consume streamed words (None ends) in GEMINI_WORD_BATCH_SIZE batches → {word: get_or_create_words result}
+
+    추출(OCR 캐시)과 동시에 도는 태스크이므로 `db`와 같은 엔진의 세션을 따로 열어 쓴다.
+    """
     word_service = WordService()
-    batch_result = await word_service.get_or_create_words(db, extracted_words)
-
-    words_with_definitions: List[WordResult] = []
-    for item in batch_result.get("results", []):
-        data = item.get("data")
-        if data:
-            words_with_definitions.append(WordResult(
-                word=data.get("word", item["word"]),
-                pronunciation=data.get("pronunciation"),
-                difficulty=data.get("difficulty"),
-                meanings=data.get("meanings", []),
-                source=data.get("source", item.get("source", "unknown")),
-            ))
+    defined: Dict[str, dict] = {}
+    received = 0
+    finished = False
+    with sibling_session(db) as define_db:
+        while not finished:
+            batch: List[str] = []
+            while len(batch) < settings.GEMINI_WORD_BATCH_SIZE:
+                word = await queue.get()
+                if word is None:
+                    finished = True
+                    break
+                received += 1
+                key = word.lower()
+                if received <= limit and key not in defined and key not in batch:
+                    batch.append(key)
+            if batch:
+                result = await word_service.get_or_create_words(define_db, batch, correct_typos=True)
+                defined.update(zip(batch, result.get("results", [])))
+    return defined
+
+
+async def _extract_and_define(
+    db: Session, upload: BinaryIO, content_type: str, current_user: User
+) -> Tuple[List[str], str, List[dict], List[OCRPageError]]:
+    """_ocr_image (or _ocr_pdf) + get_or_create_words, overlapped.
+
+    Vision 응답을 스트리밍으로 받아 단어가 완성되는 대로 큐에 넣고, 다른 태스크가 묶음 단위로
+    캐시 → DB → Gemini 정의 단계에 보낸다 — 전체 시간이 (추출 + 정의)가 아니라 대략
+    max(추출, 정의) + 마지막 묶음이 된다. 최종 추출 결과가 기준이고, 스트리밍으로 받지 못한
+    단어(OCR 캐시 적중 등)는 마지막에 한 번에 조회한다.
+
+    Returns (extracted words, raw_text, one get_or_create_words result per extracted word,
+    PDF image pages whose Vision call failed).
+    """
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    if content_type == PDF_MIME_TYPE:
+        definer = asyncio.create_task(_define_batches(db, queue, MAX_PDF_WORDS))
+        extraction = _ocr_pdf(db, upload, current_user, on_word=queue.put_nowait)
+    else:
+        definer = asyncio.create_task(_define_batches(db, queue, MAX_WORDS_PER_IMAGE))
+        extraction = _ocr_image(db, upload, content_type, on_word=queue.put_nowait)
+    failed_pages: List[OCRPageError] = []
+    try:
+        if content_type == PDF_MIME_TYPE:
+            extracted_words, raw_text, failed_pages = await extraction
+        else:
+            extracted_words, raw_text = await extraction
+    except BaseException:
+        definer.cancel()
+        raise
+    queue.put_nowait(None)
+    defined = await definer
+
+    missing = [w for w in dict.fromkeys(w.lower() for w in extracted_words) if w not in defined]
+    if missing:
+        result = await WordService().get_or_create_words(db, missing, correct_typos=True)
+        defined.update(zip(missing, result.get("results", [])))
+    return extracted_words, raw_text, [defined[w.lower()] for w in extracted_words], failed_pages
+
+
+def _word_result(item: dict) -> Optional[WordResult]:
+    """WordResult for one get_or_create_words result (None if it has no definition)"""
+    data = item.get("data")
+    if not data:
+        return None
+    return WordResult(
+        word=data.get("word", item["word"]),
+        pronunciation=data.get("pronunciation"),
+        difficulty=data.get("difficulty"),
+        meanings=data.get("meanings", []),
+        source=data.get("source", item.get("source", "unknown")),
+    )
+
+
+@router.post("/scan", response_model=OCRScanResponse)
+async def scan_image(
+    image: UploadFile = File(..., description="영단어가 포함된 이미지 또는 PDF 파일"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(_scan_limiter),
+):
+    """
+    이미지에서 영단어를 추출하고 각 단어의 정의를 반환합니다.
+
+    🔒 인증 필수 (Bearer token)
+
+    - 이미지를 AI Vision으로 분석해 영단어 목록 추출
+    - 각 단어를 DB에서 검색하거나 AI로 정의 생성 (추출이 끝나기 전, 인식된 단어부터 시작)
+    - 지원 형식: JPEG, PNG, WebP, GIF, PDF (최대 10MB)
+    - PDF는 텍스트 레이어에서 바로 단어를 읽고 (Vision 호출 없음), 텍스트 레이어가 없는 페이지만
+      이미지로 렌더링해 AI Vision으로 분석 (최대 20페이지, 단어 최대 200개)
+    """
+    start_time = time.time()
+
+    upload, content_type = await _open_upload(image, allow_pdf=True)
+    # 단어 추출과 정의 조회/생성을 겹쳐서 진행 (Vision 스트리밍)
+    extracted_words, raw_text, results, failed_pages = await _extract_and_define(
+        db, upload, content_type, current_user
+    )
+
+    words_with_definitions: List[WordResult] = [
+        result for result in map(_word_result, results) if result
+    ]
 
     processing_time = round(time.time() - start_time, 2)
 
@@ -121,4 +350,123 @@ async def scan_image(
         processing_time=processing_time,
         total_extracted=len(extracted_words),
         total_with_definitions=len(words_with_definitions),
+        failed_pages=failed_pages,
+    )
+
+
+@router.post("/scan/stream")
+async def scan_image_stream(
+    image: UploadFile = File(..., description="영단어가 포함된 이미지 파일"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(_scan_limiter),
+):
+    """
+    /scan의 스트리밍 버전 (NDJSON, `application/x-ndjson`)
+
+    🔒 인증 필수 (Bearer token, /scan과 요청 한도 공유)
+
+    파일 검증/Vision 오류는 /scan과 같은 HTTP 오류로 응답한다. 그 뒤로는 한 줄씩:
+    1. `{"type": "ocr", "raw_text": ..., "total_extracted": n}`
+    2. 정의가 확정되는 대로 단어마다 `{"type": "word", "index": <추출 순서>, "word": ..., "meanings": [...], ...}`
+       (캐시 히트 → DB → AI 생성 순, 정의가 없는 토큰은 생략)
+    3. `{"type": "summary", "processing_time": ..., "total_with_definitions": ..., "cache_hits": ..., "db_hits": ..., "gemini_calls": ...}`
+    """
+    start_time = time.time()
+
+    extracted_words, raw_text = await _extract_words(db, image)
+
+    async def frames():
+        yield {"type": "ocr", "raw_text": raw_text, "total_extracted": len(extracted_words)}
+        with_definitions = 0
+        word_service = WordService()
+        async for frame in word_service.stream_words(
+            db, extracted_words, chunk_size=settings.GEMINI_WORD_BATCH_SIZE, correct_typos=True
+        ):
+            if frame["type"] == "summary":
+                yield {
+                    "type": "summary",
+                    "processing_time": round(time.time() - start_time, 2),
+                    "total_with_definitions": with_definitions,
+                    **{k: v for k, v in frame.items() if k != "type"},
+                }
+                continue
+            result = _word_result(frame)
+            if result:
+                with_definitions += 1
+                yield {"type": "word", "index": frame["index"], **result.model_dump()}
+
+    return ndjson_response(frames())
+
+
+@router.post("/scan/batch", response_model=OCRBatchScanResponse)
+async def scan_images_batch(
+    images: List[UploadFile] = File(..., description="영단어가 포함된 페이지 이미지들 (최대 10장)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    여러 페이지를 한 번에 스캔합니다 (유인물/교재 여러 장).
+
+    🔒 인증 필수 (Bearer token, /scan과 요청 한도 공유 — 페이지 한 장당 1회로 셉니다)
+
+    - 페이지마다 AI Vision 추출을 동시에(최대 3장씩) 진행
+    - 여러 페이지에 나온 단어는 한 번만 정의를 조회/생성하고, `pages`에 나온 페이지를 모두 표시
+    - 한 페이지의 Vision 실패는 그 페이지의 `error`로 알려주고 나머지는 계속 (전부 실패하면 503)
+    - 페이지별 단어 상한(50개)은 /scan과 같습니다
+    """
+    start_time = time.time()
+
+    if len(images) > MAX_BATCH_PAGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {MAX_BATCH_PAGES}장까지 스캔할 수 있습니다."
+        )
+    # 파일을 모두 검증한 뒤에 한도를 센다 (잘못된 파일이 섞인 요청은 한도를 쓰지 않음)
+    uploads = [await _open_upload(image) for image in images]
+    await _scan_limiter.charge(current_user, len(images))
+    semaphore = asyncio.Semaphore(BATCH_VISION_CONCURRENCY)
+
+    async def scan_page(page: int, upload: BinaryIO, content_type: str) -> OCRPageResult:
+        filename = images[page].filename
+        # 페이지들이 동시에 돌므로 OCR 캐시 조회/저장은 페이지마다 세션을 따로 쓴다
+        async with semaphore:
+            try:
+                with sibling_session(db) as page_db:
+                    words, raw_text = await _ocr_image(page_db, upload, content_type)
+            except HTTPException as e:
+                return OCRPageResult(page=page, filename=filename, words=[], error=e.detail)
+        return OCRPageResult(page=page, filename=filename, words=words, raw_text=raw_text)
+
+    pages = await asyncio.gather(*(scan_page(i, upload, ctype) for i, (upload, ctype) in enumerate(uploads)))
+    if all(p.error for p in pages):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI 분석 서비스를 사용할 수 없습니다. AI API 키를 확인하세요."
+        )
+
+    # 페이지 간 중복 제거 (처음 나온 순서 유지) → 정의 조회/생성은 한 번에
+    word_pages: Dict[str, List[int]] = {}
+    for page in pages:
+        for word in page.words:
+            key = word.strip().lower()
+            if key and page.page not in word_pages.setdefault(key, []):
+                word_pages[key].append(page.page)
+    unique_words = list(word_pages)
+
+    words_with_definitions: List[BatchWordResult] = []
+    if unique_words:
+        batch_result = await WordService().get_or_create_words(db, unique_words, correct_typos=True)
+        for word, item in zip(unique_words, batch_result.get("results", [])):
+            result = _word_result(item)
+            if result:
+                words_with_definitions.append(BatchWordResult(**result.model_dump(), pages=word_pages[word]))
+
+    return OCRBatchScanResponse(
+        pages=pages,
+        words=words_with_definitions,
+        processing_time=round(time.time() - start_time, 2),
+        total_pages=len(pages),
+        total_extracted=sum(len(p.words) for p in pages),
+        total_unique=len(unique_words),
+        total_with_definitions=len(words_with_definitions),
     )
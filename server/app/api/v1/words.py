@@ -1,13 +1,18 @@
 """Words API endpoints"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.rate_limit import RateLimiter
+from app.core.streaming import ndjson_response
 from app.models.user import User
 from app.models.word import Word
-from app.schemas.word import WordGenerateRequest, WordGenerateResponse, WordResponse
+from app.schemas.word import (
+    WordChangesResponse, WordGenerateRequest, WordGenerateResponse, WordJobStatusResponse, WordResponse,
+)
+from app.services import gemini_metrics, word_changes, word_index, word_snapshot, word_stats, word_usage
 from app.services.word_service import WordService
 
 router = APIRouter()
@@ -30,6 +35,9 @@ async def generate_words(
 
     This endpoint drastically reduces GPT API costs by caching results.
 
+    - **defer**: words that need generating are queued instead of waited for
+      (`queued: true`, `source: "queued"`); poll /words/jobs for their definitions
+
     Returns:
     - results: List of word results with source information
     - cache_hits: Number of cache hits (Redis)
@@ -37,11 +45,36 @@ async def generate_words(
     - gpt_calls: Number of new GPT API calls
     """
     word_service = WordService()
-    result = await word_service.get_or_create_words(db, request.words)
+    result = await word_service.get_or_create_words(db, request.words, defer=request.defer)
 
     return result
 
 
+@router.post("/generate/stream")
+async def generate_words_stream(
+    request: WordGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(RateLimiter(max_requests=30, window_seconds=3600, scope="words_generate")),
+):
+    """
+    Streaming variant of /generate (NDJSON, `application/x-ndjson`)
+
+    🔒 PROTECTED ENDPOINT (Authentication required, shares /generate's rate limit)
+
+    One line per input word as soon as it resolves — cache hits first, then DB hits,
+    then generated words as each Gemini batch finishes:
+    `{"type": "result", "index": <position in words>, "word": ..., "source": ..., "data": ...}`
+
+    Last line: `{"type": "summary", "cache_hits": ..., "db_hits": ..., "gemini_calls": ...}`
+    """
+    word_service = WordService()
+    return ndjson_response(
+        word_service.stream_words(
+            db, request.words, chunk_size=settings.GEMINI_WORD_BATCH_SIZE, defer=request.defer
+        )
+    )
+
+
 @router.get("/stats")
 async def get_stats(
     db: Session = Depends(get_db),
@@ -50,26 +83,22 @@ async def get_stats(
     """
     Get GPT caching statistics
 
-    Returns cache hit rate, total words, and cost savings estimate
+    Returns cache hit rate, total words, and cost savings (observed Gemini cost per word)
     """
-    from sqlalchemy import func
-    from app.models.word import Word
-
-    # Total words in DB
-    total_words = db.query(func.count(Word.id)).scalar()
-
-    # GPT generated words
-    gpt_words = db.query(func.count(Word.id)).filter(Word.gpt_generated == True).scalar()
+    # Materialized counters (one row) instead of aggregating the whole words table
+    counters = word_stats.get(db)
+    total_words = counters["total_words"]
+    gpt_words = counters["gpt_generated"]
 
-    # Average usage count
-    avg_usage = db.query(func.avg(Word.usage_count)).scalar() or 0
+    # Usage: DB + increments counted but not flushed yet (write-behind)
+    total_usage = counters["total_usage"] + await word_usage.pending_total()
+    avg_usage = total_usage / total_words if total_words else 0
 
-    # Estimated cost savings
-    # Assume $0.01 per GPT call (gpt-4o-mini)
-    # Each cached word saves one GPT call
-    total_usage = db.query(func.sum(Word.usage_count)).scalar() or 0
+    # Cost savings: each lookup served from the cache/DB saves one word definition.
+    # 단어당 비용은 이 인스턴스에서 관측한 Gemini 비용(토큰 × 단가)이다 — 아직 정의 호출이 없으면 None.
     saved_calls = total_usage - total_words if total_usage > total_words else 0
-    cost_saved = saved_calls * 0.01
+    cost_per_word = gemini_metrics.cost_per_word()
+    cost_saved = round(saved_calls * cost_per_word, 4) if cost_per_word is not None else None
 
     return {
         "total_words": total_words,
@@ -78,7 +107,8 @@ async def get_stats(
         "total_usage": total_usage,
         "avg_usage_per_word": round(avg_usage, 2),
         "cache_hit_rate": round((saved_calls / total_usage * 100), 2) if total_usage > 0 else 0,
-        "estimated_cost_saved_usd": round(cost_saved, 2)
+        "cost_per_word_usd": round(cost_per_word, 6) if cost_per_word is not None else None,
+        "estimated_cost_saved_usd": cost_saved,
     }
 
 
@@ -90,25 +120,89 @@ async def search_words(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Search words by keyword
+    Search words by keyword (autocomplete)
 
     🔒 PROTECTED ENDPOINT (Authentication required)
 
-    - **q**: Search query (matches word field)
+    - **q**: Search query (prefix of the word field, case-insensitive)
     - **limit**: Maximum number of results (default 20, max 100)
 
-    Returns list of matching words
+    Returns matching words, most used first (then easier difficulty, then alphabetical).
+    Served from the in-memory prefix index; only the result rows are read from the DB.
+    """
+    return word_index.search(db, q, limit)
+
+
+@router.get("/snapshot")
+async def get_snapshot(
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download the whole dictionary for offline lookups
+
+    🔒 PROTECTED ENDPOINT (Authentication required)
+
+    Body: gzip-compressed JSON (`Content-Encoding: gzip`)
+    `{"format": 1, "version": "...", "fields": ["id", "word", ...], "words": [[...], ...]}`
+
+    Send the last ETag back in **If-None-Match**; 304 (no body) while the dictionary is unchanged.
     """
-    from sqlalchemy import or_
+    snapshot = await word_snapshot.get(db)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "private, no-cache",
+        "X-Word-Count": str(snapshot.word_count),
+    }
+    if word_snapshot.etag_matches(if_none_match, snapshot):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
 
-    # Search words starting with query (case-insensitive)
-    query_lower = q.lower()
+@router.get("/jobs", response_model=List[WordJobStatusResponse])
+async def get_generation_jobs(
+    words: List[str] = Query(..., min_length=1, max_length=50, description="Words requested with defer=true"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Poll words queued by /generate with defer=true
 
-    words = db.query(Word).filter(
-        Word.word.like(f"{query_lower}%")
-    ).limit(limit).all()
+    🔒 PROTECTED ENDPOINT (Authentication required)
 
-    return words
+    One entry per word (same order): `done` (with `data`), `pending`, `running`,
+    `failed` (re-request with /generate to retry), `invalid` (not an English word) or
+    `unknown` (not queued).
+    """
+    word_service = WordService()
+    return await word_service.get_generation_status(db, words)
+
+
+@router.get("/changes", response_model=WordChangesResponse)
+async def get_changes(
+    since: Optional[str] = Query(None, description="Cursor from the snapshot or the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=2000, description="Maximum words (and deletions) per page"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Words added/updated/deleted since a cursor (incremental sync)
+
+    🔒 PROTECTED ENDPOINT (Authentication required)
+
+    - **since**: `cursor` from /words/snapshot or `next_cursor` from the previous page
+      (omit to page through the whole dictionary)
+    - **limit**: page size (default 500)
+
+    Keep requesting with `next_cursor` while `has_more` is true, then store it for next time.
+    """
+    try:
+        page = word_changes.get_changes(db, since, limit or settings.WORD_CHANGES_PAGE_SIZE)
+    except word_changes.InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return WordChangesResponse.model_validate(page, from_attributes=True)
 
 
 @router.get("/{word_id}", response_model=WordResponse)
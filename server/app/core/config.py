@@ -17,6 +17,64 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # 이 시간(초) 이상 놀던 연결은 사용 전에 PING으로 확인
+    REDIS_RECONNECT_BACKOFF_MAX_SECONDS: float = 30.0  # 연결 실패 후 재시도 간격 상한 (1s부터 2배씩)
+
+    # 단어 사전 L1 (프로세스 메모리 LRU, Redis 앞단)
+    # 다른 인스턴스의 변경은 Redis pub/sub로 즉시 무효화되고, Redis가 없을 때도 TTL 이상 낡지 않는다.
+    WORD_L1_MAX_ENTRIES: int = 5000
+    WORD_L1_TTL_SECONDS: int = 300
+
+    # 같은 새 단어를 여러 인스턴스가 동시에 생성하지 않도록 잡는 Redis 리스(초)와,
+    # 리스를 못 잡은 쪽이 상대의 커밋을 기다리는 최대 시간(초). 넘으면 직접 생성한다.
+    WORD_GENERATION_LEASE_SECONDS: int = 30
+    WORD_GENERATION_WAIT_SECONDS: float = 15.0
+
+    # Gemini가 단어가 아니라고 판정한 OCR 토큰의 Redis 부정 캐시 TTL (기본 30일).
+    # 영구 기록은 rejected_words 테이블에 있고, 관리자가 행을 지우면 다시 생성 대상이 된다.
+    WORD_REJECTED_CACHE_TTL_SECONDS: int = 30 * 86400
+
+    # /words/search 자동완성 인덱스 (프로세스 메모리의 정렬 배열)
+    # 다른 인스턴스가 추가/수정한 단어는 REFRESH 주기마다 updated_at 기준으로 증분 반영된다.
+    # 접두어 길이가 MEMO_PREFIX_LEN 이하인 검색(결과 후보가 많은 'a', 'ab' 등)은 상위 결과를 메모해 둔다.
+    WORD_INDEX_REFRESH_SECONDS: int = 60  # 0이면 주기 갱신 끔
+    WORD_INDEX_MEMO_PREFIX_LEN: int = 2
+
+    # OCR 오타 교정 (SymSpell) — 유효한 단어가 아니라고 판정된 OCR 토큰 중 사전의 자주 쓰이는
+    # 단어와 편집 거리 1~2인 것은 그 단어로 해석한다. MAX_DISTANCE=0이면 끔. 사전은
+    # usage_count >= MIN_USAGE인 상위 MAX_TERMS개 단어이며 REBUILD_SECONDS마다 다시 만든다.
+    WORD_FUZZY_MAX_DISTANCE: int = 2
+    WORD_FUZZY_MIN_USAGE: int = 10
+    WORD_FUZZY_MAX_TERMS: int = 5000
+    WORD_FUZZY_REBUILD_SECONDS: int = 600
+
+    # usage_count 쓰기 지연(write-behind): 요청은 증가분만 누적(Redis HINCRBY / 메모리)하고
+    # 이 주기(초)마다 한 번의 UPDATE로 DB에 반영한다. 0이면 주기 flush 끔.
+    USAGE_FLUSH_INTERVAL_SECONDS: int = 10
+
+    # /words/changes 증분 동기화: 최근 SETTLE_SECONDS 안에 바뀐 행은 다음 요청으로 미룬다.
+    # 먼저 시작했지만 늦게 커밋된 트랜잭션의 행이 커서 뒤로 밀려 영영 빠지는 것을 막는다.
+    WORD_CHANGES_SETTLE_SECONDS: int = 5
+    WORD_CHANGES_PAGE_SIZE: int = 500
+
+    # 지연 생성 큐 (/words/generate defer=true): 모르는 단어는 word_jobs에 넣고 바로 queued로 응답,
+    # lifespan 워커가 POLL_SECONDS마다 최대 BATCH_LIMIT개를 가져가 생성한다. 실패하면
+    # RETRY_BASE_SECONDS * 2^(시도-1) 뒤에 단어 하나씩 재시도, MAX_ATTEMPTS번 실패하면 failed.
+    # 워커가 죽어도 LEASE_SECONDS가 지나면 다른 인스턴스가 다시 가져간다. POLL_SECONDS=0이면 워커 끔.
+    WORD_JOB_POLL_SECONDS: float = 2.0
+    WORD_JOB_BATCH_LIMIT: int = 50
+    WORD_JOB_MAX_ATTEMPTS: int = 5
+    WORD_JOB_RETRY_BASE_SECONDS: int = 10
+    WORD_JOB_LEASE_SECONDS: int = 120
+
+    # 시작 시 캐시 워밍: usage_count 상위 TOP_N개를 L1/Redis에 미리 채운다 (0이면 끔).
+    # 시작이 BUDGET_SECONDS 넘게 늦어지지 않도록 그 안에서 채운 만큼만 채운다.
+    # WORD_WARMUP_FILE(build_warmup_file.py로 생성)이 있고 MAX_AGE_HOURS 이내면 DB 대신 파일로 L1을 채운다.
+    WORD_WARMUP_TOP_N: int = 2000
+    WORD_WARMUP_BUDGET_SECONDS: float = 3.0
+    WORD_WARMUP_FILE: str = ""
+    WORD_WARMUP_FILE_MAX_AGE_HOURS: int = 24
 
     # JWT
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -26,6 +84,28 @@ class Settings(BaseSettings):
 
     # Google Gemini
     GEMINI_API_KEY: Optional[str] = None
+    # 동시에 진행할 수 있는 Gemini 호출 수 상한 (전용 스레드 풀 크기).
+    # OCR 스캔의 미등록 단어들이 이 개수만큼 병렬로 생성되고, 나머지는 풀에서 대기한다.
+    GEMINI_MAX_CONCURRENCY: int = 8
+    # 한 번의 프롬프트로 정의를 생성할 단어 수 (배치 정의 생성). 1이면 단어별 단일 호출.
+    GEMINI_WORD_BATCH_SIZE: int = 10
+    # 블로그/기출 태깅 생성 결과 메모 (gemini_memo 테이블): 같은 메서드·모델·프롬프트·설정이면
+    # 저장된 응답을 재사용한다. TTL_SECONDS=0이면 끔. MAX_ENTRIES를 넘으면 오래 안 쓴 것부터 지운다.
+    GEMINI_MEMO_TTL_SECONDS: int = 30 * 86400
+    GEMINI_MEMO_MAX_ENTRIES: int = 2000
+    # OCR 업로드 전처리 (Vision 요청 전, 워커 스레드): EXIF 회전 → 흑백 → 여백 자르기 →
+    # 긴 변을 MAX_LONG_EDGE px 이하로 축소 → JPEG(QUALITY) 재인코딩. 값은 benchmark_ocr_preprocess.py로 고른다.
+    OCR_PREPROCESS_ENABLED: bool = True
+    OCR_MAX_LONG_EDGE: int = 1600
+    OCR_JPEG_QUALITY: int = 85
+    OCR_GRAYSCALE: bool = True
+    OCR_CROP_MARGINS: bool = True
+    # OCR 결과 캐시: 같은 페이지를 다시 찍은 사진(기울기 보정한 144비트 dHash의 해밍 거리 <= MAX_DISTANCE
+    # 이고 글자 부분 축소본이 MAX_DETAIL_DIFF 이하로 다름)은 Vision을 부르지 않고 저장된 단어 목록을 쓴다.
+    # TTL_SECONDS=0이면 끔. MAX_DISTANCE는 11까지.
+    OCR_CACHE_TTL_SECONDS: int = 7 * 86400
+    OCR_CACHE_MAX_DISTANCE: int = 8
+    OCR_CACHE_MAX_DETAIL_DIFF: float = 8.0
 
     # Google OAuth (구글 로그인 ID 토큰 검증용)
     GOOGLE_CLIENT_ID: Optional[str] = None
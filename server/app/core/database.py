@@ -30,6 +30,12 @@ else:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def sibling_session(db: Session) -> Session:
+    """A new session on `db`'s engine, for tasks that run concurrently with `db`'s user
+    (a Session is not safe to use from two tasks at once). Close it when done."""
+    return SessionLocal(bind=db.get_bind())
+
+
 def get_db() -> Generator[Session, None, None]:
     """Get database session dependency for FastAPI"""
     db = SessionLocal()
@@ -7,6 +7,7 @@ import time
 from collections import defaultdict
 
 from fastapi import Depends, HTTPException, Request, status
+from redis.exceptions import RedisError
 
 from app.core.dependencies import get_current_user
 from app.core.redis_client import get_redis
@@ -16,13 +17,21 @@ from app.models.user import User
 _memory_buckets: dict[str, list[float]] = defaultdict(list)
 
 
-def _check_and_increment(key: str, max_requests: int, window_seconds: int) -> None:
-    """Shared bucket check/increment - raises 429 if the limit for `key` is exceeded"""
-    client = get_redis()
+async def _check_and_increment(key: str, max_requests: int, window_seconds: int, amount: int = 1) -> None:
+    """Shared bucket check/increment by `amount` - raises 429 if the limit for `key` is exceeded"""
+    client = await get_redis()
+    count = None
     if client is not None:
-        count = client.incr(key)
-        if count == 1:
-            client.expire(key, window_seconds)
+        try:
+            count = await client.incrby(key, amount)
+            if count == amount:
+                await client.expire(key, window_seconds)
+        except (RedisError, OSError) as e:
+            # Redis가 요청 도중 끊겨도 500 대신 메모리 버킷으로 계속 제한한다
+            print(f"Redis rate-limit error, using in-memory bucket: {e}")
+            count = None
+
+    if count is not None:
         if count > max_requests:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -34,12 +43,26 @@ def _check_and_increment(key: str, max_requests: int, window_seconds: int) -> No
         cutoff = now - window_seconds
         while bucket and bucket[0] < cutoff:
             bucket.pop(0)
-        if len(bucket) >= max_requests:
+        if len(bucket) + amount > max_requests:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
             )
-        bucket.append(now)
+        bucket.extend([now] * amount)
+
+
+async def _refund(key: str, amount: int) -> None:
+    """Give back `amount` counted requests (work that was charged up front but never done)"""
+    client = await get_redis()
+    if client is not None:
+        try:
+            if await client.decrby(key, amount) < 0:
+                await client.set(key, 0, keepttl=True)
+            return
+        except (RedisError, OSError) as e:
+            print(f"Redis rate-limit refund error, using in-memory bucket: {e}")
+    bucket = _memory_buckets[key]
+    del bucket[max(0, len(bucket) - amount):]
 
 
 class RateLimiter:
@@ -53,11 +76,20 @@ class RateLimiter:
         self.window_seconds = window_seconds
         self.scope = scope
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> User:
-        key = f"ratelimit:{self.scope}:{current_user.id}"
-        _check_and_increment(key, self.max_requests, self.window_seconds)
+    async def __call__(self, current_user: User = Depends(get_current_user)) -> User:
+        await self.charge(current_user)
         return current_user
 
+    async def charge(self, current_user: User, amount: int = 1) -> None:
+        """Count `amount` requests at once (e.g. one per page of a multi-page upload)"""
+        key = f"ratelimit:{self.scope}:{current_user.id}"
+        await _check_and_increment(key, self.max_requests, self.window_seconds, amount)
+
+    async def refund(self, current_user: User, amount: int = 1) -> None:
+        """Undo `amount` of an earlier charge (e.g. pages that were charged but failed)"""
+        if amount > 0:
+            await _refund(f"ratelimit:{self.scope}:{current_user.id}", amount)
+
 
 class IPRateLimiter:
     """FastAPI dependency that rate-limits by client IP (for pre-auth endpoints).
@@ -70,7 +102,7 @@ class IPRateLimiter:
         self.window_seconds = window_seconds
         self.scope = scope
 
-    def __call__(self, request: Request) -> None:
+    async def __call__(self, request: Request) -> None:
         client_ip = request.client.host if request.client else "unknown"
         key = f"ratelimit:{self.scope}:ip:{client_ip}"
-        _check_and_increment(key, self.max_requests, self.window_seconds)
+        await _check_and_increment(key, self.max_requests, self.window_seconds)
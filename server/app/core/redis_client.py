@@ -1,47 +1,162 @@
-"""Redis client for caching"""
+"""Redis client for caching
+
+redis.asyncio 커넥션 풀 기반. 캐시 조회가 이벤트 루프를 막지 않도록 모든 호출을 await한다.
+
+연결 실패는 영구 실패로 기록하지 않는다 — 예전에는 최초 ping 한 번만 실패해도
+`redis_client = False`가 되어 그 인스턴스가 살아 있는 동안 캐시(와 정확한 rate limit)가
+통째로 꺼졌다. 지금은 실패 시 지수 백오프(최대 REDIS_RECONNECT_BACKOFF_MAX_SECONDS)
+동안만 Redis를 건너뛰고, 그 뒤 다음 호출에서 다시 연결을 시도한다.
+Redis를 건너뛰고 DB로 바로 간 조회 수 등은 get_redis_stats()로 확인할 수 있다.
+"""
+import asyncio
 import json
-from typing import Optional, Any, Union
-from redis import Redis, RedisError
+import time
+import uuid
+from typing import Optional, Any, Dict, List, Callable
+from redis.asyncio import Redis, ConnectionPool
+from redis.exceptions import (
+    RedisError, ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError,
+)
 from app.core.config import settings
 
-# Redis client instance (optional)
-# None means not checked yet, False means checked and failed, Redis instance means connected
-redis_client: Union[Redis, bool, None] = None
+_RECONNECT_BACKOFF_BASE_SECONDS = 1.0
 
+# 연결 상태. 커넥션 풀은 자신을 만든 이벤트 루프에 묶이므로 루프도 함께 기억한다.
+_client: Optional[Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_connect_lock: Optional[asyncio.Lock] = None
+_connect_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+_consecutive_failures = 0
+_retry_at = 0.0  # time.monotonic() 기준 — 이 시각 전까지는 재연결을 시도하지 않는다
+_last_error: Optional[str] = None
 
-def get_redis() -> Optional[Redis]:
-    """Get Redis client (returns None if Redis is not available)"""
-    global redis_client
+# 누적 카운터 (프로세스 단위)
+_stats: Dict[str, int] = {
+    "hits": 0,            # Redis에서 찾은 키
+    "misses": 0,          # Redis에 없던 키
+    "fallbacks": 0,       # Redis를 쓸 수 없어 조회 없이 DB로 넘어간 키
+    "errors": 0,          # 명령 실행 중 오류
+    "connects": 0,        # 연결(재연결 포함) 성공
+    "connect_failures": 0,
+}
 
-    # 이미 확인했고 연결 실패한 경우 즉시 None 반환 (타임아웃 방지)
-    if redis_client is False:
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
         return None
 
-    # 이미 연결된 경우 반환
-    if isinstance(redis_client, Redis):
-        return redis_client
 
-    # 최초 연결 시도
-    if redis_client is None:
+def _discard_client() -> None:
+    """Forget the current client and close its pool in the background (best effort)."""
+    global _client, _client_loop
+    old, _client, _client_loop = _client, None, None
+    if old is not None and _current_loop() is not None:
+        asyncio.ensure_future(_close_quietly(old))
+
+
+async def _close_quietly(client: Redis) -> None:
+    try:
+        await client.aclose()
+    except Exception:
+        pass
+
+
+def _mark_down(error: Exception) -> None:
+    """Record a connection-level failure and start/extend the reconnect backoff window."""
+    global _consecutive_failures, _retry_at, _last_error
+    _consecutive_failures += 1
+    delay = min(
+        settings.REDIS_RECONNECT_BACKOFF_MAX_SECONDS,
+        _RECONNECT_BACKOFF_BASE_SECONDS * (2 ** (_consecutive_failures - 1)),
+    )
+    _retry_at = time.monotonic() + delay
+    _last_error = str(error)
+    _discard_client()
+
+
+def _handle_command_error(error: Exception, op: str) -> None:
+    _stats["errors"] += 1
+    print(f"Redis {op} error: {error}")
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError)):
+        _mark_down(error)
+
+
+async def get_redis() -> Optional[Redis]:
+    """Get Redis client (returns None if Redis is not available right now)"""
+    global _client, _client_loop, _connect_lock, _connect_lock_loop, _consecutive_failures, _last_error
+
+    loop = _current_loop()
+    if _client is not None and _client_loop is not loop:
+        _discard_client()
+    if _client is not None:
+        return _client
+
+    # 백오프 중이면 즉시 None (요청마다 연결 타임아웃을 기다리지 않도록)
+    if time.monotonic() < _retry_at:
+        return None
+
+    if _connect_lock is None or _connect_lock_loop is not loop:
+        _connect_lock, _connect_lock_loop = asyncio.Lock(), loop
+
+    async with _connect_lock:
+        if _client is not None:
+            return _client
+        if time.monotonic() < _retry_at:
+            return None
         try:
-            client = Redis.from_url(
+            pool = ConnectionPool.from_url(
                 settings.REDIS_URL,
                 decode_responses=True,
-                socket_connect_timeout=0.5,  # 1초 → 0.5초로 더 단축
-                socket_timeout=0.5
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
             )
-            # Test connection
-            client.ping()
-            redis_client = client
-            print(f"OK: Redis connected: {settings.REDIS_URL}")
-            return redis_client
-        except (RedisError, Exception) as e:
+            client = Redis(connection_pool=pool)
+            await client.ping()
+        except (RedisError, OSError) as e:
+            _stats["connect_failures"] += 1
             print(f"WARNING: Redis not available: {e}")
-            print("INFO: Continuing without Redis cache (DB only)")
-            redis_client = False  # 실패 표시
+            print("INFO: Continuing without Redis cache (DB only), will retry later")
+            _mark_down(e)
             return None
 
-    return None
+        _client, _client_loop = client, loop
+        _consecutive_failures = 0
+        _last_error = None
+        _stats["connects"] += 1
+        print(f"OK: Redis connected: {settings.REDIS_URL}")
+        return _client
+
+
+async def close_redis() -> None:
+    """Close the pool (application shutdown)"""
+    global _client, _client_loop
+    old, _client, _client_loop = _client, None, None
+    if old is not None:
+        await _close_quietly(old)
+
+
+def get_redis_stats() -> Dict[str, Any]:
+    """Connection state + cache counters for the admin dashboard"""
+    lookups = _stats["hits"] + _stats["misses"] + _stats["fallbacks"]
+    if _client is not None:
+        state = "connected"
+    elif time.monotonic() < _retry_at:
+        state = "backoff"
+    else:
+        state = "disconnected"
+    return {
+        "state": state,
+        "consecutive_failures": _consecutive_failures,
+        "retry_in_seconds": round(max(0.0, _retry_at - time.monotonic()), 1),
+        "last_error": _last_error,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups * 100, 2) if lookups else 0,
+        "fallback_rate": round(_stats["fallbacks"] / lookups * 100, 2) if lookups else 0,
+    }
 
 
 async def get_cached(key: str) -> Optional[dict]:
@@ -49,46 +164,297 @@ async def get_cached(key: str) -> Optional[dict]:
     Get cached data from Redis
     Returns None if not found or Redis unavailable
     """
-    client = get_redis()
+    client = await get_redis()
     if client is None:
+        _stats["fallbacks"] += 1
         return None
 
     try:
-        data = client.get(key)
+        data = await client.get(key)
         if data:
+            _stats["hits"] += 1
             return json.loads(data)
-    except (RedisError, json.JSONDecodeError) as e:
-        print(f"Redis get error: {e}")
+        _stats["misses"] += 1
+    except (RedisError, OSError, json.JSONDecodeError) as e:
+        _handle_command_error(e, "get")
 
     return None
 
 
+async def get_cached_many(keys: List[str]) -> Dict[str, dict]:
+    """
+    Get many cached entries with a single MGET round-trip
+    Returns {key: data} for the keys that were found (missing/undecodable keys are omitted)
+    """
+    if not keys:
+        return {}
+
+    client = await get_redis()
+    if client is None:
+        _stats["fallbacks"] += len(keys)
+        return {}
+
+    try:
+        values = await client.mget(keys)
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "mget")
+        return {}
+
+    found: Dict[str, dict] = {}
+    for key, data in zip(keys, values):
+        if not data:
+            _stats["misses"] += 1
+            continue
+        try:
+            found[key] = json.loads(data)
+            _stats["hits"] += 1
+        except json.JSONDecodeError as e:
+            _handle_command_error(e, "get")
+    return found
+
+
 async def set_cached(key: str, value: Any, ttl: int = 86400) -> bool:
     """
     Cache data in Redis with TTL (default 24 hours)
     Returns True if successful, False otherwise
     """
-    client = get_redis()
+    client = await get_redis()
     if client is None:
         return False
 
     try:
-        client.setex(key, ttl, json.dumps(value))
+        await client.setex(key, ttl, json.dumps(value))
+        return True
+    except (RedisError, OSError, TypeError) as e:
+        _handle_command_error(e, "set")
+    return False
+
+
+async def set_cached_many(items: Dict[str, Any], ttl: int = 86400) -> bool:
+    """
+    Cache many entries with one pipelined round-trip (SETEX per key, same TTL)
+    Returns True if successful, False otherwise
+    """
+    if not items:
         return True
-    except (RedisError, TypeError) as e:
-        print(f"Redis set error: {e}")
+
+    client = await get_redis()
+    if client is None:
         return False
 
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, json.dumps(value))
+            await pipe.execute()
+        return True
+    except (RedisError, OSError, TypeError) as e:
+        _handle_command_error(e, "set")
+    return False
+
 
 async def delete_cached(key: str) -> bool:
     """Delete cached data from Redis"""
-    client = get_redis()
+    client = await get_redis()
+    if client is None:
+        return False
+
+    try:
+        await client.delete(key)
+        return True
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "delete")
+        return False
+
+
+async def delete_cached_many(keys: List[str]) -> bool:
+    """Delete many keys with a single DEL"""
+    if not keys:
+        return True
+
+    client = await get_redis()
     if client is None:
         return False
 
     try:
-        client.delete(key)
+        await client.delete(*keys)
         return True
-    except RedisError as e:
-        print(f"Redis delete error: {e}")
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "delete")
         return False
+
+
+async def hincrby_many(key: str, increments: Dict[str, int]) -> bool:
+    """Add to many hash fields with one pipelined round-trip (HINCRBY per field)"""
+    if not increments:
+        return True
+
+    client = await get_redis()
+    if client is None:
+        return False
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for field, amount in increments.items():
+                pipe.hincrby(key, field, amount)
+            await pipe.execute()
+        return True
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "hincrby")
+    return False
+
+
+async def take_hash(key: str) -> Optional[Dict[str, str]]:
+    """
+    Atomically take a counter hash's current contents: RENAME it aside, read it, delete it.
+    Writers that arrive after the RENAME start a fresh hash, so no increment is read twice
+    or lost between the read and the delete.
+
+    Taken-aside keys stay listed in `{key}:taking` until they are read, so a take that fails
+    after the RENAME is not lost: the next take (from any instance) reads the leftover too and
+    sums it in. Returns None if Redis is unavailable.
+    """
+    client = await get_redis()
+    if client is None:
+        return None
+
+    taking_set = f"{key}:taking"
+    taken_key = f"{key}:taking:{uuid.uuid4().hex}"
+    try:
+        # 목록 등록과 RENAME을 한 MULTI로 — 다른 인스턴스가 이름만 있고 내용이 없는 키를 보지 않도록
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.sadd(taking_set, taken_key)
+            pipe.rename(key, taken_key)
+            await pipe.execute(raise_on_error=False)  # 키가 없으면 RENAME만 실패 — 남은 것만 가져간다
+
+        totals: Dict[str, int] = {}
+        for taking in set(await client.smembers(taking_set)) | {taken_key}:
+            # 읽기+삭제를 한 MULTI로 — 여러 인스턴스가 같은 남은 키를 봐도 한 곳만 내용을 받는다
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hgetall(taking)
+                pipe.delete(taking)
+                pipe.srem(taking_set, taking)
+                data, _, _ = await pipe.execute()
+            for field, value in data.items():
+                try:
+                    totals[field] = totals.get(field, 0) + int(value)
+                except ValueError:
+                    continue
+        return {field: str(value) for field, value in totals.items()}
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "take")
+    return None
+
+
+async def hash_values(key: str) -> Optional[Dict[str, str]]:
+    """HGETALL (read-only). Returns None if Redis is unavailable."""
+    client = await get_redis()
+    if client is None:
+        return None
+
+    try:
+        return await client.hgetall(key)
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "hgetall")
+    return None
+
+
+# 토큰이 일치할 때만 지운다 — 리스가 만료된 뒤 다른 인스턴스가 새로 잡은 리스를 지우지 않도록
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+async def acquire_leases(keys: List[str], ttl_seconds: int) -> Dict[str, Optional[str]]:
+    """
+    Try to take a short exclusive lease on each key (SET NX EX, one pipeline).
+    Returns {key: token} for leases acquired and {key: None} for keys another holder has.
+    Without Redis there is nobody to coordinate with, so every lease is granted locally.
+    """
+    tokens = {key: uuid.uuid4().hex for key in keys}
+    if not keys:
+        return {}
+
+    client = await get_redis()
+    if client is None:
+        return dict(tokens)
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, token in tokens.items():
+                pipe.set(key, token, nx=True, ex=ttl_seconds)
+            acquired = await pipe.execute()
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "lease")
+        return dict(tokens)
+
+    return {key: (token if ok else None) for (key, token), ok in zip(tokens.items(), acquired)}
+
+
+async def release_leases(leases: Dict[str, Optional[str]]) -> None:
+    """Release leases taken by acquire_leases (only the ones this holder still owns)"""
+    owned = {key: token for key, token in leases.items() if token}
+    if not owned:
+        return
+
+    client = await get_redis()
+    if client is None:
+        return
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, token in owned.items():
+                pipe.eval(_RELEASE_LEASE_SCRIPT, 1, key, token)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        _handle_command_error(e, "lease release")
+
+
+async def publish(channel: str, message: Any) -> bool:
+    """Publish a JSON message on a pub/sub channel (fire-and-forget fan-out to other instances)"""
+    client = await get_redis()
+    if client is None:
+        return False
+
+    try:
+        await client.publish(channel, json.dumps(message))
+        return True
+    except (RedisError, OSError, TypeError) as e:
+        _handle_command_error(e, "publish")
+        return False
+
+
+async def run_subscriber(channel: str, on_message: Callable[[Any], None]) -> None:
+    """
+    Subscribe to `channel` forever, calling on_message(decoded_json) per message.
+    Survives Redis outages: waits out the reconnect backoff and resubscribes. Runs until
+    the surrounding task is cancelled (application shutdown).
+    """
+    while True:
+        client = await get_redis()
+        if client is None:
+            await asyncio.sleep(max(1.0, _retry_at - time.monotonic()))
+            continue
+
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+                try:
+                    on_message(json.loads(message["data"]))
+                except Exception as e:  # noqa: BLE001 - a bad message must not kill the subscriber
+                    print(f"Redis subscriber handler error on {channel}: {e}")
+        except (RedisError, OSError) as e:
+            _handle_command_error(e, "subscribe")
+            await asyncio.sleep(1.0)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
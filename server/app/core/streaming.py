@@ -0,0 +1,25 @@
+"""NDJSON streaming responses (one JSON object per line)
+
+단계적으로 확정되는 결과(캐시 히트 → DB → Gemini)를 다 모을 때까지 기다리지 않고 줄 단위로
+바로 흘려보낸다. 클라이언트는 줄바꿈마다 한 프레임씩 JSON으로 파싱하면 된다.
+"""
+import json
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _encode(frames: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for frame in frames:
+        yield (json.dumps(frame, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def ndjson_response(frames: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    # X-Accel-Buffering: 프록시(nginx)가 모아서 보내지 않도록
+    return StreamingResponse(
+        _encode(frames),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,56 @@
+"""Request body size limits for upload endpoints (pure ASGI middleware)
+
+FastAPI는 엔드포인트를 부르기 전에 multipart 본문을 끝까지 받아 파싱한다 (파일 파트는
+SpooledTemporaryFile — 1MB를 넘으면 디스크). 그래서 엔드포인트 안에서 크기를 검사하면 100MB를
+보내도 다 받은 뒤에야 거절한다. 이 미들웨어는 본문을 받는 도중에 센다:
+
+- Content-Length가 한도를 넘으면 본문을 읽기 전에 413
+- 길이를 모르는(chunked) 요청은 받은 바이트를 세다가 한도를 넘는 순간 413 (파싱 중단)
+
+413은 HTTPException으로 올리므로 FastAPI가 다른 오류와 같은 {"detail": ...} 응답으로 만든다.
+"""
+from typing import Dict
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"요청 본문은 {limit // (1024 * 1024)}MB를 초과할 수 없습니다.",
+    )
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies above `limits[path]` bytes while they are being received.
+
+    사용 예: app.add_middleware(BodySizeLimitMiddleware, limits={"/api/v1/ocr/scan": 11 * 1024 * 1024})
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope.get("headers") or []).get(b"content-length")
+        oversized = declared is not None and declared.isdigit() and int(declared) > limit
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            if oversized:
+                raise _too_large(limit)
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,11 +1,13 @@
 """FastAPI application entry point"""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 import sys
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.redis_client import close_redis
 
 # Configure logging to stdout for Cloud Run
 logging.basicConfig(
@@ -40,11 +42,36 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Google auth pre-warm failed (non-critical): {e}")
 
+    # 자주 쓰이는 단어를 L1/Redis에 미리 채움 (WORD_WARMUP_BUDGET_SECONDS 이내)
+    from app.services.word_warmup import run_warm_up
+    await run_warm_up()
+
+    # 다른 인스턴스의 단어 변경을 이 인스턴스의 L1 캐시에 반영 (Redis pub/sub)
+    from app.services.word_cache import run_invalidation_listener
+    from app.services.word_index import run_refresh_loop
+    from app.services.word_usage import run_flush_loop
+    from app.services.word_jobs import run_worker_loop
+    background_tasks = [
+        asyncio.create_task(run_invalidation_listener()),
+        # /words/search 자동완성 인덱스 로드 + 다른 인스턴스 변경분 주기 반영
+        asyncio.create_task(run_refresh_loop()),
+        # 누적된 usage_count 증가분을 주기적으로 DB에 반영 (종료 시 마지막 flush)
+        asyncio.create_task(run_flush_loop()),
+        # defer=true로 큐에 들어간 단어 생성 (word_jobs)
+        asyncio.create_task(run_worker_loop()),
+    ]
+
     yield
 
     # Shutdown: cleanup if needed
     logger.info("=== Application Shutdown ===")
     logger.info("Cleaning up...")
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_redis()
 
 
 # Create FastAPI app
@@ -92,6 +119,15 @@ from app.api.v1 import api_router as v1_router
 
 app.include_router(v1_router, prefix="/api/v1")
 
+# 업로드 본문은 받는 도중에 크기를 센다 — 한도를 넘으면 끝까지 받지 않고 413
+from app.api.v1 import ocr as ocr_api
+from app.core.upload_limit import BodySizeLimitMiddleware
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={f"/api/v1/ocr{path}": size for path, size in ocr_api.MAX_BODY_SIZES.items()},
+)
+
 
 if __name__ == "__main__":
     import uvicorn
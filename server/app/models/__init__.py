@@ -10,5 +10,12 @@ from app.models.blog_topic import BlogTopic
 from app.models.blog_published_post import BlogPublishedPost
 from app.models.exam_passage import ExamPassage
 from app.models.conversation_clip import ConversationClip
+from app.models.rejected_word import RejectedWord
+from app.models.word_form import WordForm
+from app.models.word_tombstone import WordTombstone
+from app.models.word_job import WordJob
+from app.models.gemini_memo import GeminiMemo
+from app.models.word_stats import WordStats
+from app.models.ocr_cache import OcrCacheEntry, OcrCacheBand
 
-__all__ = ["Base", "User", "Word", "Wordbook", "WordbookWord", "Post", "PostLike", "PointTransaction", "Visit", "BlogTopic", "BlogPublishedPost", "ExamPassage", "ConversationClip"]
+__all__ = ["Base", "User", "Word", "Wordbook", "WordbookWord", "Post", "PostLike", "PointTransaction", "Visit", "BlogTopic", "BlogPublishedPost", "ExamPassage", "ConversationClip", "RejectedWord", "WordForm", "WordTombstone", "WordJob", "GeminiMemo", "WordStats", "OcrCacheEntry", "OcrCacheBand"]
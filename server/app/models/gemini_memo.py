@@ -0,0 +1,38 @@
+"""GeminiMemo model - stored Gemini responses keyed by request content"""
+from datetime import datetime, timezone
+from sqlalchemy import String, Integer, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class GeminiMemo(Base):
+    """One memoized generation: sha256(method, model, prompt, generation config) → response text.
+
+    Written only after the calling GeminiService method parsed the response successfully,
+    so a malformed/truncated output is never replayed. Rows expire at expires_at and the
+    least recently used rows are evicted past GEMINI_MEMO_MAX_ENTRIES.
+    """
+
+    __tablename__ = "gemini_memo"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    method: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response_text: Mapped[str] = mapped_column(Text, nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<GeminiMemo(method={self.method}, key={self.key[:12]}, hits={self.hits})>"
@@ -0,0 +1,46 @@
+"""OCR cache models - Vision word lists keyed by a perceptual hash of the page"""
+from datetime import datetime, timezone
+from sqlalchemy import String, Integer, DateTime, JSON, Text, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class OcrCacheEntry(Base):
+    """One Vision extraction result for a page photo, looked up by Hamming distance on `image_hash`
+    and confirmed by comparing `detail` (app/services/ocr_cache.py). Expires at expires_at."""
+
+    __tablename__ = "ocr_cache_entries"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    image_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # 144-bit dHash (hex)
+    detail: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # 32x32 흑백 축소본
+    words: Mapped[list] = mapped_column(JSON, nullable=False)
+    raw_text: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    hits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<OcrCacheEntry(id={self.id}, hash={self.image_hash[:12]}, words={len(self.words or [])})>"
+
+
+class OcrCacheBand(Base):
+    """One 12-bit slice of an entry's hash. Two hashes within distance < number of bands
+    share at least one identical slice, so candidates are found with an index lookup."""
+
+    __tablename__ = "ocr_cache_bands"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ocr_cache_entries.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    band: Mapped[int] = mapped_column(Integer, nullable=False)
+    value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('ix_ocr_cache_bands_band_value', 'band', 'value'),
+    )
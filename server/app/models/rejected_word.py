@@ -0,0 +1,26 @@
+"""RejectedWord model - OCR tokens Gemini judged not to be English words (negative cache)"""
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class RejectedWord(Base):
+    """A token that came back is_valid=false. Checked before the Gemini stage so the same
+    OCR noise ("geet", "alaoa") from the same textbook page is never sent to Gemini again.
+    Deleting a row (admin override) lets the token be generated on its next lookup."""
+
+    __tablename__ = "rejected_words"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    word: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    reason: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<RejectedWord(word={self.word})>"
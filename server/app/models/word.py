@@ -1,6 +1,6 @@
 """Word model"""
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, Boolean, DateTime, JSON, CheckConstraint
+from sqlalchemy import String, Integer, Boolean, DateTime, JSON, CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
@@ -24,8 +24,9 @@ class Word(Base):
 
     # Metadata
     source: Mapped[str] = mapped_column(String(50), nullable=False)  # 'json-db', 'gpt', 'user-manual'
-    gpt_generated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
-    usage_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # How many users use this word
+    # active_history: 값을 바꿀 때 이전 값을 알아야 word_stats 합계를 증감할 수 있다
+    gpt_generated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True, active_history=True)
+    usage_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False, active_history=True)  # How many users use this word
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
@@ -43,6 +44,10 @@ class Word(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('difficulty BETWEEN 1 AND 5', name='check_difficulty_range'),
+        # PostgreSQL: 비-C collation에서도 LIKE 'q%' 접두어 검색이 인덱스를 타도록
+        Index('ix_words_word_pattern', 'word', postgresql_ops={'word': 'text_pattern_ops'}),
+        # /words/changes 커서 순서 (updated_at, id)
+        Index('ix_words_updated_at_id', 'updated_at', 'id'),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,30 @@
+"""WordForm model - alternate forms linked to a headword in the words dictionary"""
+from datetime import datetime, timezone
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class WordForm(Base):
+    """A spelling variant or derivative of a headword, loaded from seed_3000words.txt (파생어 column).
+
+    relation:
+    - 'variant': same word, other spelling ("colour" → color). Looked up as the headword.
+    - 'derivative': related but different word ("disagree" → agree). Recorded only — it has
+      its own meaning, so it is never answered with the headword's entry.
+    """
+
+    __tablename__ = "word_forms"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    form: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    headword: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
+    relation: Mapped[str] = mapped_column(String(20), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<WordForm(form={self.form}, headword={self.headword}, relation={self.relation})>"
@@ -0,0 +1,46 @@
+"""WordJob model - deferred word generation queue"""
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class WordJob(Base):
+    """One word waiting for (or being retried for) Gemini generation.
+
+    status:
+    - 'pending': waiting; picked up once available_at has passed
+    - 'running': claimed by a worker until locked_until (reclaimed after that — crashed worker)
+    - 'failed': gave up after WORD_JOB_MAX_ATTEMPTS; requesting the word again re-queues it
+
+    A job row is deleted as soon as the word is saved (or rejected as not a word) —
+    the words / rejected_words tables are the record of completion.
+    """
+
+    __tablename__ = "word_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    word: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        # 워커의 "지금 처리할 작업" 조회
+        Index('ix_word_jobs_status_available_at', 'status', 'available_at'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WordJob(word={self.word}, status={self.status}, attempts={self.attempts})>"
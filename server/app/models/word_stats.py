@@ -0,0 +1,26 @@
+"""WordStats model - materialized counters behind /words/stats"""
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class WordStats(Base):
+    """Single row (id=1) of running totals over `words`, kept in step by app/services/word_stats.py
+    so /words/stats reads one row instead of aggregating the whole table."""
+
+    __tablename__ = "word_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total_words: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gpt_generated: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_usage: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<WordStats(total_words={self.total_words}, total_usage={self.total_usage})>"
@@ -0,0 +1,29 @@
+"""WordTombstone model - deleted words, for the /words/changes delta feed"""
+from datetime import datetime, timezone
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class WordTombstone(Base):
+    """One row per deleted Word (written by the ORM after_delete hook in word_changes).
+    A client syncing with /words/changes drops its local copy of `word_id`."""
+
+    __tablename__ = "word_tombstones"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    word_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    word: Mapped[str] = mapped_column(String(100), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        # /words/changes 커서 순서 (deleted_at, id)
+        Index('ix_word_tombstones_deleted_at_id', 'deleted_at', 'id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WordTombstone(word_id={self.word_id}, word={self.word})>"
@@ -57,3 +57,19 @@ class AdminPointListResponse(BaseModel):
     items: List[AdminPointTransactionResponse]
     total: int
     points_by_reason: Dict[str, int]
+
+
+class AdminRejectedWordResponse(BaseModel):
+    """Schema for a token recorded as rejected (not an English word)"""
+    id: int
+    word: str
+    reason: Optional[str] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class AdminRejectedWordListResponse(BaseModel):
+    """Schema for paginated rejected-token list"""
+    items: List[AdminRejectedWordResponse]
+    total: int
@@ -33,6 +33,7 @@ class BlogGenerateRequest(BaseModel):
     """Request to generate a draft. Exactly one of topic_id / custom_prompt is required."""
     topic_id: Optional[int] = None
     custom_prompt: Optional[str] = None
+    fresh: bool = False  # true면 같은 입력의 저장된 생성 결과를 쓰지 않고 새로 생성
 
     @model_validator(mode="after")
     def _require_one(self) -> "BlogGenerateRequest":
@@ -225,6 +226,7 @@ class BlogImagePlanRequest(BaseModel):
     """Request to plan images for a draft (POST /admin/blog/image-plan)."""
     slug: str = Field(..., min_length=1, max_length=200)
     markdown: str = Field(..., min_length=1)
+    fresh: bool = False
 
 
 class BlogImagePlanItem(BaseModel):
@@ -298,6 +300,7 @@ class BlogDeleteResult(BaseModel):
 class BlogNaverVersionRequest(BaseModel):
     """Request a Naver-blog rewrite of a published post."""
     slug: str = Field(..., min_length=1, max_length=200)
+    fresh: bool = False
 
 
 class BlogNaverVersionResponse(BaseModel):
@@ -31,15 +31,21 @@ class WordResponse(BaseModel):
 class WordGenerateRequest(BaseModel):
     """Request to generate/fetch words"""
     words: List[str] = Field(..., min_length=1, max_length=50)  # List of words to fetch/generate
+    # True면 새로 생성해야 하는 단어는 기다리지 않고 큐에 넣는다 (queued=true, /words/jobs로 확인)
+    defer: bool = False
 
 
 class WordGenerateResult(BaseModel):
     """Result for a single word generation"""
     word: str
-    source: str  # 'cache', 'db', 'gpt'
+    source: str  # 'cache', 'db', 'gemini', 'invalid', 'queued', 'error'
     data: Optional[Dict[str, Any]] = None
     queued: bool = False
     error: Optional[str] = None
+    # 입력 토큰이 다른 사전 단어로 해석된 경우에만 채워진다
+    # match_type: 'lemma'(굴절형 → 원형) / 'variant'(철자 변형) / 'fuzzy'(OCR 오타 교정)
+    matched_word: Optional[str] = None
+    match_type: Optional[str] = None
 
 
 class WordGenerateResponse(BaseModel):
@@ -48,3 +54,28 @@ class WordGenerateResponse(BaseModel):
     cache_hits: int
     db_hits: int
     gemini_calls: int
+
+
+class WordTombstoneResponse(BaseModel):
+    """A word deleted from the dictionary (drop the local copy with this id)"""
+    word_id: int
+    word: str
+    deleted_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class WordChangesResponse(BaseModel):
+    """One page of /words/changes"""
+    changes: List[WordResponse]
+    deleted: List[WordTombstoneResponse]
+    next_cursor: str  # 다음 요청의 since 값
+    has_more: bool  # True면 next_cursor로 바로 이어서 요청
+
+
+class WordJobStatusResponse(BaseModel):
+    """Generation status of a word requested with defer=true"""
+    word: str
+    status: str  # 'done', 'pending', 'running', 'failed', 'invalid', 'unknown'
+    data: Optional[Dict[str, Any]] = None  # status == 'done'일 때만
+    error: Optional[str] = None
@@ -8,6 +8,8 @@ from app.models.word import Word
 from app.models.wordbook import Wordbook, WordbookWord
 from app.models.post import Post, PostReply
 from app.models.point_transaction import PointTransaction
+from app.models.rejected_word import RejectedWord
+from app.services import word_stats
 from fastapi import HTTPException, status
 
 # 게스트/시스템 계정은 "회원"이 아니므로 대시보드·회원 목록 기본값에서 제외한다
@@ -33,7 +35,7 @@ class AdminService:
         ) or 0
 
         total_wordbooks = db.scalar(select(sa_func.count()).select_from(Wordbook)) or 0
-        total_words = db.scalar(select(sa_func.count()).select_from(Word)) or 0
+        total_words = word_stats.get(db)["total_words"]
         total_wordbook_words = db.scalar(select(sa_func.count()).select_from(WordbookWord)) or 0
 
         total_posts_notice = db.scalar(
@@ -216,3 +218,36 @@ class AdminService:
         db.delete(user)
         db.commit()
         return user
+
+    @staticmethod
+    def list_rejected_words(
+        db: Session,
+        limit: int = 20,
+        offset: int = 0,
+        search: Optional[str] = None,
+    ) -> Tuple[List[RejectedWord], int]:
+        """List tokens Gemini rejected as not English words, most recent first"""
+        stmt = select(RejectedWord)
+        if search:
+            stmt = stmt.where(RejectedWord.word.ilike(f"%{search.lower()}%"))
+
+        total = db.scalar(select(sa_func.count()).select_from(stmt.subquery())) or 0
+
+        stmt = stmt.order_by(RejectedWord.created_at.desc(), RejectedWord.id.desc())
+        items = list(db.scalars(stmt.limit(limit).offset(offset)).all())
+        return items, total
+
+    @staticmethod
+    def delete_rejected_word(db: Session, word: str) -> str:
+        """Remove a rejection record so the token is generated again on its next lookup.
+        Caller is responsible for dropping the negative-cache entries."""
+        word = word.lower()
+        row = db.scalar(select(RejectedWord).where(RejectedWord.word == word))
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="거절 기록이 없는 단어입니다."
+            )
+        db.delete(row)
+        db.commit()
+        return word
@@ -0,0 +1,221 @@
+"""Content-addressed memoization for GeminiService generations
+
+기출 재적재(tag_exam_passage), 같은 글의 네이버 변환(generate_naver_version), 블로그 파이프라인
+재실행(generate_blog_post, plan_blog_images)은 같은 입력으로 같은 생성을 반복한다. @memoized를 단
+메서드 안에서의 모델 호출은 sha256(메서드, 모델, 프롬프트, generation config)를 키로 gemini_memo
+테이블에서 먼저 찾고, 있으면 모델을 부르지 않고 저장된 응답 텍스트를 돌려준다.
+
+- 저장은 메서드가 끝난 뒤, 결과가 None이 아닐 때만 한다 (= 응답을 파싱/검증까지 통과).
+  JSON이 깨져 재시도한 응답이나 필드가 빠진 응답은 저장되지 않는다.
+- 메서드 안의 재시도(재귀 호출)는 바깥 호출의 범위에 합류해 한 번에 저장된다. 메모에서 꺼낸
+  응답으로 결과가 None이 되면 그 항목은 지우고, 재시도는 모델을 새로 부른다.
+- 항목은 GEMINI_MEMO_TTL_SECONDS 뒤 만료되고, GEMINI_MEMO_MAX_ENTRIES를 넘으면 가장 오래 안 쓴
+  항목부터 지운다. TTL_SECONDS=0이면 전체가 꺼진다.
+- bypass(): 이 블록 안의 호출은 저장된 응답을 쓰지 않고 새로 생성한다 (결과는 다시 저장).
+  관리자 엔드포인트의 fresh=true가 이것을 쓴다. invalidate()로 메서드별/전체 삭제.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.gemini_memo import GeminiMemo
+
+# 테스트/스크립트가 다른 DB를 쓰게 할 때 바꾼다 (None이면 app.core.database.SessionLocal)
+session_factory: Optional[Callable[[], Session]] = None
+
+
+@dataclass
+class _Scope:
+    method: str
+    pending: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # key → (model, text)
+    served: Set[str] = field(default_factory=set)  # 이번 호출에서 메모로 돌려준 키
+
+
+_scope: ContextVar[Optional[_Scope]] = ContextVar("gemini_memo_scope", default=None)
+_bypass: ContextVar[bool] = ContextVar("gemini_memo_bypass", default=False)
+
+
+class MemoizedResponse:
+    """Stand-in for a generate_content response served from the memo (callers only read .text)"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.usage_metadata = None
+
+
+def _now() -> datetime:
+    # 저장된 시각은 tz 없는 UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _session() -> Session:
+    if session_factory is not None:
+        return session_factory()
+    from app.core.database import SessionLocal
+    return SessionLocal()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    return repr(value)
+
+
+def _model_name(model: Any) -> str:
+    return str(getattr(model, "model_name", type(model).__name__))
+
+
+def make_key(method: str, model: Any, contents: Any, kwargs: Dict[str, Any]) -> str:
+    raw = json.dumps([method, _model_name(model), contents, kwargs],
+                     sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def memoized(fn: Callable) -> Callable:
+    """Decorate an async GeminiService method whose model calls may be replayed for identical input"""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if settings.GEMINI_MEMO_TTL_SECONDS <= 0 or _scope.get() is not None:
+            return await fn(*args, **kwargs)  # 꺼짐 / 재시도 재귀 호출은 바깥 범위에 합류
+        scope = _Scope(fn.__name__)
+        token = _scope.set(scope)
+        try:
+            result = await fn(*args, **kwargs)
+        finally:
+            _scope.reset(token)
+        if result is None and scope.served:
+            # 저장된 응답으로도 실패했다 (파서가 바뀌었거나 했음) — 다시 내주지 않도록 지운다
+            await asyncio.to_thread(_delete_keys, scope.served)
+        elif result is not None and scope.pending:
+            await asyncio.to_thread(_put_many, scope.method, scope.pending)
+        return result
+
+    return wrapper
+
+
+@contextmanager
+def bypass(enabled: bool = True) -> Iterator[None]:
+    """Generate fresh inside this block (results still refresh the memo)"""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def key_in_scope(model: Any, contents: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+    """Memo key for a model call made inside a @memoized method, else None"""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    return make_key(scope.method, model, contents, kwargs)
+
+
+async def get(key: str) -> Optional[str]:
+    scope = _scope.get()
+    if _bypass.get() or scope is None or key in scope.served:
+        return None  # 같은 키를 다시 묻는 것은 메모 응답이 파싱에 실패해 재시도하는 경우
+    try:
+        text = await asyncio.to_thread(_get, key)
+    except Exception as e:
+        print(f"Gemini memo read error: {e}")
+        return None
+    if text is not None:
+        scope.served.add(key)
+    return text
+
+
+def remember(key: str, model: Any, response: Any) -> None:
+    """Hold a fresh response until the method's result shows it parsed"""
+    scope = _scope.get()
+    if scope is None:
+        return
+    try:
+        text = response.text
+    except Exception:
+        return  # 차단/빈 응답 — .text 접근이 예외를 낸다
+    if text:
+        scope.pending[key] = (_model_name(model), text)
+
+
+def _get(key: str) -> Optional[str]:
+    with _session() as db:
+        row = db.execute(select(GeminiMemo).where(GeminiMemo.key == key)).scalar_one_or_none()
+        if row is None or row.expires_at <= _now():
+            return None
+        row.hits += 1
+        row.last_used_at = _now()
+        text = row.response_text
+        db.commit()
+        print(f"Gemini memo hit: {row.method}")
+        return text
+
+
+def _put_many(method: str, pending: Dict[str, Tuple[str, str]]) -> None:
+    try:
+        with _session() as db:
+            now = _now()
+            db.execute(delete(GeminiMemo).where(GeminiMemo.key.in_(list(pending))))
+            db.add_all(
+                GeminiMemo(
+                    key=key, method=method, model=model[:100], response_text=text,
+                    created_at=now, last_used_at=now,
+                    expires_at=now + timedelta(seconds=settings.GEMINI_MEMO_TTL_SECONDS),
+                )
+                for key, (model, text) in pending.items()
+            )
+            db.commit()
+            _evict(db)
+    except IntegrityError:
+        pass  # 같은 키를 다른 요청이 먼저 저장함
+    except Exception as e:
+        print(f"Gemini memo save error: {e}")
+
+
+def _delete_keys(keys: Set[str]) -> None:
+    try:
+        with _session() as db:
+            db.execute(delete(GeminiMemo).where(GeminiMemo.key.in_(list(keys))))
+            db.commit()
+    except Exception as e:
+        print(f"Gemini memo delete error: {e}")
+
+
+def _evict(db: Session) -> None:
+    """Drop expired rows, then the least recently used ones past GEMINI_MEMO_MAX_ENTRIES"""
+    db.execute(delete(GeminiMemo).where(GeminiMemo.expires_at <= _now()))
+    excess = db.execute(select(func.count(GeminiMemo.id))).scalar() - settings.GEMINI_MEMO_MAX_ENTRIES
+    if excess > 0:
+        oldest = select(GeminiMemo.id).order_by(GeminiMemo.last_used_at, GeminiMemo.id).limit(excess)
+        db.execute(delete(GeminiMemo).where(GeminiMemo.id.in_(oldest.scalar_subquery())))
+    db.commit()
+
+
+def invalidate(db: Session, method: Optional[str] = None) -> int:
+    """Delete memoized responses (one method or all). Returns the number deleted."""
+    stmt = delete(GeminiMemo)
+    if method:
+        stmt = stmt.where(GeminiMemo.method == method)
+    deleted = db.execute(stmt).rowcount
+    db.commit()
+    return deleted
+
+
+def stats(db: Session) -> List[Dict[str, Any]]:
+    """Entries and hits per method"""
+    rows = db.execute(
+        select(GeminiMemo.method, func.count(GeminiMemo.id), func.sum(GeminiMemo.hits))
+        .group_by(GeminiMemo.method)
+        .order_by(GeminiMemo.method)
+    ).all()
+    return [{"method": method, "entries": entries, "hits": hits or 0} for method, entries, hits in rows]
@@ -0,0 +1,167 @@
+"""Per-method Gemini call telemetry (in-process, per instance)
+
+GeminiService._generate_content/_stream_content가 모델 호출마다 넘겨받은 메서드 이름으로 다음을 남긴다.
+
+- 지연 시간: 누적 버킷 히스토그램(LATENCY_BUCKETS, 초) + 합계/최대
+- 토큰: 응답 usage_metadata의 prompt_token_count / candidates_token_count
+- 비용: 토큰 × PRICES_PER_MTOK (모델별 100만 토큰당 USD, 가격이 바뀌면 여기를 고친다)
+- 오류(예외), 재시도, JSON 파싱 실패, 메모(gemini_memo) 재생 횟수 — 재시도/파싱 실패는
+  각 메서드의 해당 분기에서 record_retry/record_parse_failure로 남긴다.
+
+값은 프로세스 메모리에만 있어서 재시작하면 0부터 다시 센다 (/admin/gemini-metrics).
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# (input, output) USD per 1M tokens
+PRICES_PER_MTOK = {
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-image": (0.30, 30.00),  # 이미지 1장 = 출력 1290 토큰
+}
+
+# 단어 정의를 만드는 호출의 메서드 이름 — GeminiService가 이 상수로 기록하고,
+# /words/stats의 단어당 비용 계산이 이 이름들을 합산한다
+WORD_DEFINITION = "get_word_definition"
+WORD_BATCH_DEFINITION = "_define_word_batch"
+WORD_DEFINITION_METHODS = (WORD_DEFINITION, WORD_BATCH_DEFINITION)
+
+
+@dataclass
+class _MethodStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    parse_failures: int = 0
+    memo_hits: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+_lock = threading.Lock()
+_methods: Dict[str, _MethodStats] = {}
+_words_defined = 0
+
+
+def _method(name: str) -> _MethodStats:
+    stats = _methods.get(name)
+    if stats is None:
+        stats = _methods[name] = _MethodStats()
+    return stats
+
+
+def _price(model_name: str) -> Optional[tuple]:
+    return PRICES_PER_MTOK.get(model_name.removeprefix("models/"))
+
+
+def _usage(response: Any) -> tuple:
+    usage = getattr(response, "usage_metadata", None)
+    return (
+        int(getattr(usage, "prompt_token_count", 0) or 0),
+        int(getattr(usage, "candidates_token_count", 0) or 0),
+    )
+
+
+def record_call(method: str, model: Any, seconds: float, response: Any = None, error: bool = False) -> None:
+    """One model call (model object or model name): latency, plus tokens/cost when the response carries usage metadata"""
+    prompt_tokens, output_tokens = _usage(response) if response is not None else (0, 0)
+    price = _price(model if isinstance(model, str) else str(getattr(model, "model_name", "")))
+    cost = (prompt_tokens * price[0] + output_tokens * price[1]) / 1_000_000 if price else 0.0
+    bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+    with _lock:
+        stats = _method(method)
+        stats.calls += 1
+        stats.errors += int(error)
+        stats.prompt_tokens += prompt_tokens
+        stats.output_tokens += output_tokens
+        stats.cost_usd += cost
+        stats.latency_sum += seconds
+        stats.latency_max = max(stats.latency_max, seconds)
+        stats.latency_buckets[bucket] += 1
+
+
+def record_memo_hit(method: str) -> None:
+    with _lock:
+        _method(method).memo_hits += 1
+
+
+def record_retry(method: str) -> None:
+    with _lock:
+        _method(method).retries += 1
+
+
+def record_parse_failure(method: str) -> None:
+    with _lock:
+        _method(method).parse_failures += 1
+
+
+def record_words_defined(count: int) -> None:
+    """Words sent for definition (denominator of the per-word cost)"""
+    global _words_defined
+    with _lock:
+        _words_defined += count
+
+
+def cost_per_word() -> Optional[float]:
+    """Observed USD spent per defined word on this instance, None before any definition call"""
+    with _lock:
+        cost = sum(_methods[m].cost_usd for m in WORD_DEFINITION_METHODS if m in _methods)
+        words = _words_defined
+    return cost / words if words and cost else None
+
+
+def _method_snapshot(stats: _MethodStats) -> Dict[str, Any]:
+    calls = stats.calls
+    histogram = {}
+    running = 0
+    for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets):
+        running += count
+        histogram[f"le_{bound:g}s"] = running  # 누적 (Prometheus 방식)
+    histogram["le_inf"] = calls
+    return {
+        "calls": calls,
+        "errors": stats.errors,
+        "retries": stats.retries,
+        "parse_failures": stats.parse_failures,
+        "parse_failure_rate": round(stats.parse_failures / calls * 100, 2) if calls else 0,
+        "memo_hits": stats.memo_hits,
+        "prompt_tokens": stats.prompt_tokens,
+        "output_tokens": stats.output_tokens,
+        "cost_usd": round(stats.cost_usd, 6),
+        "avg_latency_seconds": round(stats.latency_sum / calls, 3) if calls else 0,
+        "max_latency_seconds": round(stats.latency_max, 3),
+        "latency_histogram": histogram,
+    }
+
+
+def get_stats() -> Dict[str, Any]:
+    """Per-method metrics + totals for the admin dashboard"""
+    with _lock:
+        methods = {name: _method_snapshot(stats) for name, stats in sorted(_methods.items())}
+        words_defined = _words_defined
+    return {
+        "methods": methods,
+        "totals": {
+            "calls": sum(m["calls"] for m in methods.values()),
+            "errors": sum(m["errors"] for m in methods.values()),
+            "memo_hits": sum(m["memo_hits"] for m in methods.values()),
+            "prompt_tokens": sum(m["prompt_tokens"] for m in methods.values()),
+            "output_tokens": sum(m["output_tokens"] for m in methods.values()),
+            "cost_usd": round(sum(m["cost_usd"] for m in methods.values()), 6),
+            "words_defined": words_defined,
+        },
+    }
+
+
+def reset() -> None:
+    global _words_defined
+    with _lock:
+        _methods.clear()
+        _words_defined = 0
@@ -1,10 +1,15 @@
 """Gemini service for word definitions and Vision OCR"""
+import asyncio
+import functools
 import json
 import re
-import base64
-from typing import Optional, Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable
 import google.generativeai as genai
 from app.core.config import settings
+from app.services import gemini_memo, gemini_metrics
+from app.services.gemini_memo import memoized
 from app.services.image_style import IMAGE_STYLE_GUIDE
 
 # Image generation runs on the newer google-genai SDK (the legacy google-generativeai
@@ -41,6 +46,77 @@ def _has_api_key() -> bool:
     return bool(settings.GEMINI_API_KEY and settings.GEMINI_API_KEY != "your-gemini-api-key-here")
 
 
+# Both SDKs' generate_content are blocking HTTP calls. Calling them directly from an
+# `async def` froze the whole event loop for the duration of every model round-trip, so
+# asyncio.gather over N words actually ran them one after another and no other request on
+# the worker was served meanwhile. Every model call is dispatched onto this dedicated pool
+# instead; its size is the process-wide cap on in-flight Gemini calls
+# (settings.GEMINI_MAX_CONCURRENCY), which also keeps a large OCR scan from bursting past
+# the API's per-minute quota. Created lazily so importing this module never spawns threads.
+_gemini_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.GEMINI_MAX_CONCURRENCY),
+            thread_name_prefix="gemini",
+        )
+    return _gemini_executor
+
+
+async def run_in_gemini_pool(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking SDK call on the bounded Gemini pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_gemini_executor(), functools.partial(fn, *args, **kwargs))
+
+
+class WordArrayParser:
+    """Incremental parser for the Vision word list — feed() text chunks as they stream in and
+    get back the top-level string elements completed so far.
+
+    첫 '[' 앞(코드블록 ```json, 앞말)은 건너뛰고, 배열이 닫히면 나머지는 무시한다.
+    잘린 응답이어도 그때까지 닫힌 문자열은 이미 돌려준 뒤다.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+        self.done = False
+
+    def feed(self, text: str) -> List[str]:
+        found: List[str] = []
+        for ch in text:
+            if self.done:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        try:
+                            found.append(json.loads('"' + "".join(self._buffer) + '"', strict=False))
+                        except json.JSONDecodeError:
+                            pass
+                    self._buffer = []
+                    continue
+                self._buffer.append(ch)
+            elif ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "[" or (ch == "{" and self._depth):
+                self._depth += 1
+            elif ch in "]}" and self._depth:
+                self._depth -= 1
+                self.done = self._depth == 0
+        return found
+
+
 class GeminiService:
     """Service for Google Gemini API calls"""
 
@@ -57,6 +133,58 @@ class GeminiService:
             self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
             self.vision_model = genai.GenerativeModel('gemini-2.5-flash')
 
+    async def _generate_content(self, method: str, model: Any, contents: Any, **kwargs: Any) -> Any:
+        """model.generate_content(...) dispatched through the bounded Gemini pool (memoized inside @memoized methods).
+
+        Latency/tokens/cost are recorded under `method` (gemini_metrics).
+        """
+        memo_key = gemini_memo.key_in_scope(model, contents, kwargs)
+        if memo_key:
+            cached = await gemini_memo.get(memo_key)
+            if cached is not None:
+                gemini_metrics.record_memo_hit(method)
+                return gemini_memo.MemoizedResponse(cached)
+        started = time.perf_counter()
+        try:
+            response = await run_in_gemini_pool(model.generate_content, contents, **kwargs)
+        except Exception:
+            gemini_metrics.record_call(method, model, time.perf_counter() - started, error=True)
+            raise
+        gemini_metrics.record_call(method, model, time.perf_counter() - started, response)
+        if memo_key:
+            gemini_memo.remember(memo_key, model, response)
+        return response
+
+    async def _stream_content(
+        self, method: str, model: Any, contents: Any, on_text: Callable[[str], None], **kwargs: Any
+    ) -> Any:
+        """_generate_content with stream=True — on_text(chunk) runs on the event loop as each chunk arrives.
+
+        The blocking stream is consumed on the Gemini pool; the returned response is fully resolved
+        (response.text is the whole output). Not memoized.
+        """
+        loop = asyncio.get_running_loop()
+
+        def consume() -> Any:
+            response = model.generate_content(contents, stream=True, **kwargs)
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # 텍스트 없는 청크 (finish_reason만 있는 마지막 청크 등)
+                if text:
+                    loop.call_soon_threadsafe(on_text, text)
+            return response
+
+        started = time.perf_counter()
+        try:
+            response = await run_in_gemini_pool(consume)
+        except Exception:
+            gemini_metrics.record_call(method, model, time.perf_counter() - started, error=True)
+            raise
+        gemini_metrics.record_call(method, model, time.perf_counter() - started, response)
+        return response
+
     async def get_word_definition(self, word: str, retry_count: int = 0, max_retries: int = 2) -> Optional[Dict[str, Any]]:
         """
         Get word definition from Gemini API with retry logic
@@ -111,7 +239,9 @@ Important:
 """
 
             # Call Gemini API
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                gemini_metrics.WORD_DEFINITION,
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.3,
@@ -136,6 +266,7 @@ Important:
                 return result
 
         except json.JSONDecodeError as e:
+            gemini_metrics.record_parse_failure(gemini_metrics.WORD_DEFINITION)
             # UTF-8 인코딩 강제 적용하여 출력
             error_msg = f"Gemini JSON parse error (attempt {retry_count + 1}/{max_retries + 1}): {e}"
             raw_msg = f"Raw content: {content[:500]}"  # 최대 500자만 출력
@@ -149,6 +280,7 @@ Important:
 
             # 재시도 로직
             if retry_count < max_retries:
+                gemini_metrics.record_retry(gemini_metrics.WORD_DEFINITION)
                 print(f"🔄 Retrying word '{word}' ({retry_count + 1}/{max_retries})...")
                 return await self.get_word_definition(word, retry_count + 1, max_retries)
             else:
@@ -167,6 +299,154 @@ Important:
 
         return None
 
+    @staticmethod
+    def _is_usable_word_entry(entry: Any) -> bool:
+        """Per-word shape check for batch responses (one bad entry must not sink the rest)."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("word"), str):
+            return False
+        if entry.get("is_valid", True) is False:
+            return True
+        meanings = entry.get("meanings")
+        if not isinstance(meanings, list) or not meanings:
+            return False
+        return all(
+            isinstance(m, dict) and m.get("partOfSpeech") and m.get("korean")
+            for m in meanings
+        )
+
+    async def get_word_definitions(self, words: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Define many words with as few model calls as possible.
+        Words are sent GEMINI_WORD_BATCH_SIZE at a time in a single prompt (chunks run
+        concurrently on the Gemini pool). Returns {input_word: result_or_None} with the same
+        per-word shape as get_word_definition (including is_valid=false rejections). Entries
+        the batch response is missing or got malformed fall back to get_word_definition.
+        """
+        unique_words = list(dict.fromkeys(words))
+        if not unique_words:
+            return {}
+        if self.model is None:
+            print("Gemini API key not configured")
+            return {w: None for w in unique_words}
+        gemini_metrics.record_words_defined(len(unique_words))
+
+        batch_size = max(1, settings.GEMINI_WORD_BATCH_SIZE)
+        chunks = [unique_words[i:i + batch_size] for i in range(0, len(unique_words), batch_size)]
+        chunk_results = await asyncio.gather(*(self._define_word_batch(c) for c in chunks))
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for chunk_result in chunk_results:
+            results.update(chunk_result)
+        return results
+
+    async def _define_word_batch(self, words: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """One model call for a chunk of words, single-word fallback for whatever didn't parse."""
+        if len(words) == 1:
+            return {words[0]: await self.get_word_definition(words[0])}
+
+        words_json = json.dumps(words, ensure_ascii=False)
+        prompt = f"""You are an English-Korean dictionary API. For EACH input below, first validate if it is a real English word, then provide a definition.
+
+Inputs (JSON array): {words_json}
+
+IMPORTANT - Word Validation Rules (apply to every input independently):
+1. Check if the input is a REAL English word or expression (including proper nouns, idioms, phrasal verbs, fixed collocations, common abbreviations)
+2. If it's NOT valid (e.g., random letters, OCR errors like "geet", "alaoa", "sact", gibberish, or words that don't form a real idiom together), return: {{"is_valid": false, "word": "<input>", "reason": "Not a valid English word"}}
+3. If it IS valid, return the full definition with "is_valid": true
+4. If an input consists of multiple words (e.g. "be good at", "give up"), treat it as a single idiom/phrasal verb entry, not as separate words
+
+Return a JSON array with exactly one object per input, in the same order, each with this structure:
+[
+  {{
+    "is_valid": true/false,
+    "word": "<the input, copied exactly>",
+    "reason": "Only if is_valid is false - explain why",
+    "pronunciation": "IPA pronunciation (only if valid)",
+    "difficulty": 1-5 (1=beginner, 5=advanced, only if valid),
+    "meanings": [
+      {{
+        "partOfSpeech": "noun/verb/adjective/etc (in English only)",
+        "korean": "Korean translation",
+        "english": "English definition",
+        "examples": [
+          {{
+            "en": "Example sentence in English",
+            "ko": "Korean translation of example"
+          }}
+        ]
+      }}
+    ]
+  }}
+]
+
+Important:
+1. ALWAYS include "is_valid" and "word" fields in every object
+2. For invalid words, only return is_valid, word, and reason fields
+3. Use standard English part of speech labels (noun, verb, adjective, adverb, preposition, conjunction, pronoun, etc.). For idioms/phrasal verbs/collocations made of multiple words, use "idiom"
+4. Provide at least 1-2 meanings for common words
+5. Include 1-2 example sentences for each meaning
+6. Ensure all JSON is properly formatted and COMPLETE
+7. Return ONLY the JSON array, no additional text
+"""
+
+        entries: List[Any] = []
+        try:
+            response = await self._generate_content(
+                gemini_metrics.WORD_BATCH_DEFINITION,
+                self.model,
+                prompt,
+                generation_config={
+                    "temperature": 0.3,
+                    # 단어당 ~600 토큰 + 여유 — 단일 호출(2000)과 같은 잘림 방지 여유를 둔다
+                    "max_output_tokens": min(8192, 800 * len(words) + 1000),
+                    "response_mime_type": "application/json",
+                },
+            )
+            content = (response.text or "").strip()
+            if content.startswith("```json"):
+                content = content[7:]
+            if content.startswith("```"):
+                content = content[3:]
+            if content.endswith("```"):
+                content = content[:-3]
+            parsed = json.loads(content.strip(), strict=False)
+            if isinstance(parsed, dict):
+                parsed = parsed.get("words") or parsed.get("results") or []
+            if isinstance(parsed, list):
+                entries = parsed
+        except Exception as e:
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure(gemini_metrics.WORD_BATCH_DEFINITION)
+            error_msg = f"Gemini batch definition error ({len(words)} words), falling back to single calls: {e}"
+            try:
+                print(error_msg)
+            except UnicodeEncodeError:
+                print(error_msg.encode("ascii", errors="ignore").decode("ascii"))
+
+        by_word: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            if self._is_usable_word_entry(entry):
+                by_word.setdefault(entry["word"].strip().lower(), entry)
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        for word in words:
+            entry = by_word.get(word.lower())
+            if entry is None:
+                missing.append(word)
+                continue
+            # 모델이 표기를 바꿔 돌려줘도(대소문자 등) 결과는 요청한 단어에 묶는다
+            entry["word"] = word
+            results[word] = entry
+
+        if missing:
+            print(f"Gemini batch fallback: {len(missing)}/{len(words)} words - {missing}")
+            fallback = await asyncio.gather(*(self.get_word_definition(w) for w in missing))
+            results.update(zip(missing, fallback))
+
+        return results
+
+    @memoized
     async def generate_blog_post(
         self,
         title: Optional[str] = None,
@@ -388,7 +668,9 @@ Important:
 - 반드시 완성된 유효한 JSON만 반환하세요. 문자열이 중간에 끊기지 않도록 끝까지 작성하세요."""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "generate_blog_post",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.7,
@@ -454,6 +736,7 @@ Important:
             return out
 
         except json.JSONDecodeError as e:
+            gemini_metrics.record_parse_failure("generate_blog_post")
             error_msg = f"Blog generation JSON parse error (attempt {retry_count + 1}/{max_retries + 1}): {e}"
             try:
                 print(error_msg)
@@ -461,6 +744,7 @@ Important:
                 print(error_msg.encode("ascii", errors="ignore").decode("ascii"))
 
             if retry_count < max_retries:
+                gemini_metrics.record_retry("generate_blog_post")
                 print(f"Retrying blog generation ({retry_count + 1}/{max_retries})...")
                 return await self.generate_blog_post(
                     title=title,
@@ -549,7 +833,9 @@ Important:
 }}"""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "suggest_blog_topics",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.9,
@@ -581,6 +867,8 @@ Important:
                     break
             return suggestions
         except Exception as e:
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure("suggest_blog_topics")
             error_msg = f"Blog topic suggestion error: {e}"
             try:
                 print(error_msg)
@@ -653,7 +941,9 @@ Important:
 }}"""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "suggest_conversation_topic_from_dialogue",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.8,
@@ -686,6 +976,8 @@ Important:
                 return None
             return {"title": title, "angle": angle}
         except Exception as e:  # noqa: BLE001 - caller just moves to the next excerpt
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure("suggest_conversation_topic_from_dialogue")
             error_msg = f"Conversation topic discovery error: {e}"
             try:
                 print(error_msg)
@@ -761,7 +1053,9 @@ Important:
 }}"""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "suggest_topic_from_passage",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.8,
@@ -786,6 +1080,8 @@ Important:
                 return None
             return {"title": title, "angle": angle}
         except Exception as e:  # noqa: BLE001 - caller just moves to the next passage
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure("suggest_topic_from_passage")
             error_msg = f"Passage topic discovery error: {e}"
             try:
                 print(error_msg)
@@ -793,6 +1089,7 @@ Important:
                 print(error_msg.encode("ascii", errors="ignore").decode("ascii"))
             return None
 
+    @memoized
     async def tag_exam_passage(
         self, passage_text: str, question_text: str
     ) -> Optional[List[str]]:
@@ -826,7 +1123,9 @@ Important:
 {{ "tags": ["키워드1", "키워드2", "키워드3"] }}"""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "tag_exam_passage",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.3,
@@ -847,6 +1146,8 @@ Important:
                 return []
             return [str(t).strip() for t in raw if str(t).strip()][:5]
         except Exception as e:
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure("tag_exam_passage")
             error_msg = f"Exam passage tagging error: {e}"
             try:
                 print(error_msg)
@@ -854,6 +1155,7 @@ Important:
                 print(error_msg.encode("ascii", errors="ignore").decode("ascii"))
             return None
 
+    @memoized
     async def generate_naver_version(
         self, title: str, body: str, source_url: str
     ) -> Optional[Dict[str, str]]:
@@ -890,7 +1192,9 @@ Important:
 }}"""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "generate_naver_version",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.8,
@@ -913,6 +1217,8 @@ Important:
                 return None
             return {"title": naver_title, "content": naver_content}
         except Exception as e:
+            if isinstance(e, json.JSONDecodeError):
+                gemini_metrics.record_parse_failure("generate_naver_version")
             error_msg = f"Naver version generation error: {e}"
             try:
                 print(error_msg)
@@ -920,6 +1226,7 @@ Important:
                 print(error_msg.encode("ascii", errors="ignore").decode("ascii"))
             return None
 
+    @memoized
     async def plan_blog_images(self, markdown: str) -> Optional[List[Dict[str, Any]]]:
         """
         Analyze a blog draft and propose a context-appropriate set of illustrations.
@@ -967,7 +1274,9 @@ Important:
 이미지가 필요 없으면 {{"plans": []}} 를 반환하세요."""
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate_content(
+                "plan_blog_images",
+                self.model,
                 prompt,
                 generation_config={
                     "temperature": 0.5,
@@ -994,6 +1303,7 @@ Important:
             return plans
 
         except json.JSONDecodeError as e:
+            gemini_metrics.record_parse_failure("plan_blog_images")
             msg = f"Blog image-plan JSON parse error: {e}"
             try:
                 print(msg)
@@ -1052,14 +1362,23 @@ Important:
             from google.genai import types as genai_types
 
             client = genai_new.Client(api_key=settings.GEMINI_API_KEY)
-            response = client.models.generate_content(
-                model=BLOG_IMAGE_MODEL,
-                contents=prompt,
-                config=genai_types.GenerateContentConfig(
-                    response_modalities=["IMAGE"],
-                    image_config=genai_types.ImageConfig(aspect_ratio="16:9"),
-                ),
-            )
+            started = time.perf_counter()
+            try:
+                response = await run_in_gemini_pool(
+                    client.models.generate_content,
+                    model=BLOG_IMAGE_MODEL,
+                    contents=prompt,
+                    config=genai_types.GenerateContentConfig(
+                        response_modalities=["IMAGE"],
+                        image_config=genai_types.ImageConfig(aspect_ratio="16:9"),
+                    ),
+                )
+            except Exception:
+                gemini_metrics.record_call(
+                    "generate_blog_image", BLOG_IMAGE_MODEL, time.perf_counter() - started, error=True
+                )
+                raise
+            gemini_metrics.record_call("generate_blog_image", BLOG_IMAGE_MODEL, time.perf_counter() - started, response)
             for cand in getattr(response, "candidates", None) or []:
                 parts = getattr(cand.content, "parts", None) or []
                 for part in parts:
@@ -1076,10 +1395,18 @@ Important:
                 print(msg.encode("ascii", errors="ignore").decode("ascii"))
             return None
 
-    async def extract_words_from_image(self, image_bytes: bytes, mime_type: str = "image/jpeg") -> Optional[Dict[str, Any]]:
+    async def extract_words_from_image(
+        self,
+        image_bytes: bytes,
+        mime_type: str = "image/jpeg",
+        on_word: Optional[Callable[[str], None]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Gemini Vision으로 이미지에서 영어 단어 추출
 
+        on_word: 주면 응답을 스트리밍으로 받아, 배열 원소가 완성될 때마다 정리된 단어로
+        on_word(word)를 부른다 (이벤트 루프에서, 읽는 순서대로). 반환값은 스트리밍 여부와 같다.
+
         Returns:
             { "words": ["word1", "word2", ...], "raw_text": "전체 인식 텍스트" }
             or None on error
@@ -1089,11 +1416,12 @@ Important:
             return None
 
         try:
-            # google-generativeai inline_data 형식
+            # google-generativeai inline_data 형식 — bytes를 그대로 넘긴다. base64 문자열을 주면
+            # SDK(proto-plus)가 다시 bytes로 디코딩하므로 이미지 크기만큼의 복사가 두 번 더 생긴다.
             image_part = {
                 "inline_data": {
                     "mime_type": mime_type,
-                    "data": base64.b64encode(image_bytes).decode("utf-8"),
+                    "data": image_bytes,
                 }
             }
 
@@ -1114,13 +1442,27 @@ Rules:
 - Include proper nouns if they are common English words
 - If no English words found, return: []"""
 
-            response = self.vision_model.generate_content(
-                [prompt, image_part],
-                generation_config={
-                    "temperature": 0.1,
-                    "max_output_tokens": 8192,  # 2000 → 8192: 단어 많은 이미지 대응
-                }
-            )
+            generation_config = {
+                "temperature": 0.1,
+                "max_output_tokens": 8192,  # 2000 → 8192: 단어 많은 이미지 대응
+            }
+            if on_word is None:
+                response = await self._generate_content(
+                    "extract_words_from_image",
+                    self.vision_model, [prompt, image_part], generation_config=generation_config
+                )
+            else:
+                parser = WordArrayParser()
+
+                def on_text(text: str) -> None:
+                    for w in parser.feed(text):
+                        if w.strip():
+                            on_word(w.lower().strip())
+
+                response = await self._stream_content(
+                    "extract_words_from_image",
+                    self.vision_model, [prompt, image_part], on_text, generation_config=generation_config
+                )
 
             content = response.text
             if not content:
@@ -1155,6 +1497,7 @@ Rules:
             return {"words": cleaned, "raw_text": ""}
 
         except json.JSONDecodeError as e:
+            gemini_metrics.record_parse_failure("extract_words_from_image")
             print(f"Gemini Vision JSON parse error: {e}")
             # 부분적으로 파싱 가능한지 시도
             try:
@@ -0,0 +1,144 @@
+"""OCR upload preprocessing (before the Gemini Vision request)
+
+휴대폰 사진(최대 10MB, 4000px 이상)을 그대로 base64로 보내면 업로드·요청 크기·Vision 토큰이
+모두 커진다. 단어 인식에 필요한 것은 글자 윤곽뿐이므로 보내기 전에 줄인다.
+
+1. EXIF 방향대로 회전 (세로로 찍은 사진이 누워서 가지 않도록)
+2. 흑백 변환 (OCR_GRAYSCALE) — 투명 배경은 흰색으로 채운다
+3. 여백 자르기 (OCR_CROP_MARGINS) — 종이색보다 확실히 어두운 픽셀(글자)의 경계 + 약간의 여유.
+   글자가 거의 없다고 보이면(경계가 너무 작음) 자르지 않는다.
+4. 긴 변을 OCR_MAX_LONG_EDGE px 이하로 축소
+5. JPEG(OCR_JPEG_QUALITY)로 다시 인코딩 — 결과가 원본보다 크면 원본을 보낸다
+
+Pillow 작업은 CPU를 쓰므로 prepare()가 워커 스레드에서 돌린다. 이미지를 열 수 없거나 어느
+단계든 실패하면 원본을 그대로 보낸다 (전처리 때문에 스캔이 실패하면 안 된다).
+컷오프 값은 benchmark_ocr_preprocess.py로 인식 결과 대비 전송 바이트를 비교해 고른다.
+
+입력은 bytes 또는 업로드 파일 객체(SpooledTemporaryFile)다. 파일이면 원본을 메모리에 복사하지
+않고 Pillow가 파일에서 바로 디코딩하며, 원본 바이트는 전처리가 도움이 안 될 때만 읽는다.
+JPEG는 draft()로 디코딩할 때부터 흑백/축소해 픽셀 버퍼를 줄인다 (축소는 긴 변 기준
+2 x OCR_MAX_LONG_EDGE까지만 — 여백을 잘라낸 뒤에도 해상도가 남도록).
+메모리 측정은 benchmark_ocr_upload_memory.py.
+"""
+import asyncio
+import io
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Tuple, Union
+from app.core.config import settings
+
+ImageSource = Union[bytes, BinaryIO]
+
+_CROP_PROBE_EDGE = 512  # 여백 경계는 이 크기로 줄인 사본에서 찾는다
+_CROP_DARKER_BY = 60  # 배경(중앙값)보다 이만큼 어두우면 글자로 본다
+_CROP_PADDING = 0.02  # 경계 밖으로 남길 여유 (변 길이 비율)
+_CROP_MIN_AREA = 0.2  # 경계가 원본 면적의 이 비율보다 작으면 자르지 않는다
+
+
+@dataclass(frozen=True)
+class Options:
+    max_long_edge: int
+    jpeg_quality: int
+    grayscale: bool
+    crop_margins: bool
+    jpeg_draft: bool = True  # JPEG를 디코딩 단계에서 흑백/축소 (벤치마크 비교용으로 끌 수 있음)
+
+    @classmethod
+    def from_settings(cls) -> "Options":
+        return cls(
+            max_long_edge=settings.OCR_MAX_LONG_EDGE,
+            jpeg_quality=settings.OCR_JPEG_QUALITY,
+            grayscale=settings.OCR_GRAYSCALE,
+            crop_margins=settings.OCR_CROP_MARGINS,
+        )
+
+
+def _content_box(img) -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box of ink on paper (None when there is nothing worth cropping)"""
+    from PIL import ImageStat
+
+    probe = img.convert("L")
+    probe.thumbnail((_CROP_PROBE_EDGE, _CROP_PROBE_EDGE))
+    background = ImageStat.Stat(probe).median[0]
+    threshold = background - _CROP_DARKER_BY
+    if threshold <= 0:
+        return None  # 어두운 배경 — 종이 여백이 아니다
+    box = probe.point(lambda p: 255 if p < threshold else 0).getbbox()
+    if box is None:
+        return None
+
+    sx, sy = img.width / probe.width, img.height / probe.height
+    pad_x, pad_y = int(img.width * _CROP_PADDING), int(img.height * _CROP_PADDING)
+    left = max(0, int(box[0] * sx) - pad_x)
+    top = max(0, int(box[1] * sy) - pad_y)
+    right = min(img.width, int(box[2] * sx) + pad_x)
+    bottom = min(img.height, int(box[3] * sy) + pad_y)
+    area = (right - left) * (bottom - top) / (img.width * img.height)
+    if area < _CROP_MIN_AREA or area > 0.95:
+        return None
+    return left, top, right, bottom
+
+
+def read_all(image: ImageSource) -> bytes:
+    """The original bytes (reads a file object from the start)"""
+    if isinstance(image, bytes):
+        return image
+    image.seek(0)
+    return image.read()
+
+
+def _size(image: ImageSource) -> int:
+    if isinstance(image, bytes):
+        return len(image)
+    size = image.seek(0, io.SEEK_END)
+    image.seek(0)
+    return size
+
+
+def preprocess(image: ImageSource, mime_type: str, options: Optional[Options] = None) -> Tuple[bytes, str]:
+    """Return (bytes, mime_type) to send to Vision — the original pair if preprocessing can't help"""
+    from PIL import Image, ImageOps
+
+    options = options or Options.from_settings()
+    original_size = _size(image)
+    try:
+        img = Image.open(io.BytesIO(image) if isinstance(image, bytes) else image)
+        if img.format == "JPEG" and options.jpeg_draft:
+            draft_edge = options.max_long_edge * 2
+            img.draft("L" if options.grayscale else "RGB", (draft_edge, draft_edge))
+        img = ImageOps.exif_transpose(img)
+
+        if img.mode in ("RGBA", "LA", "P"):
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, "white")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        img = img.convert("L" if options.grayscale else "RGB")
+
+        if options.crop_margins:
+            box = _content_box(img)
+            if box:
+                img = img.crop(box)
+
+        if max(img.size) > options.max_long_edge:
+            img.thumbnail((options.max_long_edge, options.max_long_edge), Image.LANCZOS)
+
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=options.jpeg_quality, optimize=True)
+        out = buf.getvalue()
+    except Exception as e:  # noqa: BLE001 - preprocessing is best-effort, never block a scan
+        print(f"OCR preprocess failed, sending original: {e}")
+        return read_all(image), mime_type
+
+    if len(out) >= original_size:
+        return read_all(image), mime_type
+    return out, "image/jpeg"
+
+
+async def prepare(image: ImageSource, mime_type: str) -> Tuple[bytes, str]:
+    """preprocess() on a worker thread (just the original bytes when OCR_PREPROCESS_ENABLED is off)"""
+    if not settings.OCR_PREPROCESS_ENABLED:
+        return (image, mime_type) if isinstance(image, bytes) else (await asyncio.to_thread(read_all, image), mime_type)
+    original_size = _size(image)
+    out, out_type = await asyncio.to_thread(preprocess, image, mime_type)
+    if out_type != mime_type or len(out) != original_size:
+        print(f"OCR preprocess: {original_size} -> {len(out)} bytes")
+    return out, out_type
@@ -0,0 +1,209 @@
+"""Perceptual-hash cache of OCR extraction results (ocr_cache_entries / ocr_cache_bands)
+
+같은 반 학생들이 같은 교재 페이지를 하루에 수십 번 찍는데, 사진마다 Gemini Vision을 한 번씩
+부른다. 전처리(image_preprocess — 회전/흑백/여백 자르기)를 마친 이미지의 지문(fingerprint)으로
+이전 추출 결과를 저장해 두고, 같은 페이지를 다시 찍은 사진이 오면 Vision 없이 저장된 단어 목록을
+돌려준다.
+
+- 정규화: 400px로 줄이고 대비를 맞춘 뒤 ±3도 안에서 글자 줄이 가장 또렷한(행 밝기 분산 최대)
+  각도로 기울기를 바로잡고 글자 경계로 자른다. 다시 찍은 사진의 기울기/여백 차이가 지문에서 빠진다.
+- dHash: 정규화한 페이지를 13x12로 줄여 가로로 이웃한 픽셀의 밝기 비교 144개. 다시 찍은 사진은
+  거리 0~11, 다른 페이지는 대개 20 이상. 이 해상도에서는 글자보다 레이아웃(머리띠, 그림, 표)이
+  지배적이어서 같은 양식의 다른 페이지가 10 안팎으로 가까울 수 있다 — 그래서 후보 찾기에만 쓴다.
+- 확인: 정규화한 페이지의 32x32 축소본(detail)을 같이 저장하고, 후보와 비교해 글자 질감이 있는
+  픽셀(3x3 안의 밝기 범위가 큰 곳)의 평균 밝기 차가 OCR_CACHE_MAX_DETAIL_DIFF 이하일 때만 적중.
+  같은 양식에서 본문이 네 줄 이상 다르면 확실히 갈린다(다시 찍기 4~6, 다른 페이지 12 이상).
+- 이웃 검색: 해시를 12비트씩 12조각(band)으로 나눠 인덱스에 넣는다. 거리가 11 이하인 두 해시는
+  적어도 한 조각이 같으므로(비둘기집), (band, value) 인덱스로 후보를 찾고 거리는 파이썬에서 잰다.
+- 항목은 OCR_CACHE_TTL_SECONDS 뒤 만료되고, 저장할 때 만료된 항목을 지운다.
+- 적중/미스 수는 프로세스 메모리에 센다 (/admin/cache/stats의 ocr_cache).
+- 실패(결과 None)는 저장하지 않는다. 캐시 오류는 스캔을 막지 않는다.
+"""
+import asyncio
+import io
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ocr_cache import OcrCacheBand, OcrCacheEntry
+
+HASH_SIZE = 12  # 12x12 비교 = 144비트
+BANDS = 12
+_BAND_BITS = HASH_SIZE * HASH_SIZE // BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+DETAIL_SIZE = 32
+
+_NORMALIZE_EDGE = 400
+_SKEW_ANGLES = [step * 0.25 for step in range(-12, 13)]  # ±3도
+_INK_LEVEL = 80  # 정규화(반전)한 이미지에서 이보다 밝으면 글자/선
+_DETAIL_EDGE = 60  # 3x3 밝기 범위가 이보다 크면 글자 질감이 있는 픽셀
+
+_stats = {"lookups": 0, "hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+def _now() -> datetime:
+    # 저장된 시각은 tz 없는 UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _enabled() -> bool:
+    return settings.OCR_CACHE_TTL_SECONDS > 0
+
+
+def _max_distance() -> int:
+    # 조각 수보다 작아야 후보 검색이 이웃을 놓치지 않는다
+    return max(0, min(settings.OCR_CACHE_MAX_DISTANCE, BANDS - 1))
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    hash: int  # 144-bit dHash (후보 찾기)
+    detail: bytes  # DETAIL_SIZE x DETAIL_SIZE 흑백 축소본 (후보 확인)
+
+
+def _normalized_page(img):
+    """Ink-on-black page (L mode), deskewed and cropped to the ink"""
+    from PIL import Image, ImageOps, ImageStat
+
+    img = ImageOps.autocontrast(img, cutoff=1)
+    img.thumbnail((_NORMALIZE_EDGE, _NORMALIZE_EDGE))
+    ink = ImageOps.invert(img)  # 회전으로 생기는 빈 곳(0)이 종이와 같아지도록
+
+    def row_variance(angle: float) -> float:
+        rotated = ink.rotate(angle, resample=Image.BILINEAR)
+        return ImageStat.Stat(rotated.resize((1, rotated.height), Image.BOX)).var[0]
+
+    ink = ink.rotate(max(_SKEW_ANGLES, key=row_variance), resample=Image.BILINEAR)
+    box = ink.point(lambda v: 255 if v > _INK_LEVEL else 0).getbbox()
+    return ink.crop(box) if box else ink
+
+
+def fingerprint(image_bytes: bytes) -> Optional[Fingerprint]:
+    """Hash + detail thumbnail of a page image (None if it can't be decoded)"""
+    from PIL import Image, ImageOps
+
+    try:
+        page = _normalized_page(ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes))).convert("L"))
+        pixels = page.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).tobytes()
+        detail = page.resize((DETAIL_SIZE, DETAIL_SIZE), Image.BOX).tobytes()
+    except Exception as e:  # noqa: BLE001 - no hash just means no caching
+        print(f"OCR cache hash failed: {e}")
+        return None
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return Fingerprint(bits, detail)
+
+
+def detail_difference(a: bytes, b: bytes) -> float:
+    """Mean brightness difference of two detail thumbnails over the pixels with text texture"""
+    from PIL import Image, ImageChops, ImageFilter
+
+    def texture(data: bytes) -> bytes:
+        img = Image.frombytes("L", (DETAIL_SIZE, DETAIL_SIZE), data)
+        return ImageChops.subtract(img.filter(ImageFilter.MaxFilter(3)), img.filter(ImageFilter.MinFilter(3))).tobytes()
+
+    texture_a, texture_b = texture(a), texture(b)
+    diffs = [
+        abs(a[i] - b[i]) for i in range(len(a))
+        if texture_a[i] > _DETAIL_EDGE or texture_b[i] > _DETAIL_EDGE
+    ]
+    return sum(diffs) / len(diffs) if diffs else 0.0
+
+
+def _bands(value: int) -> List[Tuple[int, int]]:
+    return [(i, (value >> (i * _BAND_BITS)) & _BAND_MASK) for i in range(BANDS)]
+
+
+def _distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+async def hash_upload(image_bytes: bytes) -> Optional[Fingerprint]:
+    """fingerprint() on a worker thread (None when the cache is off)"""
+    if not _enabled():
+        return None
+    return await asyncio.to_thread(fingerprint, image_bytes)
+
+
+def _matches(value: Fingerprint, entry: OcrCacheEntry) -> bool:
+    # detail이 다르면 레이아웃만 같은 다른 페이지다
+    return entry.detail is not None and len(entry.detail) == len(value.detail) and (
+        detail_difference(value.detail, entry.detail) <= settings.OCR_CACHE_MAX_DETAIL_DIFF
+    )
+
+
+def lookup(db: Session, value: Fingerprint) -> Optional[OcrCacheEntry]:
+    """The closest unexpired entry within OCR_CACHE_MAX_DISTANCE whose detail also matches, or None"""
+    _stats["lookups"] += 1
+    try:
+        candidate_ids = select(OcrCacheBand.entry_id).where(
+            tuple_(OcrCacheBand.band, OcrCacheBand.value).in_(_bands(value.hash))
+        )
+        entries = db.execute(
+            select(OcrCacheEntry).where(OcrCacheEntry.id.in_(candidate_ids), OcrCacheEntry.expires_at > _now())
+        ).scalars().all()
+        scored = [(_distance(value.hash, int(e.image_hash, 16)), e.id, e) for e in entries]
+        scored = [s for s in scored if s[0] <= _max_distance() and _matches(value, s[2])]
+        if not scored:
+            _stats["misses"] += 1
+            return None
+        distance, _, entry = min(scored, key=lambda s: s[:2])
+        entry.hits += 1
+        db.commit()
+    except Exception as e:
+        print(f"OCR cache lookup error: {e}")
+        db.rollback()
+        _stats["errors"] += 1
+        return None
+    _stats["hits"] += 1
+    print(f"OCR cache hit: entry {entry.id} (distance {distance})")
+    return entry
+
+
+def store(db: Session, value: Fingerprint, words: List[str], raw_text: str) -> None:
+    """Save an extraction result (and drop expired entries)"""
+    now = _now()
+    try:
+        entry = OcrCacheEntry(
+            image_hash=f"{value.hash:0{HASH_SIZE * HASH_SIZE // 4}x}",
+            detail=value.detail,
+            words=list(words),
+            raw_text=raw_text or "",
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.OCR_CACHE_TTL_SECONDS),
+        )
+        db.add(entry)
+        db.flush()
+        db.add_all(OcrCacheBand(entry_id=entry.id, band=band, value=v) for band, v in _bands(value.hash))
+        _purge_expired(db, now)
+        db.commit()
+    except Exception as e:
+        print(f"OCR cache store error: {e}")
+        db.rollback()
+        _stats["errors"] += 1
+        return
+    _stats["stores"] += 1
+
+
+def _purge_expired(db: Session, now: datetime) -> None:
+    expired = select(OcrCacheEntry.id).where(OcrCacheEntry.expires_at <= now)
+    db.execute(delete(OcrCacheBand).where(OcrCacheBand.entry_id.in_(expired)))
+    db.execute(delete(OcrCacheEntry).where(OcrCacheEntry.expires_at <= now))
+
+
+def get_stats() -> Dict[str, Any]:
+    lookups = _stats["lookups"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups * 100, 2) if lookups else 0,
+    }
+
+
+def reset_stats() -> None:
+    for key in _stats:
+        _stats[key] = 0
@@ -0,0 +1,253 @@
+"""PDF text layer → reading-order text (pdfplumber; 스캔/OCR 아님)
+
+ingest_exam_pdfs.py(기출 인제스트)와 /ocr/scan의 PDF 업로드가 같이 쓴다.
+
+- reconstruct_page_text: 2단 레이아웃을 컬럼별로 나눠 읽고 밑줄 친 단어를 <u>...</u>로 표시
+- strip_page_furniture: 페이지 번호/저작권 문구/홀짝형 워터마크 줄 제거
+- read_pages: 업로드된 PDF를 페이지별 텍스트로 — 텍스트 레이어가 없는 페이지(스캔본)만
+  이미지로 렌더링해 Vision에 넘길 수 있게 한다
+- words_from_text: 텍스트에서 영단어 목록 (Vision 프롬프트와 같은 규칙: 소문자, 읽는 순서, 중복 없음)
+
+pdfplumber는 함수 안에서 import한다 (이 모듈을 import만 하는 곳은 설치 없이도 돌도록).
+"""
+import io
+import re
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+# ---------- Column-aware reconstruction (pure — unit-testable without a real PDF) ----------
+#
+# 수능 영어영역 문제지는 대부분 페이지가 2단(컬럼) 레이아웃이다. pdfplumber의 기본
+# extract_text()는 페이지를 y좌표 밴드 단위 좌→우로 읽어, 좌/우 컬럼의 텍스트가 줄 단위로
+# 인터리빙되어 서로 다른 지문·문제가 뒤섞인다(실측: 33번 지문에 35번 문제 텍스트가 섞임).
+# 컬럼 사이 여백(거터)을 찾아 컬럼별로 나눠 읽은 뒤 좌→우 순서로 이어붙인다.
+
+def find_gutter_x(words: List[Dict], page_width: float) -> Optional[float]:
+    """Find the x-coordinate of the widest gap between word spans in the middle 30~70%
+    of the page width (the column gutter). Returns None when no clear gap exists
+    (single-column page) — callers should treat that as "everything is one column".
+    """
+    band_lo, band_hi = page_width * 0.3, page_width * 0.7
+    edges = sorted(
+        (w["x0"], w["x1"]) for w in words if band_lo <= (w["x0"] + w["x1"]) / 2 <= band_hi
+    )
+    if len(edges) < 2:
+        return None
+
+    best_gap = 0.0
+    best_mid = None
+    max_x1_so_far = edges[0][1]
+    for x0, x1 in edges[1:]:
+        gap = x0 - max_x1_so_far
+        if gap > best_gap:
+            best_gap = gap
+            best_mid = (max_x1_so_far + x0) / 2
+        max_x1_so_far = max(max_x1_so_far, x1)
+
+    # A real column gutter is a visually obvious gap, not incidental word spacing.
+    return best_mid if best_gap >= 8 else None
+
+
+def is_underline_shape(x0: float, x1: float, top: float, bottom: float) -> bool:
+    """True when a drawn line/rect looks like a single underline stroke rather than a
+    page border, table gridline, or textbox outline.
+
+    수능 "밑줄 친 부분 중" (which underlined part) questions mark answer choices by
+    drawing a thin horizontal stroke under a word or short phrase — never under a whole
+    page-width line. width>=3pt excludes stray hairline artifacts; height<=1.5pt is the
+    tell for a flat stroke (as opposed to a filled box); width<=400pt excludes page
+    borders/dividers that happen to be thin but span most of the page width.
+    """
+    width = x1 - x0
+    height = abs(bottom - top)
+    return 3 <= width <= 400 and height <= 1.5
+
+
+def collect_underline_shapes(lines_objs: List[Dict], rects_objs: List[Dict]) -> List[Dict]:
+    """Filter a page's raw `lines` + `rects` (pdfplumber) down to underline-shaped strokes.
+
+    KICE PDFs draw underlines as either a straight line or a thin filled rect depending on
+    the export tool, so both object types are checked with the same shape heuristic.
+    """
+    shapes: List[Dict] = []
+    for obj in list(lines_objs or []) + list(rects_objs or []):
+        x0, x1, top, bottom = obj["x0"], obj["x1"], obj["top"], obj["bottom"]
+        if is_underline_shape(x0, x1, top, bottom):
+            shapes.append({"x0": x0, "x1": x1, "top": top, "bottom": bottom})
+    return shapes
+
+
+def word_is_underlined(word: Dict, underline_shapes: List[Dict], tolerance: float = 3.0) -> bool:
+    """True when an underline stroke sits just below `word`'s baseline and overlaps it.
+
+    The stroke must be at/below the word's bottom edge (never above — that would be a
+    strikethrough or the previous line's descender) and within `tolerance` points of it
+    (real underlines sit close to the baseline, not floating below). Horizontal overlap
+    must cover at least half the word's width so a stroke spanning several words in a
+    phrase still marks each of them, while a stroke under a neighboring word doesn't.
+    """
+    wx0, wx1, wbottom = word["x0"], word["x1"], word["bottom"]
+    word_width = wx1 - wx0
+    if word_width <= 0:
+        return False
+    for shape in underline_shapes:
+        if shape["top"] < wbottom - 1 or shape["top"] - wbottom > tolerance:
+            continue
+        overlap = min(wx1, shape["x1"]) - max(wx0, shape["x0"])
+        if overlap >= word_width * 0.5:
+            return True
+    return False
+
+
+def _words_to_text(words: List[Dict], underline_shapes: Optional[List[Dict]] = None) -> str:
+    """Group words into lines by vertical position, then join lines top-to-bottom.
+
+    Words whose baseline has a matching underline stroke (see word_is_underlined) are
+    wrapped in `<u>...</u>`, merging contiguous underlined words into a single span so a
+    multi-word underlined phrase renders as one tag rather than one per word.
+    """
+    if not words:
+        return ""
+    underline_shapes = underline_shapes or []
+    lines: List[List[Dict]] = []
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and abs(lines[-1][0]["top"] - w["top"]) <= 3:
+            lines[-1].append(w)
+        else:
+            lines.append([w])
+
+    out_lines: List[str] = []
+    for line in lines:
+        line_words = sorted(line, key=lambda w: w["x0"])
+        pieces: List[str] = []
+        run: List[str] = []
+        run_underlined = False
+
+        def flush() -> None:
+            if not run:
+                return
+            text = " ".join(run)
+            pieces.append(f"<u>{text}</u>" if run_underlined else text)
+            run.clear()
+
+        for w in line_words:
+            underlined = word_is_underlined(w, underline_shapes)
+            if run and underlined != run_underlined:
+                flush()
+            run.append(w["text"])
+            run_underlined = underlined
+        flush()
+        out_lines.append(" ".join(pieces))
+    return "\n".join(out_lines)
+
+
+def reconstruct_page_text(
+    words: List[Dict], page_width: float, underline_shapes: Optional[List[Dict]] = None
+) -> str:
+    """Reorder a page's words into reading order: left column top-to-bottom, then
+    right column top-to-bottom. Falls back to single-column (page-wide) order when no
+    gutter is detected. Underline shapes are split across columns the same way words are,
+    so a stroke under a right-column word isn't matched against a left-column word.
+    """
+    underline_shapes = underline_shapes or []
+    gutter = find_gutter_x(words, page_width)
+    if gutter is None:
+        return _words_to_text(words, underline_shapes)
+
+    left = [w for w in words if (w["x0"] + w["x1"]) / 2 < gutter]
+    right = [w for w in words if (w["x0"] + w["x1"]) / 2 >= gutter]
+    left_shapes = [s for s in underline_shapes if (s["x0"] + s["x1"]) / 2 < gutter]
+    right_shapes = [s for s in underline_shapes if (s["x0"] + s["x1"]) / 2 >= gutter]
+    return (
+        _words_to_text(left, left_shapes) + "\n" + _words_to_text(right, right_shapes)
+    )
+
+
+# Recurring per-page footer furniture printed on every 수능 문제지 page (copyright notice,
+# bare page number, 홀수형/짝수형 booklet-version watermark). Left in place, this bleeds into
+# whichever choice/passage happens to end at a page boundary — observed live: choice (E) of
+# a problem ending mid-page got "...8\n이 문제지에 관한 저작권은 한국교육과정평가원에
+# 있습니다.\n홀수형" appended. None of this is exam content, so strip it before parsing.
+_PAGE_FURNITURE_RE = re.compile(
+    r"(?m)^\s*(?:\d{1,3}|이 문제지에 관한 저작권은 한국교육과정평가원에 있습니다\.?|홀수형|짝수형)\s*$"
+)
+
+
+def strip_page_furniture(text: str) -> str:
+    """Remove recurring page-footer lines (page number / copyright notice / 홀짝 watermark)."""
+    lines = [ln for ln in text.splitlines() if not _PAGE_FURNITURE_RE.match(ln)]
+    return "\n".join(lines)
+
+
+def _page_text(page: Any, underlines: bool = True) -> str:
+    shapes = collect_underline_shapes(page.lines, page.rects) if underlines else None
+    return strip_page_furniture(reconstruct_page_text(page.extract_words(), page.width, shapes))
+
+
+def extract_text_from_pdf(pdf_path: Any) -> str:
+    """Extract the text layer of a PDF via pdfplumber (lazy import), column-aware.
+
+    Not a scan — no OCR. Reconstructs 2-column pages via reconstruct_page_text() instead
+    of pdfplumber's default extract_text(), which interleaves columns line-by-line, then
+    strips recurring page-footer furniture (see strip_page_furniture) that would otherwise
+    bleed into whichever choice/passage ends at a page boundary.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return "\n".join(_page_text(page) for page in pdf.pages)
+
+
+# ---------- Uploaded PDFs (/ocr/scan) ----------
+
+class PdfError(ValueError):
+    """Unreadable or oversized upload (message is shown to the user)"""
+
+
+@dataclass
+class PdfPage:
+    number: int  # 1부터
+    text: str
+    image: Optional[bytes] = None  # 텍스트 레이어가 없는 페이지만 — JPEG
+
+
+def read_pages(source: Union[bytes, BinaryIO], max_pages: int, dpi: int = 150, jpeg_quality: int = 85) -> List[PdfPage]:
+    """Text of each page; pages without any text layer are rendered to JPEG instead (for Vision).
+
+    source: bytes or a seekable file (an upload is parsed straight from its spooled file)
+    """
+    import pdfplumber
+
+    try:
+        pdf = pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    except Exception as e:  # noqa: BLE001 - pdfminer raises many types on garbage input
+        raise PdfError("PDF 파일을 읽을 수 없습니다.") from e
+    with pdf:
+        if len(pdf.pages) > max_pages:
+            raise PdfError(f"PDF는 최대 {max_pages}페이지까지 스캔할 수 있습니다.")
+        pages: List[PdfPage] = []
+        for number, page in enumerate(pdf.pages, start=1):
+            try:
+                if page.chars:
+                    pages.append(PdfPage(number, _page_text(page, underlines=False)))
+                    continue
+                buf = io.BytesIO()
+                page.to_image(resolution=dpi).original.convert("RGB").save(buf, format="JPEG", quality=jpeg_quality)
+                pages.append(PdfPage(number, "", buf.getvalue()))
+            except Exception as e:  # noqa: BLE001 - one broken page shouldn't lose the rest
+                print(f"PDF page {number} skipped: {e}")
+                pages.append(PdfPage(number, ""))
+    return pages
+
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:['’-][A-Za-z]+)*")
+
+
+def words_from_text(text: str) -> List[str]:
+    """English words in reading order — lowercase, no duplicates, no single letters except 'a'/'i'"""
+    words: Dict[str, None] = {}
+    for match in _WORD_RE.finditer(text or ""):
+        word = match.group(0).lower().replace("’", "'")
+        if len(word) > 1 or word in ("a", "i"):
+            words.setdefault(word)
+    return list(words)
@@ -0,0 +1,182 @@
+"""Word dictionary cache tiers: in-process L1 → Redis (L2) → words table
+
+L1은 인스턴스마다 따로 있는 메모리 LRU라서, words 행이 바뀌면 다른 인스턴스의 L1도
+비워야 한다. Word 행의 내용 컬럼(뜻·발음·난이도 등)이 바뀌거나 행이 삭제된 트랜잭션이
+커밋되면, 이 인스턴스의 L1과 Redis의 word:{word} 키를 지우고 Redis pub/sub 채널로
+다른 인스턴스에 알린다. Redis가 없으면 방송은 생략되고, 다른 인스턴스의 L1은
+WORD_L1_TTL_SECONDS 안에 자연 만료된다.
+
+usage_count 증가는 사전 내용이 아니므로 무효화하지 않는다.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+from app.core.local_cache import TTLCache
+from app.core.redis_client import (
+    get_cached_many, set_cached_many, delete_cached_many, publish, run_subscriber,
+)
+from app.models.word import Word
+
+INVALIDATION_CHANNEL = "word:invalidate"
+
+# 이 컬럼이 바뀌었을 때만 캐시된 사전 항목이 낡은 것으로 본다
+_CONTENT_COLUMNS = ("word", "pronunciation", "difficulty", "meanings", "source", "gpt_generated")
+
+_SESSION_INFO_KEY = "word_cache_invalidations"
+
+word_l1 = TTLCache(settings.WORD_L1_MAX_ENTRIES, settings.WORD_L1_TTL_SECONDS)
+
+# 무효화 구독 태스크가 도는 이벤트 루프. 스레드풀에서 실행되는 동기 엔드포인트의 커밋에서도
+# 이 루프로 방송을 넘긴다.
+_app_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def cache_key(word: str) -> str:
+    return f"word:{word}"
+
+
+def rejected_key(word: str) -> str:
+    """Negative-cache key for a token Gemini rejected as not a word"""
+    return f"word:rejected:{word}"
+
+
+def word_to_dict(db_word: Word) -> Dict[str, Any]:
+    """Serializable cache/API payload for a Word row"""
+    return {
+        "id": db_word.id,
+        "word": db_word.word,
+        "pronunciation": db_word.pronunciation,
+        "difficulty": db_word.difficulty,
+        "meanings": db_word.meanings,
+        "source": db_word.source,
+        "gpt_generated": db_word.gpt_generated,
+        "usage_count": db_word.usage_count,
+    }
+
+
+async def get_many(words: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Look words up in L1, then Redis (one MGET) for the L1 misses. Returns {word: data}."""
+    words = list(dict.fromkeys(words))
+    found: Dict[str, Dict[str, Any]] = {
+        k[len("word:"):]: v for k, v in word_l1.get_many(cache_key(w) for w in words).items()
+    }
+    l1_misses = [w for w in words if w not in found]
+    if l1_misses:
+        from_redis = await get_cached_many([cache_key(w) for w in l1_misses])
+        if from_redis:
+            word_l1.set_many(from_redis)
+            found.update({k[len("word:"):]: v for k, v in from_redis.items()})
+    return found
+
+
+async def set_many(items: Dict[str, Dict[str, Any]]) -> None:
+    """Write {word: data} to both tiers"""
+    if not items:
+        return
+    keyed = {cache_key(w): data for w, data in items.items()}
+    word_l1.set_many(keyed)
+    await set_cached_many(keyed)
+
+
+async def get_rejected_many(words: Iterable[str]) -> Dict[str, str]:
+    """Negative-cache lookup (L1, then Redis). Returns {word: reason} for known-rejected tokens."""
+    words = list(dict.fromkeys(words))
+    entries = word_l1.get_many(rejected_key(w) for w in words)
+    l1_misses = [rejected_key(w) for w in words if rejected_key(w) not in entries]
+    if l1_misses:
+        from_redis = await get_cached_many(l1_misses)
+        if from_redis:
+            word_l1.set_many(from_redis)
+            entries.update(from_redis)
+    prefix = len(rejected_key(""))
+    return {k[prefix:]: (v or {}).get("reason") or "" for k, v in entries.items()}
+
+
+async def set_rejected_many(items: Dict[str, Optional[str]]) -> None:
+    """Remember {word: reason} rejections in both tiers (Redis with the long negative TTL)"""
+    if not items:
+        return
+    keyed = {rejected_key(w): {"reason": reason} for w, reason in items.items()}
+    word_l1.set_many(keyed)
+    await set_cached_many(keyed, ttl=settings.WORD_REJECTED_CACHE_TTL_SECONDS)
+
+
+def evict_local(words: Iterable[str]) -> None:
+    for word in words:
+        word_l1.pop(cache_key(word))
+        word_l1.pop(rejected_key(word))
+
+
+async def invalidate(words: Iterable[str]) -> None:
+    """Drop words (and their negative-cache entries) from every tier on every instance"""
+    words = sorted(set(words))
+    if not words:
+        return
+    evict_local(words)
+    await delete_cached_many([cache_key(w) for w in words] + [rejected_key(w) for w in words])
+    await publish(INVALIDATION_CHANNEL, words)
+
+
+def _on_invalidation_message(message: Any) -> None:
+    if isinstance(message, list):
+        evict_local(w for w in message if isinstance(w, str))
+
+
+async def run_invalidation_listener() -> None:
+    """Apply other instances' invalidations to this instance's L1 (runs for the app's lifetime)"""
+    global _app_loop
+    _app_loop = asyncio.get_running_loop()
+    try:
+        await run_subscriber(INVALIDATION_CHANNEL, _on_invalidation_message)
+    finally:
+        _app_loop = None
+
+
+def _schedule_invalidation(words: List[str]) -> None:
+    try:
+        asyncio.get_running_loop()
+        asyncio.ensure_future(invalidate(words))
+        return
+    except RuntimeError:
+        pass
+    if _app_loop is not None and _app_loop.is_running():
+        asyncio.run_coroutine_threadsafe(invalidate(words), _app_loop)
+    # 앱 루프가 없는 일회성 스크립트: 로컬 L1만 비우고(프로세스와 함께 사라짐) Redis 키는 TTL로 만료
+
+
+def _record_change(target: Word) -> None:
+    session = object_session(target)
+    if session is None:
+        return
+    pending: Set[str] = session.info.setdefault(_SESSION_INFO_KEY, set())
+    pending.add(target.word)
+    # 단어 자체가 바뀐 경우 예전 키도 지운다
+    history = inspect(target).attrs.word.history
+    pending.update(w for w in (history.deleted or ()) if isinstance(w, str))
+
+
+@event.listens_for(Word, "after_update")
+def _word_updated(mapper, connection, target: Word) -> None:
+    state = inspect(target)
+    if any(state.attrs[col].history.has_changes() for col in _CONTENT_COLUMNS):
+        _record_change(target)
+
+
+@event.listens_for(Word, "after_delete")
+def _word_deleted(mapper, connection, target: Word) -> None:
+    _record_change(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session: Session) -> None:
+    words = session.info.pop(_SESSION_INFO_KEY, None)
+    if words:
+        evict_local(words)
+        _schedule_invalidation(sorted(words))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -0,0 +1,125 @@
+"""Incremental dictionary sync (/words/changes)
+
+스냅샷(/words/snapshot)을 받은 앱이 이후 바뀐 것만 따라잡도록, 커서 이후에 추가/수정된 단어와
+삭제된 단어(word_tombstones)를 페이지 단위로 내려준다.
+
+- 단어는 (updated_at, id), 삭제는 (deleted_at, id) 순서로 읽는다 — 둘 다 복합 인덱스가 있어
+  커서 이후 구간만 인덱스 범위 스캔한다.
+- 커서는 두 위치를 담은 불투명 문자열이다. 클라이언트는 next_cursor를 저장했다가 다음에 그대로 보낸다.
+- 최근 WORD_CHANGES_SETTLE_SECONDS 안에 바뀐 행은 다음 요청으로 미룬다. updated_at은 커밋이
+  아니라 쓰기 시점이라, 더 일찍 시작해 늦게 커밋된 행이 이미 지나간 커서 뒤에 끼어들 수 있다.
+- usage_count flush는 updated_at을 바꾸지 않으므로 피드에 나오지 않는다.
+- 삭제 기록은 ORM 삭제(db.delete)의 after_delete 훅이 같은 트랜잭션에서 남긴다.
+  query.delete()/SQL로 직접 지운 행은 기록되지 않는다.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import event, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.word import Word
+from app.models.word_tombstone import WordTombstone
+
+# (timestamp, id) — None이면 처음부터
+_Position = Optional[Tuple[datetime, int]]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class ChangesPage:
+    changes: List[Word]
+    deleted: List[WordTombstone]
+    next_cursor: str
+    has_more: bool
+
+
+def _encode_position(position: _Position) -> Optional[list]:
+    return [position[0].isoformat(), position[1]] if position else None
+
+
+def _decode_position(raw) -> _Position:
+    if raw is None:
+        return None
+    timestamp, row_id = raw
+    return datetime.fromisoformat(timestamp), int(row_id)
+
+
+def encode_cursor(words: _Position, deleted: _Position) -> str:
+    raw = json.dumps({"w": _encode_position(words), "d": _encode_position(deleted)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[_Position, _Position]:
+    if not cursor:
+        return None, None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return _decode_position(raw["w"]), _decode_position(raw["d"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def _settled_before() -> datetime:
+    # 저장된 시각은 tz 없는 UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=settings.WORD_CHANGES_SETTLE_SECONDS)
+
+
+def get_changes(db: Session, cursor: Optional[str], limit: int) -> ChangesPage:
+    """Words changed and deleted after `cursor`, up to `limit` of each"""
+    words_after, deleted_after = decode_cursor(cursor)
+    cutoff = _settled_before()
+
+    word_query = select(Word).where(Word.updated_at <= cutoff)
+    if words_after:
+        word_query = word_query.where(tuple_(Word.updated_at, Word.id) > tuple_(*words_after))
+    words = db.execute(word_query.order_by(Word.updated_at, Word.id).limit(limit + 1)).scalars().all()
+
+    tombstone_query = select(WordTombstone).where(WordTombstone.deleted_at <= cutoff)
+    if deleted_after:
+        tombstone_query = tombstone_query.where(
+            tuple_(WordTombstone.deleted_at, WordTombstone.id) > tuple_(*deleted_after)
+        )
+    tombstones = db.execute(
+        tombstone_query.order_by(WordTombstone.deleted_at, WordTombstone.id).limit(limit + 1)
+    ).scalars().all()
+
+    has_more = len(words) > limit or len(tombstones) > limit
+    words, tombstones = words[:limit], tombstones[:limit]
+    if words:
+        words_after = (words[-1].updated_at, words[-1].id)
+    if tombstones:
+        deleted_after = (tombstones[-1].deleted_at, tombstones[-1].id)
+    return ChangesPage(
+        changes=words,
+        deleted=tombstones,
+        next_cursor=encode_cursor(words_after, deleted_after),
+        has_more=has_more,
+    )
+
+
+def snapshot_cursor(db: Session) -> str:
+    """Cursor to continue from a snapshot of the current table (may repeat the last few rows — harmless)"""
+    max_updated = db.execute(select(func.max(Word.updated_at))).scalar()
+    max_deleted = db.execute(select(func.max(WordTombstone.deleted_at))).scalar()
+    settle = timedelta(seconds=settings.WORD_CHANGES_SETTLE_SECONDS)
+    return encode_cursor(
+        (max_updated - settle, 0) if max_updated else None,
+        (max_deleted - settle, 0) if max_deleted else None,
+    )
+
+
+@event.listens_for(Word, "after_delete")
+def _record_tombstone(mapper, connection, target: Word) -> None:
+    connection.execute(
+        insert(WordTombstone.__table__).values(
+            word_id=target.id,
+            word=target.word,
+            deleted_at=datetime.now(timezone.utc),
+        )
+    )
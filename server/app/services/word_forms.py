@@ -0,0 +1,218 @@
+"""Headword normalization: inflected forms and spelling variants → existing dictionary entry
+
+"abandoned", "abandons", "abandoning"이 각각 words 미스로 Gemini 생성 대상이 되지 않도록,
+사전에 없는 토큰은 표제어 후보를 만들어 보고 그 표제어가 이미 사전에 있으면 그 항목으로 답한다.
+
+- 굴절형(규칙 기반): -s/-es/-ies, -ed/-ied, -ing, -ier/-iest, 자음 중복(stopped → stop),
+  불규칙 동사·복수(went → go, children → child). -er/-est 일반형은 자르지 않는다
+  (teacher → teach, letter → let, forest → for처럼 굴절이 아닌 경우가 더 많다).
+  -eed 단어(seed, feed, speed)와 2글자 이하 어간(shed → sh)의 -ed는 자르지 않는다.
+  1음절 자음-모음-자음 어간은 +e만 본다 (hated → hate; hat이면 hatted, caring → care).
+- 그 자체로 별개의 표제어인 불규칙형(left, found, saw, rose, better …)은 목록에 넣지 않는다
+  — 사전에 "leave"가 있다고 "left"를 leave 항목으로 답하면 안 된다.
+- 철자 변형: word_forms 테이블(seed_3000words.txt 파생어 열의 "/ colour" 항목) — relation='variant'
+
+파생어("(disagree)", "(abundant)")는 뜻이 다른 별개의 단어라 표제어 항목으로 답하지 않는다.
+word_forms에 relation='derivative'로만 기록해 둔다.
+
+후보는 "사전에 실제로 있는 표제어"일 때만 채택되므로 규칙이 과하게 잘라도 엉뚱한 새 단어가
+생기지는 않는다. 다만 잘린 어간이 다른 실제 단어면(news → new, seed → see) 그 단어의 뜻으로
+잘못 답하게 되므로 그런 경우는 위 규칙과 아래 목록으로 막는다.
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.orm import Session
+from app.models.word_form import WordForm
+
+RELATION_VARIANT = "variant"
+RELATION_DERIVATIVE = "derivative"
+
+_MIN_STEM_LEN = 3
+
+# -s/-ing 등으로 끝나지만 굴절형이 아닌 단어 — 잘라서 다른 표제어로 보내지 않는다
+_NOT_INFLECTED = {
+    "news", "series", "species", "means", "physics", "mathematics", "economics", "politics",
+    "ethics", "athletics", "electronics", "lens", "bias", "chaos", "thus", "always",
+    "perhaps", "nevertheless", "various", "during", "nothing", "something", "anything",
+    "everything", "morning", "evening", "ceiling", "spring", "string", "sibling", "wedding",
+    "pudding", "bless", "less", "unless", "needless", "whether", "however", "together",
+    "whatever", "never", "ever", "over", "under", "after", "number", "member", "order",
+}
+
+# 불규칙 굴절형 → 원형 (중/고등 필수 어휘 범위). 다른 뜻의 표제어이기도 한 형태는 넣지 않는다
+# (left, found, saw, rose, lay, bit, bound, better …)
+_IRREGULAR = {
+    "was": "be", "were": "be", "been": "be", "is": "be", "are": "be", "am": "be",
+    "has": "have", "had": "have", "does": "do", "did": "do", "done": "do",
+    "went": "go", "gone": "go", "goes": "go", "seen": "see",
+    "took": "take", "taken": "take", "came": "come", "got": "get", "gotten": "get",
+    "made": "make", "knew": "know", "known": "know", "thought": "think", "told": "tell",
+    "became": "become", "brought": "bring",
+    "began": "begin", "begun": "begin", "kept": "keep", "held": "hold",
+    "wrote": "write", "written": "write", "stood": "stand", "heard": "hear",
+    "meant": "mean", "met": "meet", "ran": "run", "paid": "pay", "sat": "sit",
+    "spoken": "speak", "led": "lead", "grew": "grow", "grown": "grow",
+    "lost": "lose", "fallen": "fall", "sent": "send", "built": "build",
+    "understood": "understand", "drew": "draw", "drawn": "draw", "broke": "break",
+    "broken": "break", "spent": "spend", "risen": "rise",
+    "drove": "drive", "driven": "drive", "bought": "buy", "wore": "wear", "worn": "wear",
+    "chose": "choose", "chosen": "choose", "sought": "seek", "threw": "throw",
+    "thrown": "throw", "caught": "catch", "dealt": "deal", "won": "win",
+    "forgot": "forget", "forgotten": "forget", "laid": "lay", "sold": "sell",
+    "fought": "fight", "ate": "eat", "eaten": "eat", "taught": "teach", "flew": "fly",
+    "flown": "fly", "gave": "give", "given": "give", "said": "say",
+    "shook": "shake", "shaken": "shake", "hid": "hide", "hidden": "hide",
+    "bitten": "bite", "sang": "sing", "sung": "sing", "swam": "swim", "swum": "swim",
+    "drank": "drink", "rang": "ring", "rung": "ring", "woke": "wake",
+    "woken": "wake", "froze": "freeze", "frozen": "freeze", "stole": "steal",
+    "stolen": "steal", "forgave": "forgive", "forgiven": "forgive", "hung": "hang",
+    "slept": "sleep", "fed": "feed", "fled": "flee", "lent": "lend",
+    "dug": "dig", "stuck": "stick", "struck": "strike",
+    "swept": "sweep", "wept": "weep", "lain": "lie", "ridden": "ride",
+    "rode": "ride", "arose": "arise", "arisen": "arise", "borne": "bear",
+    "tore": "tear", "torn": "tear", "slid": "slide", "spun": "spin",
+    "withdrew": "withdraw", "withdrawn": "withdraw",
+    # -eed 굴절형 (어간이 e로 끝나 규칙으로는 자르지 않는다)
+    "agreed": "agree", "disagreed": "disagree", "freed": "free", "guaranteed": "guarantee",
+    "children": "child", "men": "man", "women": "woman", "feet": "foot", "teeth": "tooth",
+    "mice": "mouse", "geese": "goose", "people": "person",
+    "wives": "wife", "knives": "knife", "halves": "half",
+    "selves": "self", "wolves": "wolf", "shelves": "shelf", "thieves": "thief",
+    "crises": "crisis", "analyses": "analysis", "phenomena": "phenomenon",
+    "criteria": "criterion",
+}
+
+_VOWELS = set("aeiou")
+
+
+def _ends_cvc(stem: str) -> bool:
+    return (
+        len(stem) >= 3
+        and stem[-1] not in _VOWELS and stem[-1] not in "wxy"
+        and stem[-2] in _VOWELS
+        and stem[-3] not in _VOWELS
+    )
+
+
+def _syllables(stem: str) -> int:
+    """Vowel groups in `stem` (rough syllable count)"""
+    return len(re.findall(r"[aeiouy]+", stem))
+
+
+def lemma_candidates(token: str) -> List[str]:
+    """Possible headwords for an inflected token, most likely first (not checked against the dictionary)"""
+    token = token.lower()
+    if not token.isalpha() or token in _NOT_INFLECTED:
+        return []
+
+    candidates: List[str] = []
+
+    def add(stem: str) -> None:
+        if len(stem) >= _MIN_STEM_LEN and stem != token and stem not in candidates:
+            candidates.append(stem)
+
+    if token in _IRREGULAR:
+        candidates.append(_IRREGULAR[token])
+
+    def undouble(stem: str) -> None:
+        # stopped → stop, running → run, biggest → big
+        if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in _VOWELS and stem[-1] not in "lsz":
+            add(stem[:-1])
+
+    def add_stem(stem: str) -> None:
+        # hoping/hated(1음절 자음-모음-자음 어간) → hope/hate만 — hop/hat이면 hopping/hatted
+        # opened/visited(2음절 이상) → opene/visite 다음 open/visit, walking/wanted → walk/want 먼저
+        if len(stem) <= 2:
+            return  # shed, sing — 굴절이 아니다
+        undouble(stem)
+        if _ends_cvc(stem):
+            add(stem + "e")
+            if _syllables(stem) > 1:
+                add(stem)
+        else:
+            add(stem)
+            add(stem + "e")
+
+    if token.endswith("ies") and len(token) > 4:
+        add(token[:-3] + "y")                    # studies → study
+    if token.endswith("s") and not token.endswith("ss"):
+        add(token[:-1])                          # cats → cat, notes → note
+    if token.endswith("es") and re.search(r"(s|x|z|ch|sh|o)$", token[:-2]):
+        add(token[:-2])                          # boxes → box, watches → watch (cares → car 아님)
+
+    if token.endswith("ied"):
+        add(token[:-3] + "y")                    # studied → study
+    elif token.endswith("ed") and not token.endswith("eed"):
+        add_stem(token[:-2])                     # walked → walk, liked → like (seed/feed → see/fee 아님)
+
+    if token.endswith("ying"):
+        add(token[:-4] + "ie")                   # lying → lie
+    if token.endswith("ing"):
+        add_stem(token[:-3])                     # walking → walk, making → make
+
+    if token.endswith("iest"):
+        add(token[:-4] + "y")                    # easiest → easy
+    elif token.endswith("ier"):
+        add(token[:-3] + "y")                    # happier → happy
+    elif token.endswith("est"):
+        undouble(token[:-3])                     # biggest → big
+
+    return candidates
+
+
+def lookup_variants(db: Session, tokens: Iterable[str]) -> Dict[str, str]:
+    """Spelling variants recorded in word_forms. Returns {token: headword}."""
+    tokens = list(dict.fromkeys(tokens))
+    if not tokens:
+        return {}
+    rows = db.query(WordForm.form, WordForm.headword).filter(
+        WordForm.form.in_(tokens), WordForm.relation == RELATION_VARIANT
+    ).all()
+    return {form: headword for form, headword in rows}
+
+
+# --- seed_3000words.txt 파생어 열 파싱 ---
+
+_PAREN = re.compile(r"\(([^)]*)\)")
+
+
+def _clean(text: str) -> str:
+    return text.replace("\xad", "").strip().lower()
+
+
+def parse_derived_column(headword: str, column: str) -> List[Tuple[str, str, str]]:
+    """
+    One 파생어 cell → [(form, headword, relation)].
+
+        "/ colour"                         → colour: variant of color
+        "(disagree)"                       → disagree: derivative of agree
+        "(criticize / criticise, criticism)" → derivatives of critic
+        "/ programme (programmatic)"       → variant + derivative
+    """
+    headword = _clean(headword)
+    links: List[Tuple[str, str, str]] = []
+
+    def add(form: str, relation: str) -> None:
+        form = _clean(form)
+        if form and form != headword and " " not in form:
+            links.append((form, headword, relation))
+
+    for group in _PAREN.findall(column):
+        for part in re.split(r"[,/]", group):
+            add(part, RELATION_DERIVATIVE)
+    for part in _PAREN.sub("", column).split("/"):
+        add(part, RELATION_VARIANT)
+    return links
+
+
+def load_seed_forms(path: str) -> List[Tuple[str, str, str]]:
+    """All (form, headword, relation) links from a seed word list (No, word, 파생어, grade; tab-separated)"""
+    links: Dict[str, Tuple[str, str, str]] = {}
+    with open(path, encoding="utf-8") as f:
+        next(f)  # 헤더 skip
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 3 and parts[1].strip() and parts[2].strip():
+                for link in parse_derived_column(parts[1], parts[2]):
+                    links.setdefault(link[0], link)  # 같은 형태가 두 번 나오면 먼저 나온 표제어
+    return list(links.values())
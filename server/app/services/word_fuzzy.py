@@ -0,0 +1,201 @@
+"""Typo-tolerant word matcher for OCR misreads (SymSpell-style delete index)
+
+Vision OCR가 실제 단어를 살짝 틀리게 읽은 토큰("beleive", "m"을 "rn"으로 읽은 "rnodern")을
+사전에 있는 자주 쓰이는 단어로 되돌린다. 유효한 단어가 아니라고 판정된 OCR 토큰에만 쓴다
+(word_service.stream_words(correct_typos=True)) — adopt/adapt, dessert/desert처럼 한 글자 차이의
+다른 단어가 많으므로 사전에 없다는 것만으로는 오타라고 볼 수 없다. 매칭되면 그 단어의 기존 항목을 쓰고 Gemini는
+호출하지 않는다. OCR에 흔한 글자 혼동(rn↔m, vv↔w, 0↔o 등)은 편집 거리와 별도로
+한 번의 교정으로 본다.
+
+SymSpell 방식: 사전 단어마다 앞 _PREFIX_LEN글자에서 최대 거리만큼 글자를 지운 변형을
+미리 만들어 {변형: [단어]}로 들고 있다가, 조회 토큰도 같은 방식으로 지운 변형을 만들어
+겹치는 단어만 후보로 꺼낸 뒤 실제 편집 거리(인접 글자 뒤바뀜 포함)로 확인한다.
+사전 전체를 훑지 않으므로 1만 단어 사전에서 조회는 토큰당 1ms 미만이다.
+
+오교정을 막기 위한 규칙:
+- 짧은 토큰은 교정하지 않는다 (4글자 이하: "geet" → meet/feet/greet 중 무엇인지 알 수 없다)
+- 허용 거리는 토큰 길이에 비례한다 (5~7글자 1, 8글자 이상 WORD_FUZZY_MAX_DISTANCE)
+- 허용 거리 안의 후보가 여럿이면 가장 많이 쓰인 후보가 나머지 모두보다 압도적일(2배 이상) 때만 고른다
+- 사전은 usage_count >= WORD_FUZZY_MIN_USAGE인 상위 WORD_FUZZY_MAX_TERMS개 단어 (실제로 자주 쓰인 단어만)
+
+인덱스는 첫 조회 때 만들고 WORD_FUZZY_REBUILD_SECONDS마다 다시 만든다 (사용량 순위는
+천천히 바뀌므로 커밋마다 갱신할 필요가 없다).
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.word import Word
+
+# 변형을 만드는 앞부분 길이 (SymSpell prefix length) — 메모리와 후보 수의 절충
+_PREFIX_LEN = 6
+
+_MIN_TOKEN_LEN = 5
+_DOMINANCE_RATIO = 2
+
+# OCR이 자주 헷갈리는 글자 묶음 (읽힌 글자 → 원래 글자)
+_OCR_CONFUSIONS = (("rn", "m"), ("vv", "w"), ("0", "o"), ("1", "l"), ("5", "s"))
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal-string-alignment distance (insert/delete/substitute/adjacent swap).
+    Returns max_distance + 1 as soon as the distance is known to exceed max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev_prev: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev_prev[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, cur
+    return prev[-1] if prev[-1] <= max_distance else max_distance + 1
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """The term's prefix plus every variant with up to max_distance characters removed"""
+    prefix = term[:_PREFIX_LEN]
+    variants = {prefix}
+    frontier = {prefix}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - variants
+        variants |= frontier
+    return variants
+
+
+def _confusion_variants(token: str) -> Set[str]:
+    """Spellings with up to two OCR confusions undone ("rnodern" → "modern", not "modem")"""
+    seen = {token}
+    frontier = [token]
+    for _ in range(2):
+        found = []
+        for text in frontier:
+            for misread, original in _OCR_CONFUSIONS:
+                start = text.find(misread)
+                while start != -1:
+                    variant = text[:start] + original + text[start + len(misread):]
+                    if variant not in seen:
+                        seen.add(variant)
+                        found.append(variant)
+                    start = text.find(misread, start + 1)
+        frontier = found
+    seen.discard(token)
+    return seen
+
+
+def allowed_distance(token: str) -> int:
+    if len(token) < _MIN_TOKEN_LEN:
+        return 0
+    if len(token) < 8:
+        return min(1, settings.WORD_FUZZY_MAX_DISTANCE)
+    return settings.WORD_FUZZY_MAX_DISTANCE
+
+
+class SymSpellIndex:
+    """Delete-variant index over {word: usage_count} (rebuilt wholesale, read lock-free)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage: Dict[str, int] = {}
+        self._variants: Dict[str, List[str]] = {}
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._usage)
+
+    def build(self, terms: Iterable[Tuple[str, int]]) -> None:
+        usage: Dict[str, int] = {}
+        variants: Dict[str, List[str]] = {}
+        for word, usage_count in terms:
+            word = word.lower()
+            if not word.isalpha():
+                continue  # 숙어/하이픈 단어는 교정 대상이 아니다
+            usage[word] = usage_count or 0
+            for variant in _deletes(word, settings.WORD_FUZZY_MAX_DISTANCE):
+                variants.setdefault(variant, []).append(word)
+        with self._lock:
+            self._usage, self._variants = usage, variants
+            self.built_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._usage, self._variants = {}, {}
+            self.built_at = None
+
+    def lookup(self, token: str) -> Optional[Tuple[str, int]]:
+        """Best dictionary word for `token` as (word, distance), or None if no safe correction"""
+        token = token.lower()
+        max_distance = allowed_distance(token)
+        usage, variants = self._usage, self._variants
+        if max_distance == 0 or token in usage:
+            return None  # 너무 짧거나 이미 사전 단어
+
+        restored = [v for v in _confusion_variants(token) if v in usage]
+        if restored:
+            word = _dominant(restored, usage)
+            return (word, 1) if word else None
+        if not token.isalpha():
+            return None
+
+        candidates: Set[str] = set()
+        for variant in _deletes(token, max_distance):
+            candidates.update(variants.get(variant, ()))
+
+        distances = {}
+        for word in candidates:
+            distance = edit_distance(token, word, max_distance)
+            if distance <= max_distance:
+                distances[word] = distance
+        word = _dominant(list(distances), usage)
+        return (word, distances[word]) if word else None
+
+
+def _dominant(words: List[str], usage: Dict[str, int]) -> Optional[str]:
+    """The most used of `words` if it is used _DOMINANCE_RATIO times more than every other one"""
+    if not words:
+        return None
+    ranked = sorted(words, key=lambda w: (-usage[w], w))
+    if len(ranked) > 1 and usage[ranked[0]] < _DOMINANCE_RATIO * max(1, usage[ranked[1]]):
+        return None  # 비슷하게 쓰이는 후보가 또 있다 — 추측하지 않는다
+    return ranked[0]
+
+
+fuzzy_index = SymSpellIndex()
+
+
+def build(db: Session) -> None:
+    """(Re)build the matcher from the most used words"""
+    rows = db.execute(
+        select(Word.word, Word.usage_count)
+        .where(Word.usage_count >= settings.WORD_FUZZY_MIN_USAGE)
+        .order_by(Word.usage_count.desc())
+        .limit(settings.WORD_FUZZY_MAX_TERMS)
+    ).all()
+    fuzzy_index.build((row.word, row.usage_count) for row in rows)
+    print(f"OK: word fuzzy matcher built ({len(fuzzy_index)} words)")
+
+
+def match_many(db: Session, tokens: Iterable[str]) -> Dict[str, str]:
+    """Map OCR tokens to known dictionary words. Returns {token: matched_word} for corrections only."""
+    tokens = [t for t in dict.fromkeys(tokens) if allowed_distance(t) > 0]
+    if not tokens or settings.WORD_FUZZY_MAX_DISTANCE <= 0:
+        return {}
+    built_at = fuzzy_index.built_at
+    if built_at is None or time.monotonic() - built_at > settings.WORD_FUZZY_REBUILD_SECONDS:
+        build(db)
+
+    matches: Dict[str, str] = {}
+    for token in tokens:
+        found = fuzzy_index.lookup(token)
+        if found:
+            matches[token] = found[0]
+    return matches
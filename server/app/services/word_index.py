@@ -0,0 +1,249 @@
+"""Autocomplete index for /words/search (prefix lookup ranked by usage)
+
+words 테이블의 (word, id, usage_count, difficulty)를 프로세스 메모리의 정렬 배열로 들고 있다.
+접두어 검색은 bisect 두 번으로 후보 범위를 잡고, 그 안에서 usage_count 높은 순 →
+difficulty 낮은 순(쉬운 단어 먼저) → 알파벳 순으로 상위 limit개를 고른다.
+10만 단어에서도 DB 왕복 없이 1ms 미만이고, 후보가 많은 짧은 접두어('a', 'co')는
+상위 결과를 메모해 두었다가 그 접두어의 단어가 바뀔 때만 다시 계산한다.
+
+인덱스 갱신 경로:
+- 이 인스턴스의 커밋: Word insert/update/delete 매퍼 이벤트 → 커밋 직후 반영
+- 다른 인스턴스의 추가/수정: refresh()가 updated_at 워터마크 이후 행만 다시 읽는다
+- usage_count: 이 인스턴스의 flush는 word_usage가 바로 반영하고, updated_at을 바꾸지 않는
+  다른 인스턴스의 flush분은 _FULL_RELOAD_EVERY번째 주기마다 전체를 다시 읽어 맞춘다
+- 다른 인스턴스의 삭제: 검색 결과 행을 DB에서 읽을 때 없어진 항목을 인덱스에서 지운다 (self-healing)
+"""
+import asyncio
+import heapq
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+from app.models.word import Word
+
+# /words/search limit 상한과 같다 — 메모는 이만큼 저장해 두고 limit만큼 잘라 쓴다
+_MAX_LIMIT = 100
+
+# 다른 인스턴스와의 시계 차이/커밋 지연으로 워터마크 직전 행을 놓치지 않도록 겹쳐 읽는 구간
+_REFRESH_OVERLAP = timedelta(seconds=30)
+
+_SESSION_INFO_KEY = "word_index_changes"
+
+# 주기 갱신 몇 번에 한 번 전체를 다시 읽을지 (다른 인스턴스가 반영한 사용량 순위)
+_FULL_RELOAD_EVERY = 60
+
+# 정렬 키: usage_count 내림차순 → difficulty 오름차순(없으면 맨 뒤) → 단어
+_RankKey = Tuple[int, int, str]
+
+
+def _rank_key(key: str, usage_count: Optional[int], difficulty: Optional[int]) -> _RankKey:
+    return (-(usage_count or 0), difficulty if difficulty is not None else 99, key)
+
+
+class PrefixIndex:
+    """Sorted word array + rank metadata with memoized top-K for short prefixes (thread-safe)"""
+
+    def __init__(self, memo_prefix_len: int):
+        self.memo_prefix_len = memo_prefix_len
+        self._lock = threading.Lock()
+        self._keys: List[str] = []                          # 소문자 단어, 정렬 상태 유지
+        self._entries: Dict[str, Tuple[int, _RankKey]] = {}  # key → (word id, 정렬 키)
+        self._memo: Dict[str, List[str]] = {}
+        self.watermark: Optional[datetime] = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, rows: Iterable[Tuple[int, str, Optional[int], Optional[int]]],
+             watermark: Optional[datetime]) -> None:
+        """Replace the whole index with rows of (id, word, usage_count, difficulty)"""
+        entries = {
+            word.lower(): (word_id, _rank_key(word.lower(), usage_count, difficulty))
+            for word_id, word, usage_count, difficulty in rows
+        }
+        with self._lock:
+            self._entries = entries
+            self._keys = sorted(entries)
+            self._memo = {}
+            self.watermark = watermark
+            self.loaded = True
+
+    def upsert_many(self, rows: Iterable[Tuple[int, str, Optional[int], Optional[int]]]) -> None:
+        with self._lock:
+            for word_id, word, usage_count, difficulty in rows:
+                key = word.lower()
+                if key not in self._entries:
+                    insort(self._keys, key)
+                self._entries[key] = (word_id, _rank_key(key, usage_count, difficulty))
+                self._forget_memo(key)
+
+    def remove_many(self, words: Iterable[str]) -> None:
+        with self._lock:
+            for word in words:
+                key = word.lower()
+                if self._entries.pop(key, None) is None:
+                    continue
+                pos = bisect_left(self._keys, key)
+                if pos < len(self._keys) and self._keys[pos] == key:
+                    del self._keys[pos]
+                self._forget_memo(key)
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """Top `limit` (word id, word) pairs starting with `prefix`, best ranked first"""
+        prefix = prefix.lower()
+        limit = min(limit, _MAX_LIMIT)
+        with self._lock:
+            if len(prefix) <= self.memo_prefix_len:
+                top = self._memo.get(prefix)
+                if top is None:
+                    top = self._memo[prefix] = self._top_locked(prefix, _MAX_LIMIT)
+                top = top[:limit]
+            else:
+                top = self._top_locked(prefix, limit)
+            return [(self._entries[key][0], key) for key in top]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+            self._memo = {}
+            self.watermark = None
+            self.loaded = False
+
+    def _top_locked(self, prefix: str, limit: int) -> List[str]:
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        candidates = self._keys[lo:hi]
+        rank = lambda key: self._entries[key][1]  # noqa: E731
+        if len(candidates) <= limit:
+            return sorted(candidates, key=rank)
+        return heapq.nsmallest(limit, candidates, key=rank)
+
+    def _forget_memo(self, key: str) -> None:
+        for n in range(1, min(len(key), self.memo_prefix_len) + 1):
+            self._memo.pop(key[:n], None)
+
+
+prefix_index = PrefixIndex(settings.WORD_INDEX_MEMO_PREFIX_LEN)
+
+
+def _select_rows():
+    return select(Word.id, Word.word, Word.usage_count, Word.difficulty, Word.updated_at)
+
+
+def load(db: Session) -> None:
+    """Build the index from the whole words table"""
+    rows = db.execute(_select_rows()).all()
+    watermark = max((row.updated_at for row in rows if row.updated_at), default=None)
+    prefix_index.load(((r.id, r.word, r.usage_count, r.difficulty) for r in rows), watermark)
+    print(f"OK: word autocomplete index loaded ({len(prefix_index)} words)")
+
+
+def refresh(db: Session) -> int:
+    """Pull rows added/changed since the last load/refresh (other instances' writes). Returns row count."""
+    if not prefix_index.loaded or prefix_index.watermark is None:
+        load(db)
+        return len(prefix_index)
+    rows = db.execute(
+        _select_rows().where(Word.updated_at >= prefix_index.watermark - _REFRESH_OVERLAP)
+    ).all()
+    if rows:
+        prefix_index.upsert_many((r.id, r.word, r.usage_count, r.difficulty) for r in rows)
+        newest = max((r.updated_at for r in rows if r.updated_at), default=prefix_index.watermark)
+        prefix_index.watermark = max(prefix_index.watermark, newest)
+    return len(rows)
+
+
+def search(db: Session, q: str, limit: int) -> List[Word]:
+    """
+    Autocomplete lookup: ids from the in-memory index, rows from one IN query.
+    Index entries whose row is gone (deleted on another instance) are dropped and the
+    lookup is repeated so the caller still gets up to `limit` live rows.
+    """
+    if not prefix_index.loaded:
+        load(db)
+
+    for _ in range(3):
+        hits = prefix_index.search(q, limit)
+        if not hits:
+            return []
+        rows = {w.id: w for w in db.query(Word).filter(Word.id.in_([i for i, _ in hits])).all()}
+        stale = [key for word_id, key in hits
+                 if word_id not in rows or rows[word_id].word.lower() != key]
+        if not stale:
+            break
+        prefix_index.remove_many(stale)
+    return [rows[word_id] for word_id, key in hits
+            if word_id in rows and rows[word_id].word.lower() == key]
+
+
+async def run_refresh_loop() -> None:
+    """Load the index at startup, then pull other instances' changes periodically (app lifetime)"""
+    from app.core.database import SessionLocal
+
+    if settings.WORD_INDEX_REFRESH_SECONDS <= 0:
+        return  # 주기 갱신 끔 — 첫 검색 때 지연 로드되고 이후엔 이 인스턴스의 커밋만 반영된다
+
+    def _refresh_once(full: bool) -> None:
+        with SessionLocal() as db:
+            if full:
+                load(db)
+            else:
+                refresh(db)
+
+    cycle = 0
+    while True:
+        try:
+            await asyncio.to_thread(_refresh_once, cycle > 0 and cycle % _FULL_RELOAD_EVERY == 0)
+            cycle += 1
+        except Exception as e:
+            # 실패해도 검색은 마지막 상태(또는 첫 검색 시 지연 로드)로 계속 동작한다
+            print(f"Word index refresh error: {e}")
+        await asyncio.sleep(settings.WORD_INDEX_REFRESH_SECONDS)
+
+
+# --- 이 인스턴스의 커밋을 즉시 반영 ---
+
+def _pending(target: Word) -> Optional[Dict[str, Optional[tuple]]]:
+    session = object_session(target)
+    if session is None or not prefix_index.loaded:
+        return None
+    return session.info.setdefault(_SESSION_INFO_KEY, {})
+
+
+@event.listens_for(Word, "after_insert")
+@event.listens_for(Word, "after_update")
+def _word_saved(mapper, connection, target: Word) -> None:
+    pending = _pending(target)
+    if pending is None:
+        return
+    # 단어 자체가 바뀌었으면 예전 키는 지운다
+    for old in inspect(target).attrs.word.history.deleted or ():
+        if isinstance(old, str):
+            pending[old.lower()] = None
+    pending[target.word.lower()] = (target.id, target.word, target.usage_count, target.difficulty)
+
+
+@event.listens_for(Word, "after_delete")
+def _word_deleted(mapper, connection, target: Word) -> None:
+    pending = _pending(target)
+    if pending is not None:
+        pending[target.word.lower()] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    changes = session.info.pop(_SESSION_INFO_KEY, None)
+    if not changes:
+        return
+    prefix_index.remove_many(key for key, row in changes.items() if row is None)
+    prefix_index.upsert_many(row for row in changes.values() if row is not None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
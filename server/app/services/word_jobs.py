@@ -0,0 +1,160 @@
+"""Deferred word generation queue (word_jobs table + lifespan worker)
+
+/words/generate에 defer=true를 주면 캐시/DB/표제어 단계에서 못 찾은 단어는 Gemini를 기다리지
+않고 word_jobs에 넣은 뒤 바로 queued=true로 응답한다. 앱은 /words/jobs로 완료 여부를 폴링한다.
+
+- 워커는 WORD_JOB_POLL_SECONDS마다 처리할 작업을 FOR UPDATE SKIP LOCKED로 가져가므로
+  여러 인스턴스가 같은 단어를 두 번 생성하지 않는다. 가져간 작업은 LEASE_SECONDS 동안
+  running이고, 그 안에 끝나지 않으면(워커 종료 등) 다시 가져갈 수 있다.
+- 처음 시도하는 단어는 GEMINI_WORD_BATCH_SIZE개씩 묶어 생성하고, 묶음들은 동시에 진행된다.
+  묶음마다 세션을 따로 쓴다. 실패한 단어는 RETRY_BASE_SECONDS * 2^(시도-1) 뒤에 단어 하나씩 따로 재시도한다 —
+  느리거나 깨지는 단어 하나가 같은 묶음의 다른 단어를 계속 실패시키지 않도록.
+- 생성되었거나(words) 영단어가 아니라고 판정된(rejected_words) 단어의 작업 행은 지운다.
+  MAX_ATTEMPTS번 실패하면 failed로 남기고, 같은 단어를 다시 요청하면 처음부터 다시 큐에 넣는다.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import sibling_session
+from app.models.word_job import WordJob
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_FAILED = "failed"
+
+_ENQUEUE_CONFLICT_RETRIES = 3
+
+
+def _now() -> datetime:
+    # 저장된 시각은 tz 없는 UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enqueue(db: Session, words: Iterable[str]) -> List[str]:
+    """Queue `words` for generation. Already queued words are left alone; failed ones start over."""
+    words = list(dict.fromkeys(words))
+    if not words:
+        return []
+    for _ in range(_ENQUEUE_CONFLICT_RETRIES):
+        now = _now()
+        existing = {job.word: job for job in db.query(WordJob).filter(WordJob.word.in_(words)).all()}
+        for job in existing.values():
+            if job.status == STATUS_FAILED:
+                job.status, job.attempts, job.last_error, job.available_at = STATUS_PENDING, 0, None, now
+        db.add_all(WordJob(word=w, status=STATUS_PENDING, available_at=now) for w in words if w not in existing)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            # 다른 요청이 같은 단어를 먼저 넣었다 — 다시 읽으면 기존 작업으로 보인다
+            db.rollback()
+    print(f"Queued for generation: {len(words)}개 - {words}")
+    return words
+
+
+def get_jobs(db: Session, words: Iterable[str]) -> Dict[str, WordJob]:
+    words = list(dict.fromkeys(words))
+    if not words:
+        return {}
+    return {job.word: job for job in db.query(WordJob).filter(WordJob.word.in_(words)).all()}
+
+
+def claim(db: Session, limit: int) -> List[Tuple[str, int]]:
+    """Take up to `limit` due jobs (plus ones whose worker lease ran out). Returns [(word, attempt)]."""
+    now = _now()
+    jobs = db.execute(
+        select(WordJob)
+        .where(or_(
+            and_(WordJob.status == STATUS_PENDING, WordJob.available_at <= now),
+            and_(WordJob.status == STATUS_RUNNING, WordJob.locked_until < now),
+        ))
+        .order_by(WordJob.available_at, WordJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    claimed = []
+    for job in jobs:
+        job.status = STATUS_RUNNING
+        job.locked_until = now + timedelta(seconds=settings.WORD_JOB_LEASE_SECONDS)
+        job.attempts += 1
+        claimed.append((job.word, job.attempts))
+    db.commit()
+    return claimed
+
+
+def _finish(db: Session, words: List[str], sources: Dict[str, str], attempts: Dict[str, int],
+            error: Optional[str]) -> None:
+    """Drop completed jobs, schedule a retry (or give up) for the rest"""
+    done = [w for w in words if sources.get(w, "error") != "error"]
+    now = _now()
+    try:
+        if done:
+            db.query(WordJob).filter(WordJob.word.in_(done)).delete(synchronize_session=False)
+        for job in db.query(WordJob).filter(WordJob.word.in_([w for w in words if w not in done])).all():
+            job.locked_until = None
+            job.last_error = (error or "Failed to fetch word definition")[:255]
+            if attempts[job.word] >= settings.WORD_JOB_MAX_ATTEMPTS:
+                job.status = STATUS_FAILED
+                print(f"Word job gave up: {job.word} ({job.attempts} attempts)")
+            else:
+                job.status = STATUS_PENDING
+                job.available_at = now + timedelta(
+                    seconds=settings.WORD_JOB_RETRY_BASE_SECONDS * 2 ** (attempts[job.word] - 1)
+                )
+        db.commit()
+    except Exception as e:
+        # 상태를 못 남겨도 리스가 끝나면 다시 가져가므로 작업은 잃지 않는다
+        print(f"Word job update error: {e}")
+        db.rollback()
+
+
+async def process_once(db: Session) -> int:
+    """Claim and run one round of due jobs. Returns the number of jobs claimed."""
+    from app.services.word_service import WordService
+
+    claimed = claim(db, settings.WORD_JOB_BATCH_LIMIT)
+    if not claimed:
+        return 0
+    attempts = dict(claimed)
+    fresh = [w for w, attempt in claimed if attempt == 1]
+    size = max(1, settings.GEMINI_WORD_BATCH_SIZE)
+    groups = [fresh[i:i + size] for i in range(0, len(fresh), size)]
+    groups += [[w] for w, attempt in claimed if attempt > 1]  # 재시도는 한 단어씩
+
+    service = WordService()
+
+    async def run(group: List[str]) -> None:
+        # 묶음들이 동시에 돌므로 묶음마다 세션을 따로 쓴다 (Session은 동시 사용 불가)
+        with sibling_session(db) as group_db:
+            error = None
+            try:
+                sources = await service.generate_queued(group_db, group)
+            except Exception as e:
+                print(f"Word job error {group}: {e}")
+                sources, error = {}, str(e)
+            _finish(group_db, group, sources, attempts, error)
+
+    await asyncio.gather(*(run(group) for group in groups))
+    return len(claimed)
+
+
+async def run_worker_loop() -> None:
+    """Drain the queue for the app's lifetime (polls every WORD_JOB_POLL_SECONDS when idle)"""
+    from app.core.database import SessionLocal
+
+    if settings.WORD_JOB_POLL_SECONDS <= 0:
+        return  # 워커 끔 — process_once()를 직접 호출하는 경우 (테스트/스크립트)
+
+    while True:
+        claimed = 0
+        try:
+            with SessionLocal() as db:
+                claimed = await process_once(db)
+        except Exception as e:
+            print(f"Word job worker error: {e}")
+        if not claimed:
+            await asyncio.sleep(settings.WORD_JOB_POLL_SECONDS)
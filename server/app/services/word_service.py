@@ -1,11 +1,28 @@
 """Word service for database operations"""
-from typing import Optional, List, Dict, Any
+import asyncio
+import time
+from typing import AsyncIterator, Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import sibling_session
+from app.core.redis_client import acquire_leases, release_leases
+from app.models.rejected_word import RejectedWord
 from app.models.word import Word
-from app.core.redis_client import get_cached, set_cached
+from app.services import word_cache, word_forms, word_fuzzy, word_jobs, word_usage
 from app.services.gemini_service import GeminiService
 
+# 이 프로세스에서 생성 중인 단어 → 결과 (source, data)를 받을 Future
+_inflight: Dict[str, asyncio.Future] = {}
+
+_WAIT_POLL_INTERVAL_SECONDS = 0.25
+_SAVE_CONFLICT_RETRIES = 3
+
+
+def _lease_key(word: str) -> str:
+    return f"lock:word:{word}"
+
 
 class WordService:
     """Service for word-related database operations"""
@@ -37,27 +54,24 @@ class WordService:
         db.refresh(db_word)
         return db_word
 
-    @staticmethod
-    def increment_usage(db: Session, word: Word) -> None:
-        """Increment usage count for a word"""
-        word.usage_count += 1
-        db.commit()
 
     async def get_or_create_word(
         self,
         db: Session,
-        word: str
+        word: str,
+        match_variants: bool = True
     ) -> tuple[Optional[Dict[str, Any]], str]:
         """
         Get or create word with caching
         Returns: (word_data, source)
-        Source: 'cache', 'db', 'gpt', or 'error'
+        Source: 'cache', 'db', 'gemini', 'invalid', or 'error'
+
+        match_variants=False면 굴절형/철자 변형을 기존 단어로 해석하지 않고 입력 그대로 찾거나 생성한다.
         """
         word_lower = word.lower()
-        cache_key = f"word:{word_lower}"
 
-        # 1. Check Redis cache
-        cached_data = await get_cached(cache_key)
+        # 1. Check cache (in-process L1, then Redis)
+        cached_data = (await word_cache.get_many([word_lower])).get(word_lower)
         if cached_data:
             print(f"Cache hit: {word}")
             return cached_data, "cache"
@@ -67,232 +81,647 @@ class WordService:
         if db_word:
             print(f"DB hit: {word}")
             # Convert to dict
-            word_data = {
-                "id": db_word.id,
-                "word": db_word.word,
-                "pronunciation": db_word.pronunciation,
-                "difficulty": db_word.difficulty,
-                "meanings": db_word.meanings,
-                "source": db_word.source,
-                "gpt_generated": db_word.gpt_generated,
-                "usage_count": db_word.usage_count
-            }
+            word_data = word_cache.word_to_dict(db_word)
 
             # Cache it
-            await set_cached(cache_key, word_data)
+            await word_cache.set_many({db_word.word: word_data})
 
-            # Increment usage
-            self.increment_usage(db, db_word)
+            # Increment usage (write-behind — flushed to the DB in the background)
+            await word_usage.record([db_word.id])
 
             return word_data, "db"
 
-        # 3. Call Gemini API (cache miss)
-        print(f"Gemini call: {word}")
-        try:
-            gemini_result = await self.gemini_service.get_word_definition(word)
+        # 3. Inflected form / spelling variant of a known word - answer with that word's entry
+        if match_variants:
+            resolved = (await self._resolve_alternate_forms(db, [word_lower])).get(word_lower)
+            if resolved:
+                source, word_data, _, _ = resolved
+                return word_data, source
 
-            if gemini_result is None:
-                print(f"Gemini failed: {word}")
-                return None, "error"
+        # 4. Call Gemini API (cache miss) - shared with concurrent requests for the same word
+        source, word_data = (await self._resolve_unknown_words(db, [word_lower]))[word_lower]
+        return word_data, source
 
-            # Check if word is valid (OCR noise filtering)
-            if not gemini_result.get("is_valid", True):
-                reason = gemini_result.get("reason", "Invalid word")
-                print(f"Invalid word rejected: {word} - {reason}")
-                return None, "invalid"
+    async def _fetch_known(
+        self,
+        db: Session,
+        words: List[str]
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Existing entries for `words` from the cache tiers, then one DB IN query. Returns {word: (source, data)}."""
+        found: Dict[str, Tuple[str, Dict[str, Any]]] = {
+            word: ("cache", data) for word, data in (await word_cache.get_many(words)).items()
+        }
+        missing = [w for w in words if w not in found]
+        if missing:
+            db_words = db.query(Word).filter(Word.word.in_(missing)).all()
+            to_cache = {db_word.word: word_cache.word_to_dict(db_word) for db_word in db_words}
+            found.update({word: ("db", data) for word, data in to_cache.items()})
+            await word_cache.set_many(to_cache)
+            await word_usage.record(w.id for w in db_words)
+        return found
+
+    async def _match_headwords(self, db: Session, words: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Inflected forms / recorded spelling variants whose headword is already in the dictionary.
+        Returns {token: (headword, match_type)} with match_type 'variant' or 'lemma'.
+        """
+        variants = word_forms.lookup_variants(db, words)
+        candidates: Dict[str, List[Tuple[str, str]]] = {}
+        for word in words:
+            options = [(variants[word], "variant")] if word in variants else []
+            options += [(c, "lemma") for c in word_forms.lemma_candidates(word)]
+            if options:
+                candidates[word] = options
+        if not candidates:
+            return {}
+
+        heads = list(dict.fromkeys(h for options in candidates.values() for h, _ in options))
+        existing = set(await word_cache.get_many(heads))
+        unseen = [h for h in heads if h not in existing]
+        if unseen:
+            existing.update(db.scalars(select(Word.word).where(Word.word.in_(unseen))).all())
+
+        matched: Dict[str, Tuple[str, str]] = {}
+        for word, options in candidates.items():
+            for headword, match_type in options:
+                if headword in existing:
+                    matched[word] = (headword, match_type)
+                    break
+        return matched
+
+    async def _resolve_alternate_forms(
+        self,
+        db: Session,
+        words: List[str]
+    ) -> Dict[str, Tuple[str, Dict[str, Any], str, str]]:
+        """
+        Answer unknown tokens with an existing entry instead of generating a new word:
+        inflected forms and spelling variants ("abandoned", "colour") → their headword.
+        Returns {token: (source, data, matched_word, match_type)}.
+        """
+        # 정규화는 최적화일 뿐 — 실패하면 원래 경로(Gemini)로 간다
+        try:
+            matches = await self._match_headwords(db, words)
         except Exception as e:
-            # Gemini API 호출 중 오류 발생 시 안전하게 처리
-            error_msg = f"Gemini API call error for '{word}': {str(e)}"
-            try:
-                print(error_msg)
-            except UnicodeEncodeError:
-                print(error_msg.encode('ascii', errors='ignore').decode('ascii'))
-            return None, "error"
+            print(f"Headword match error: {e}")
+            db.rollback()
+            matches = {}
+        return await self._answer_with(db, matches)
+
+    async def _correct_typos(
+        self,
+        db: Session,
+        tokens: List[str]
+    ) -> Dict[str, Tuple[str, Dict[str, Any], str, str]]:
+        """
+        OCR misreads of well-known words ("beleive" → "believe") → that word's entry.
+        Only for tokens already known to be invalid (rejected by Gemini) — a valid word is never
+        "corrected" to a neighbour (adopt → adapt, dessert → desert).
+        Returns {token: (source, data, matched_word, 'fuzzy')}.
+        """
+        if not tokens:
+            return {}
+        try:
+            matches = {token: (matched, "fuzzy") for token, matched in word_fuzzy.match_many(db, tokens).items()}
+        except Exception as e:
+            print(f"Fuzzy match error: {e}")
+            db.rollback()
+            matches = {}
+        return await self._answer_with(db, matches)
+
+    async def _answer_with(
+        self,
+        db: Session,
+        matches: Dict[str, Tuple[str, str]]
+    ) -> Dict[str, Tuple[str, Dict[str, Any], str, str]]:
+        """{token: (matched_word, match_type)} → {token: (source, data, matched_word, match_type)} for matches that exist"""
+        if not matches:
+            return {}
+
+        known = await self._fetch_known(db, sorted({matched for matched, _ in matches.values()}))
+        resolved: Dict[str, Tuple[str, Dict[str, Any], str, str]] = {}
+        for token, (matched, match_type) in matches.items():
+            if matched in known:
+                source, data = known[matched]
+                resolved[token] = (source, data, matched, match_type)
+                print(f"Resolved {token} -> {matched} ({match_type})")
+        return resolved
+
+    async def _resolve_unknown_words(
+        self,
+        db: Session,
+        words: List[str]
+    ) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Single-flight generation for words missing from every cache tier and the DB.
+        Returns {word: (source, data)}; data is None for rejected ('invalid') or failed
+        ('error') words.
+
+        - 같은 프로세스에서 이미 생성 중인 단어는 그 Future를 기다려 결과를 공유한다 ('cache')
+        - 다른 인스턴스가 Redis 리스를 잡고 생성 중인 단어는 커밋될 때까지 캐시/DB를 폴링해
+          그 행을 읽는다 ('cache'/'db'). 리스 만료 시간 안에 나타나지 않으면 직접 생성한다.
+        - 나머지는 이 요청이 배치로 생성해 저장한다 ('gemini')
+        """
+        resolved: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+
+        # 이미 거절된 토큰(OCR 노이즈)은 Gemini로 다시 보내지 않는다
+        rejected = await self._lookup_rejected(db, words)
+        for word in rejected:
+            resolved[word] = ("invalid", None)
+        words = [w for w in words if w not in rejected]
+
+        loop = asyncio.get_running_loop()
+        owned: Dict[str, asyncio.Future] = {}
+        shared: Dict[str, asyncio.Future] = {}
+        for word in words:
+            future = _inflight.get(word)
+            if future is not None and not future.done() and future.get_loop() is loop:
+                shared[word] = future
+            else:
+                owned[word] = _inflight[word] = loop.create_future()
 
-        # 4. Save to database (only valid words)
+        leases: Dict[str, Optional[str]] = {}
         try:
-            db_word = self.create_from_ai(db, gemini_result)
+            if owned:
+                leases = await acquire_leases(
+                    [_lease_key(w) for w in owned], settings.WORD_GENERATION_LEASE_SECONDS
+                )
+                mine = [w for w in owned if leases.get(_lease_key(w))]
+                elsewhere = [w for w in owned if not leases.get(_lease_key(w))]
 
-            # Convert to dict
-            word_data = {
-                "id": db_word.id,
-                "word": db_word.word,
-                "pronunciation": db_word.pronunciation,
-                "difficulty": db_word.difficulty,
-                "meanings": db_word.meanings,
-                "source": db_word.source,
-                "gpt_generated": db_word.gpt_generated,
-                "usage_count": db_word.usage_count
-            }
+                generated, awaited = await asyncio.gather(
+                    self._generate_and_save(db, mine),
+                    self._wait_for_other_instance(db, elsewhere),
+                )
+                resolved.update(generated)
+                resolved.update(awaited)
+
+                # 다른 인스턴스가 끝내 저장하지 못한 단어 (실패/리스 만료) → 직접 생성
+                timed_out = [w for w in elsewhere if w not in awaited]
+                if timed_out:
+                    resolved.update(await self._generate_and_save(db, timed_out))
+        finally:
+            for word, future in owned.items():
+                if _inflight.get(word) is future:
+                    del _inflight[word]
+                if not future.done():
+                    future.set_result(resolved.get(word, ("error", None)))
+            await release_leases(leases)
+
+        for word, future in shared.items():
+            source, data = await asyncio.shield(future)
+            # 다른 요청이 생성한 결과를 메모리에서 그대로 받은 것이므로 캐시 히트로 센다
+            resolved[word] = ("cache", data) if data is not None else (source, None)
+
+        return resolved
+
+    async def generate_queued(self, db: Session, words: List[str]) -> Dict[str, str]:
+        """
+        Generate queued words (word_jobs worker). Returns {word: source}; 'error' means retry.
+        이미 다른 요청/인스턴스가 만들어 둔 단어는 Gemini를 다시 부르지 않는다.
+        """
+        existing = {row.word for row in db.query(Word.word).filter(Word.word.in_(words)).all()}
+        sources = {word: "db" for word in existing}
+        missing = [w for w in words if w not in existing]
+        if missing:
+            resolved = await self._resolve_unknown_words(db, missing)
+            sources.update({word: source for word, (source, _) in resolved.items()})
+        return sources
+
+    async def get_generation_status(self, db: Session, words: List[str]) -> List[Dict[str, Any]]:
+        """
+        Status of words requested with defer=True, for polling.
+        status: 'done'(data 포함) / 'pending' / 'running' / 'failed' / 'invalid' / 'unknown'(큐에 없음)
+        """
+        words_lower = list(dict.fromkeys(w.lower() for w in words))
+        known = await self._fetch_known(db, words_lower)
+        rest = [w for w in words_lower if w not in known]
+        rejected = await self._lookup_rejected(db, rest)
+        jobs = word_jobs.get_jobs(db, [w for w in rest if w not in rejected])
 
-            # Cache it
-            await set_cached(cache_key, word_data)
+        statuses = []
+        for word in words:
+            word_lower = word.lower()
+            if word_lower in known:
+                statuses.append({"word": word, "status": "done", "data": known[word_lower][1], "error": None})
+            elif word_lower in rejected:
+                statuses.append({"word": word, "status": "invalid", "data": None,
+                                 "error": "Not a valid English word"})
+            elif word_lower in jobs:
+                job = jobs[word_lower]
+                statuses.append({"word": word, "status": job.status, "data": None,
+                                 "error": job.last_error if job.status == word_jobs.STATUS_FAILED else None})
+            else:
+                statuses.append({"word": word, "status": "unknown", "data": None, "error": None})
+        return statuses
 
-            return word_data, "gemini"
+    @staticmethod
+    async def _lookup_rejected(db: Session, words: List[str]) -> Dict[str, str]:
+        """
+        Tokens already known to be rejected: negative cache (L1 → Redis) first, then the
+        rejected_words table for the misses. Returns {word: reason}.
+        """
+        if not words:
+            return {}
+        rejected = await word_cache.get_rejected_many(words)
+        remaining = [w for w in words if w not in rejected]
+        if remaining:
+            from_db = {
+                row.word: row.reason or ""
+                for row in db.query(RejectedWord).filter(RejectedWord.word.in_(remaining)).all()
+            }
+            if from_db:
+                await word_cache.set_rejected_many(from_db)
+                rejected.update(from_db)
+        if rejected:
+            print(f"Rejected-token cache hit: {len(rejected)}개 - {sorted(rejected)}")
+        return rejected
 
+    @staticmethod
+    async def _record_rejected(db: Session, rejections: Dict[str, str]) -> None:
+        """Persist tokens Gemini judged invalid (table + negative cache). Never raises."""
+        if not rejections:
+            return
+        try:
+            existing = {
+                row.word for row in
+                db.query(RejectedWord.word).filter(RejectedWord.word.in_(list(rejections))).all()
+            }
+            new_rows = [
+                RejectedWord(word=word, reason=(reason or "")[:255] or None)
+                for word, reason in rejections.items() if word not in existing
+            ]
+            if new_rows:
+                db.add_all(new_rows)
+                db.commit()
+        except IntegrityError:
+            # 다른 요청이 같은 토큰을 먼저 기록함 — 어느 쪽이든 거절 사실은 남는다
+            db.rollback()
         except Exception as e:
-            print(f"DB save error: {e}")
+            print(f"Rejected-token save error: {e}")
             db.rollback()
-            return None, "error"
+        await word_cache.set_rejected_many(rejections)
 
-    async def get_or_create_words(
+    async def _wait_for_other_instance(
         self,
         db: Session,
         words: List[str]
+    ) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+        """Poll cache/DB until another instance commits these words (or the wait budget runs out)"""
+        found: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        pending = list(words)
+        deadline = time.monotonic() + settings.WORD_GENERATION_WAIT_SECONDS
+        while pending and time.monotonic() < deadline:
+            await asyncio.sleep(_WAIT_POLL_INTERVAL_SECONDS)
+            cached = await word_cache.get_many(pending)
+            for word, data in cached.items():
+                found[word] = ("cache", data)
+            remaining = [w for w in pending if w not in found]
+            if remaining:
+                for db_word in db.query(Word).filter(Word.word.in_(remaining)).all():
+                    found[db_word.word] = ("db", word_cache.word_to_dict(db_word))
+                remaining = [w for w in remaining if w not in found]
+            if remaining:
+                # 다른 인스턴스가 거절로 판정한 토큰은 기다릴 필요가 없다
+                for word in await self._lookup_rejected(db, remaining):
+                    found[word] = ("invalid", None)
+            pending = [w for w in pending if w not in found]
+        return found
+
+    async def _generate_and_save(
+        self,
+        db: Session,
+        words: List[str]
+    ) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+        """Generate definitions for `words` in batch, save the valid ones, cache them"""
+        if not words:
+            return {}
+
+        print(f"Gemini call: {len(words)}개 단어 - {words}")
+
+        # Gemini 배치 호출 — GEMINI_WORD_BATCH_SIZE개씩 한 프롬프트로 묶어 정의를 생성하고,
+        # 묶음들은 GeminiService의 전용 스레드 풀에서 동시에 진행된다.
+        # 배치 응답에서 빠지거나 깨진 단어만 단일 호출로 재시도된다.
+        try:
+            gemini_responses = await self.gemini_service.get_word_definitions(words)
+        except Exception as e:
+            print(f"Gemini batch error: {e}")
+            gemini_responses = {}
+
+        resolved: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        gemini_results: Dict[str, Dict[str, Any]] = {}
+        rejections: Dict[str, str] = {}
+        for word in words:
+            result = gemini_responses.get(word)
+            if not result:
+                resolved[word] = ("error", None)
+                continue
+            # Check if word is valid (OCR noise filtering)
+            if not result.get("is_valid", True):
+                reason = result.get("reason", "Invalid word")
+                print(f"Invalid word rejected: {word} - {reason}")
+                resolved[word] = ("invalid", None)
+                rejections[word] = reason
+                continue
+            gemini_results[word] = result
+
+        # 거절된 토큰은 기록해 두고 다음부터는 Gemini 단계 전에 걸러낸다
+        await self._record_rejected(db, rejections)
+
+        # 5단계: DB 일괄 저장
+        if gemini_results:
+            try:
+                saved = self._save_generated(db, gemini_results)
+            except Exception as e:
+                print(f"DB save error: {e}")
+                db.rollback()
+                saved = {}
+
+            to_cache = {}
+            for word, (source, db_word) in saved.items():
+                word_data = word_cache.word_to_dict(db_word)
+                resolved[word] = (source, word_data)
+                to_cache[db_word.word] = word_data
+            for word in gemini_results:
+                resolved.setdefault(word, ("error", None))
+            await word_cache.set_many(to_cache)
+
+        return resolved
+
+    @staticmethod
+    def _save_generated(
+        db: Session,
+        gemini_results: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Tuple[str, Word]]:
+        """
+        Bulk-insert generated words. Returns {word: (source, row)}.
+
+        다른 요청이 같은 단어를 먼저 커밋했으면 unique 제약 위반으로 배치 전체가 롤백된다.
+        그 경우 이미 커밋된 행은 그대로 읽어 쓰고('db') 나머지만 다시 저장한다.
+        """
+        pending = dict(gemini_results)
+        saved: Dict[str, Tuple[str, Word]] = {}
+        for attempt in range(_SAVE_CONFLICT_RETRIES):
+            if attempt:
+                # 직전 시도가 unique 충돌로 롤백됨 — 그 사이 커밋된 행은 읽어서 쓴다
+                for db_word in db.query(Word).filter(Word.word.in_(list(pending))).all():
+                    saved[db_word.word] = ("db", db_word)
+                    pending.pop(db_word.word, None)
+            if not pending:
+                break
+
+            new_words = {
+                word: Word(
+                    word=word,
+                    pronunciation=data.get("pronunciation"),
+                    difficulty=data.get("difficulty"),
+                    meanings=data["meanings"],
+                    source="gemini",
+                    gpt_generated=True,
+                    usage_count=1
+                )
+                for word, data in pending.items()
+            }
+            db.add_all(new_words.values())
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                continue
+
+            for word, db_word in new_words.items():
+                db.refresh(db_word)  # ID 가져오기
+                saved[word] = ("gemini", db_word)
+            print(f"OK: {len(new_words)} new words batch saved")
+            break
+
+        return saved
+
+    async def get_or_create_words(
+        self,
+        db: Session,
+        words: List[str],
+        match_variants: bool = True,
+        defer: bool = False,
+        correct_typos: bool = False
     ) -> Dict[str, Any]:
         """
         Get or create multiple words - 배치 최적화 버전
         Returns statistics and results
 
         최적화:
-        1. 캐시 일괄 조회 (Redis)
+        1. 캐시 일괄 조회 (L1 메모리 → Redis MGET)
         2. DB 일괄 조회 (IN 쿼리)
-        3. Gemini 배치 호출
-        4. DB 일괄 저장 (bulk insert)
-        5. 캐시 일괄 저장
+        3. 표제어 정규화 (이미 있는 단어의 항목으로 답함 — match_type 'lemma'/'variant'; OCR 오타 교정은 'fuzzy')
+        4. Gemini 배치 호출
+        5. DB 일괄 저장 (bulk insert)
+        6. 캐시 일괄 저장 (파이프라인 SETEX)
+
+        match_variants=False: 3단계를 건너뛰고 입력 단어 그대로 찾거나 생성한다 (사전 시딩 스크립트용 —
+        "building"을 시딩하는데 "build" 항목으로 답하면 안 되므로).
+
+        defer=True: 4~6단계를 요청 안에서 하지 않고 word_jobs 큐에 넣는다 (source 'queued', queued=True).
+        완료 여부는 get_generation_status로 확인한다.
+
+        correct_typos=True (OCR 경로 전용): Gemini가 거절한(또는 이미 거절된) 토큰을 자주 쓰이는
+        사전 단어로 교정해 답한다 ('fuzzy'). 유효한 단어는 교정하지 않는다.
 
         IMPORTANT: Never crashes - always returns partial results even if some words fail
         """
-        results = []
-        cache_hits = 0
-        db_hits = 0
-        gemini_calls = 0
+        results: List[Optional[Dict[str, Any]]] = [None] * len(words)
+        summary: Dict[str, int] = {}
+        async for frame in self.stream_words(
+            db, words, match_variants=match_variants, defer=defer, correct_typos=correct_typos
+        ):
+            if frame.pop("type") == "result":
+                results[frame.pop("index")] = frame
+            else:
+                summary = frame
+        return {"results": results, **summary}
 
-        # 1단계: 단어 정규화 및 맵 준비
-        words_lower = [w.lower() for w in words]
-        word_map: Dict[str, Dict] = {}  # {word: {source, data}}
+    async def stream_words(
+        self,
+        db: Session,
+        words: List[str],
+        match_variants: bool = True,
+        chunk_size: Optional[int] = None,
+        defer: bool = False,
+        correct_typos: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        get_or_create_words의 단계별 버전 — 각 입력의 결과를 확정되는 즉시 내보낸다.
+
+        Yields {"type": "result", "index": <입력 위치>, word, source, data, ...} per input
+        (캐시 히트 → DB 히트 → 표제어/오타 교정 → Gemini 생성 순), then one
+        {"type": "summary", cache_hits, db_hits, gemini_calls}.
+
+        chunk_size: Gemini 단계를 이 크기의 묶음으로 나눠 묶음이 끝날 때마다 내보낸다
+        (None이면 한 번에 — 느린 단어 하나가 나머지를 붙잡지 않게 하려면 지정).
+        defer: Gemini 단계 대신 word_jobs 큐에 넣고 바로 queued로 내보낸다.
+        correct_typos: OCR 토큰용 — 거절된(유효하지 않은) 토큰만 자주 쓰이는 사전 단어로 교정
+        (match_type 'fuzzy'). 직접 입력한 단어에는 쓰지 않는다.
+        """
+        stats = {"cache_hits": 0, "db_hits": 0, "gemini_calls": 0}
 
-        # 2단계: 캐시 일괄 조회
-        cache_keys = [f"word:{w}" for w in words_lower]
-        for i, word in enumerate(words_lower):
-            cached = await get_cached(cache_keys[i])
-            if cached:
-                word_map[word] = {"source": "cache", "data": cached}
-                cache_hits += 1
-                print(f"Cache hit: {word}")
+        # 1단계: 단어 정규화 및 맵 준비 (같은 단어가 여러 번 들어오면 위치마다 결과를 낸다)
+        words_lower = [w.lower() for w in words]
+        positions: Dict[str, List[int]] = {}
+        for index, word in enumerate(words_lower):
+            positions.setdefault(word, []).append(index)
+
+        def frames(word: str, info: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return [
+                {"type": "result", "index": i, **self._result(words[i], info)}
+                for i in positions.pop(word, ())
+            ]
+
+        # 2단계: 캐시 일괄 조회 (L1 → Redis MGET 1회)
+        cached_entries = await word_cache.get_many(words_lower)
+        for word, cached in cached_entries.items():
+            stats["cache_hits"] += len(positions.get(word, ()))
+            print(f"Cache hit: {word}")
+            for frame in frames(word, {"source": "cache", "data": cached}):
+                yield frame
 
         # 3단계: DB 일괄 조회 (캐시 미스만)
-        uncached_words = [w for w in words_lower if w not in word_map]
+        uncached_words = list(positions)
         if uncached_words:
             db_words = db.query(Word).filter(Word.word.in_(uncached_words)).all()
 
-            # DB에서 찾은 단어 처리
+            # DB에서 찾은 단어 처리 (캐시 저장은 파이프라인 1회로 모아서)
+            to_cache: Dict[str, Dict[str, Any]] = {}
             for db_word in db_words:
-                word_data = {
-                    "id": db_word.id,
-                    "word": db_word.word,
-                    "pronunciation": db_word.pronunciation,
-                    "difficulty": db_word.difficulty,
-                    "meanings": db_word.meanings,
-                    "source": db_word.source,
-                    "gpt_generated": db_word.gpt_generated,
-                    "usage_count": db_word.usage_count
-                }
-                word_map[db_word.word] = {"source": "db", "data": word_data}
-                db_hits += 1
+                to_cache[db_word.word] = word_cache.word_to_dict(db_word)
+                stats["db_hits"] += 1
                 print(f"DB hit: {db_word.word}")
 
-                # 캐시에 저장
-                await set_cached(f"word:{db_word.word}", word_data)
+            await word_cache.set_many(to_cache)
 
-            # usage_count 일괄 업데이트 (1번의 UPDATE로 처리)
-            if db_words:
-                word_ids = [w.id for w in db_words]
-                db.query(Word).filter(Word.id.in_(word_ids)).update(
-                    {Word.usage_count: Word.usage_count + 1},
-                    synchronize_session=False
-                )
-                db.commit()
-                print(f"OK: {len(db_words)} words usage_count batch updated")
+            # usage_count 증가는 누적만 하고 백그라운드에서 한 번에 반영 (요청 경로에서 UPDATE/커밋 없음)
+            await word_usage.record(w.id for w in db_words)
 
-        # 4단계: Gemini 호출 (DB에도 없는 단어)
-        unknown_words = [w for w in words_lower if w not in word_map]
-        if unknown_words:
-            print(f"Gemini call: {len(unknown_words)}개 단어 - {unknown_words}")
-
-            # Gemini 병렬 호출 (asyncio.gather 사용)
-            import asyncio
-
-            tasks = [self.gemini_service.get_word_definition(word) for word in unknown_words]
-            gemini_responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-            gemini_results = []
-            for word, result in zip(unknown_words, gemini_responses):
-                if isinstance(result, Exception):
-                    print(f"Gemini error for {word}: {result}")
-                    continue
-                if result:
-                    # Check if word is valid (OCR noise filtering)
-                    if not result.get("is_valid", True):
-                        reason = result.get("reason", "Invalid word")
-                        print(f"Invalid word rejected: {word} - {reason}")
-                        continue  # Skip invalid words
-                    gemini_results.append(result)
-                    gemini_calls += 1
-
-            # 5단계: DB 일괄 저장
-            if gemini_results:
-                new_words = []
-                for gemini_data in gemini_results:
-                    db_word = Word(
-                        word=gemini_data["word"].lower(),
-                        pronunciation=gemini_data.get("pronunciation"),
-                        difficulty=gemini_data.get("difficulty"),
-                        meanings=gemini_data["meanings"],
-                        source="gemini",
-                        gpt_generated=True,
-                        usage_count=1
-                    )
-                    new_words.append(db_word)
-
-                # 일괄 추가
-                db.add_all(new_words)
-                db.commit()
+            for word, word_data in to_cache.items():
+                for frame in frames(word, {"source": "db", "data": word_data}):
+                    yield frame
 
-                # 결과 맵에 추가 및 캐시 저장
-                for db_word in new_words:
-                    db.refresh(db_word)  # ID 가져오기
-                    word_data = {
-                        "id": db_word.id,
-                        "word": db_word.word,
-                        "pronunciation": db_word.pronunciation,
-                        "difficulty": db_word.difficulty,
-                        "meanings": db_word.meanings,
-                        "source": db_word.source,  # ✅ 이미 있음!
-                        "gpt_generated": db_word.gpt_generated,
-                        "usage_count": db_word.usage_count
-                    }
-                    word_map[db_word.word] = {"source": "gemini", "data": word_data}
-                    await set_cached(f"word:{db_word.word}", word_data)
-
-                print(f"OK: {len(new_words)} new words batch saved")
-
-        # 6단계: 결과 생성 (원본 순서 유지)
-        final_results = []  # ✅ 새로운 리스트 생성!
-        for word in words:
-            word_lower = word.lower()
-            if word_lower in word_map:
-                word_info = word_map[word_lower]
-                final_results.append({
-                    "word": word,
-                    "source": word_info["source"],
-                    "data": word_info["data"],
-                    "queued": False,
-                    "error": None
-                })
+        def resolved_frames(resolved: Dict[str, Tuple[str, Dict[str, Any], str, str]]) -> List[Dict[str, Any]]:
+            out: List[Dict[str, Any]] = []
+            for word, (source, data, matched, match_type) in resolved.items():
+                stats["cache_hits" if source == "cache" else "db_hits"] += 1
+                out += frames(word, {"source": source, "data": data, "matched_word": matched, "match_type": match_type})
+            return out
+
+        # 3.5단계: 표제어 정규화 — 굴절형/철자 변형은 이미 있는 단어로 해석
+        if positions and match_variants:
+            for frame in resolved_frames(await self._resolve_alternate_forms(db, list(positions))):
+                yield frame
+
+        # OCR 오타 교정 — 이미 거절된 적이 있는 토큰만 (유효한 단어는 Gemini가 판단)
+        if positions and correct_typos:
+            rejected = await self._lookup_rejected(db, list(positions))
+            for frame in resolved_frames(await self._correct_typos(db, list(rejected))):
+                yield frame
+
+        # 4단계: Gemini 호출 (DB에도 없는 단어)
+        # 같은 단어를 동시에 요청한 다른 요청/인스턴스와 생성을 공유한다 (single-flight)
+        unknown_words = list(positions)
+        if unknown_words and defer:
+            # 지연 모드: 거절 기록만 확인하고 나머지는 큐에 넣는다 (Gemini 대기 없음)
+            rejected = await self._lookup_rejected(db, unknown_words)
+            for word in rejected:
+                for frame in frames(word, {"source": "invalid"}):
+                    yield frame
+            try:
+                queued = word_jobs.enqueue(db, [w for w in unknown_words if w not in rejected])
+            except Exception as e:
+                print(f"Word job enqueue error: {e}")
+                db.rollback()
+                queued = []
+            for word in queued:
+                for frame in frames(word, {"source": "queued"}):
+                    yield frame
+        elif unknown_words:
+            size = chunk_size or len(unknown_words)
+            chunks = [unknown_words[i:i + size] for i in range(0, len(unknown_words), size)]
+
+            async def resolve_chunk(chunk: List[str]) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+                # 묶음끼리 동시에 돌므로 세션을 나눠 쓴다 (Session은 동시 사용 불가)
+                with sibling_session(db) as chunk_db:
+                    return await self._resolve_unknown_words(chunk_db, chunk)
+
+            if len(chunks) == 1:
+                tasks = [asyncio.ensure_future(self._resolve_unknown_words(db, chunks[0]))]
             else:
-                # 처리 실패한 단어
-                final_results.append({
-                    "word": word,
-                    "source": "error",
-                    "data": None,
-                    "queued": False,
-                    "error": "Failed to fetch word definition"
-                })
-
-        return {
-            "results": final_results,  # ✅ 새로운 리스트 반환!
-            "cache_hits": cache_hits,
-            "db_hits": db_hits,
-            "gemini_calls": gemini_calls
+                tasks = [asyncio.ensure_future(resolve_chunk(chunk)) for chunk in chunks]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    results = await next_done
+                    if correct_typos:
+                        # 이번에 Gemini가 거절한 토큰 → OCR 오독일 수 있으니 교정 시도
+                        corrected = await self._correct_typos(
+                            db, [w for w, (source, _) in results.items() if source == "invalid"]
+                        )
+                        for frame in resolved_frames(corrected):
+                            yield frame
+                        results = {w: r for w, r in results.items() if w not in corrected}
+                    for word, (source, data) in results.items():
+                        if source == "gemini":
+                            stats["gemini_calls"] += 1
+                        elif data is not None:
+                            stats["cache_hits" if source == "cache" else "db_hits"] += 1
+                        info = {"source": source, "data": data} if data is not None or source == "invalid" else None
+                        for frame in frames(word, info):
+                            yield frame
+            finally:
+                # 클라이언트가 스트림을 끊으면 남은 묶음은 취소한다
+                for task in tasks:
+                    task.cancel()
+
+        # 처리 실패한 단어
+        for word in list(positions):
+            for frame in frames(word, None):
+                yield frame
+
+        yield {"type": "summary", **stats}
+
+    @staticmethod
+    def _result(word: str, info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """One entry of the results list for input `word` (info None → failed)"""
+        if info is None:
+            return {
+                "word": word,
+                "source": "error",
+                "data": None,
+                "queued": False,
+                "error": "Failed to fetch word definition"
+            }
+        if info["source"] == "invalid":
+            # 영단어가 아닌 토큰 (OCR 노이즈) — Gemini 거절 또는 거절 기록 적중
+            return {
+                "word": word,
+                "source": "invalid",
+                "data": None,
+                "queued": False,
+                "error": "Not a valid English word"
+            }
+        if info["source"] == "queued":
+            # 지연 생성 큐에 들어감 — 완료되면 /words/jobs에서 data를 받는다
+            return {
+                "word": word,
+                "source": "queued",
+                "data": None,
+                "queued": True,
+                "error": None
+            }
+        result = {
+            "word": word,
+            "source": info["source"],
+            "data": info["data"],
+            "queued": False,
+            "error": None
         }
+        if "match_type" in info:
+            # 입력 토큰이 아닌 다른 단어의 항목으로 해석됨 (교정)
+            result["matched_word"] = info["matched_word"]
+            result["match_type"] = info["match_type"]
+        return result
@@ -0,0 +1,104 @@
+"""Full-dictionary snapshot for client-side lookups (/words/snapshot)
+
+앱이 몇 달째 서버에 있는 단어까지 /words/batch, /words/generate로 묻지 않도록, words 테이블
+전체를 버전이 붙은 압축 파일 하나로 내려준다. 앱은 ETag를 저장해 두었다가 If-None-Match로
+다시 물어보고, 사전이 그대로면 304만 받는다.
+
+- 형식: gzip으로 압축한 JSON. 필드 이름은 "fields"에 한 번만 쓰고 단어는 값 배열로 나열한다
+  (행마다 키를 반복하지 않는다).
+- 버전: (단어 수, 최대 id, 최대 updated_at)에서 만든다. 추가/수정/삭제는 버전을 바꾸고,
+  usage_count flush는 updated_at을 건드리지 않으므로 바꾸지 않는다 — 그래서 usage_count는
+  스냅샷에 넣지 않는다.
+- "cursor"는 /words/changes?since=에 그대로 넘길 값이다 — 스냅샷 이후 바뀐 것만 이어 받는다.
+- 같은 DB면 어느 인스턴스가 만들어도 바이트가 같다 (id 순 정렬, gzip mtime=0) → ETag가 일치한다.
+- 만든 스냅샷은 버전이 바뀔 때까지 프로세스 메모리에 들고 있고, 동시에 들어온 요청은 한 번만 만든다.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.database import sibling_session
+from app.models.word import Word
+from app.services import word_changes
+
+FORMAT_VERSION = 1
+
+FIELDS = ("id", "word", "pronunciation", "difficulty", "meanings")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: str
+    word_count: int
+    body: bytes  # gzip-compressed JSON
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+_current: Optional[Snapshot] = None
+_build_lock = asyncio.Lock()
+
+
+def current_version(db: Session) -> str:
+    """Cheap version of the dictionary contents (one aggregate query)"""
+    count, max_id, max_updated = db.execute(
+        select(func.count(Word.id), func.max(Word.id), func.max(Word.updated_at))
+    ).one()
+    stamp = f"{FORMAT_VERSION}:{count}:{max_id}:{max_updated.isoformat() if max_updated else ''}"
+    return f"{FORMAT_VERSION}-{hashlib.sha1(stamp.encode()).hexdigest()[:16]}"
+
+
+def _rows(db: Session) -> list:
+    return [
+        list(row) for row in db.execute(
+            select(Word.id, Word.word, Word.pronunciation, Word.difficulty, Word.meanings).order_by(Word.id)
+        ).all()
+    ]
+
+
+def encode(version: str, cursor: str, rows: list) -> Snapshot:
+    """gzip-compressed JSON artifact for `rows` (CPU-bound — run off the event loop)"""
+    payload = {"format": FORMAT_VERSION, "version": version, "cursor": cursor, "fields": list(FIELDS), "words": rows}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = gzip.compress(raw, compresslevel=9, mtime=0)
+    print(f"OK: word snapshot {version} built ({len(rows)} words, {len(raw)} -> {len(body)} bytes)")
+    return Snapshot(version=version, word_count=len(rows), body=body)
+
+
+def _build(db: Session, version: str) -> Snapshot:
+    """Read the whole table and encode it — runs in a worker thread, on its own session
+    (words 전체 조회도 이벤트 루프를 막지 않고, `db`를 두 스레드에서 쓰지 않는다)"""
+    with sibling_session(db) as build_db:
+        cursor = word_changes.snapshot_cursor(build_db)
+        return encode(version, cursor, _rows(build_db))
+
+
+async def get(db: Session) -> Snapshot:
+    """The snapshot for the current dictionary version (rebuilt only when the version changed)"""
+    global _current
+    version = current_version(db)
+    if _current is not None and _current.version == version:
+        return _current
+    async with _build_lock:
+        if _current is None or _current.version != version:
+            _current = await asyncio.to_thread(_build, db, version)
+        return _current
+
+
+def etag_matches(if_none_match: Optional[str], snapshot: Snapshot) -> bool:
+    """If-None-Match check (list of tags, weak tags and "*" allowed)"""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == snapshot.etag for t in tags)
+
+
+def clear() -> None:
+    global _current
+    _current = None
@@ -0,0 +1,124 @@
+"""Materialized /words/stats counters (word_stats, one row)
+
+/words/stats는 로그인한 누구나 부를 수 있는데, 예전에는 호출마다 words 전체에 COUNT/SUM
+집계를 돌렸다. 대신 word_stats 한 행에 합계를 들고 있고 조회는 기본키로 한 행만 읽는다.
+
+- 단어 추가/삭제/수정(ORM)은 after_insert/after_delete/after_update 훅이 증감분을 session.info에
+  모으고, flush가 끝날 때(after_flush) 같은 트랜잭션에서 한 번의 UPDATE로 반영한다 — 한 행을
+  모두가 갱신하므로 단어 수만큼 UPDATE하지 않는다. 이 모듈이 import되어 있어야 훅이 걸린다
+  (word_usage가 import한다).
+- usage_count write-behind flush(word_usage)는 ORM을 거치지 않으므로 flush가 add_usage()로
+  더한 양을 같은 커밋에 넣는다.
+- query.delete()/SQL로 직접 바꾼 행은 반영되지 않는다. 어긋났으면 행을 지우면 된다 —
+  행이 없으면 다음 조회가 words 전체를 한 번 집계해 다시 만든다.
+"""
+from datetime import datetime, timezone
+from typing import Dict
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from app.models.word import Word
+from app.models.word_stats import WordStats
+
+ROW_ID = 1
+
+_SESSION_INFO_KEY = "word_stats_deltas"
+
+
+def _adjust(connection, words: int = 0, gpt: int = 0, usage: int = 0) -> None:
+    if not (words or gpt or usage):
+        return
+    connection.execute(
+        update(WordStats.__table__)
+        .where(WordStats.__table__.c.id == ROW_ID)
+        .values(
+            total_words=WordStats.__table__.c.total_words + words,
+            gpt_generated=WordStats.__table__.c.gpt_generated + gpt,
+            total_usage=WordStats.__table__.c.total_usage + usage,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+def add_usage(db: Session, amount: int) -> None:
+    """Add flushed usage increments (call before the flush's commit)"""
+    _adjust(db.connection(), usage=amount)
+
+
+def rebuild(db: Session) -> WordStats:
+    """Count the words table once and (re)create the row"""
+    total_words, gpt_generated, total_usage = db.execute(
+        select(
+            func.count(Word.id),
+            func.coalesce(func.sum(case((Word.gpt_generated == True, 1), else_=0)), 0),  # noqa: E712
+            func.coalesce(func.sum(Word.usage_count), 0),
+        )
+    ).one()
+    row = db.get(WordStats, ROW_ID)
+    if row is None:
+        row = WordStats(id=ROW_ID)
+        db.add(row)
+    row.total_words, row.gpt_generated, row.total_usage = total_words, gpt_generated, total_usage
+    try:
+        db.commit()
+    except IntegrityError:
+        # 다른 요청이 먼저 만들었다
+        db.rollback()
+        row = db.get(WordStats, ROW_ID)
+    print(f"OK: word stats rebuilt ({total_words} words)")
+    return row
+
+
+def get(db: Session) -> Dict[str, int]:
+    """Current totals (one primary-key read; counts the table only if the row is missing)"""
+    row = db.get(WordStats, ROW_ID, populate_existing=True) or rebuild(db)
+    return {
+        "total_words": row.total_words,
+        "gpt_generated": row.gpt_generated,
+        "total_usage": row.total_usage,
+    }
+
+
+def _collect(target: Word, words: int = 0, gpt: int = 0, usage: int = 0) -> None:
+    """Add one row's change to its session's pending deltas (applied once per flush)"""
+    deltas = object_session(target).info.setdefault(_SESSION_INFO_KEY, {"words": 0, "gpt": 0, "usage": 0})
+    deltas["words"] += words
+    deltas["gpt"] += gpt
+    deltas["usage"] += usage
+
+
+@event.listens_for(Session, "before_flush")
+def _reset(session: Session, flush_context, instances) -> None:
+    # 실패한 flush가 남긴 증감분은 버린다 (그 변경은 롤백되었다)
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_SESSION_INFO_KEY, None)
+    if deltas:
+        _adjust(session.connection(), **deltas)
+
+
+@event.listens_for(Word, "after_insert")
+def _on_insert(mapper, connection, target: Word) -> None:
+    _collect(target, words=1, gpt=int(bool(target.gpt_generated)), usage=target.usage_count or 0)
+
+
+@event.listens_for(Word, "after_delete")
+def _on_delete(mapper, connection, target: Word) -> None:
+    _collect(target, words=-1, gpt=-int(bool(target.gpt_generated)), usage=-(target.usage_count or 0))
+
+
+@event.listens_for(Word, "after_update")
+def _on_update(mapper, connection, target: Word) -> None:
+    def delta(attr: str) -> int:
+        history = get_history(target, attr)
+        if not history.has_changes():
+            return 0
+        old = history.deleted[0] if history.deleted else 0
+        new = history.added[0] if history.added else 0
+        return int(new or 0) - int(old or 0)
+
+    _collect(target, gpt=delta("gpt_generated"), usage=delta("usage_count"))
@@ -0,0 +1,154 @@
+"""Write-behind accumulator for Word.usage_count
+
+인기 단어는 요청마다 `usage_count + 1` UPDATE를 맞아 행 잠금 경합이 생긴다. 요청 경로에서는
+증가분만 누적하고(Redis 해시 HINCRBY, Redis가 없으면 프로세스 메모리 Counter),
+lifespan 백그라운드 작업이 USAGE_FLUSH_INTERVAL_SECONDS마다 한 번의 UPDATE
+(`usage_count = usage_count + CASE id ... END`)로 DB에 반영한다.
+
+- Redis 해시는 모든 인스턴스가 공유한다. flush는 RENAME으로 해시를 통째로 가져가므로
+  여러 인스턴스가 동시에 flush해도 같은 증가분을 두 번 반영하지 않는다. RENAME 뒤 읽기가
+  실패해 남은 해시는 다음 flush가 함께 가져간다.
+- usage_count 반영은 사전 내용의 변경이 아니므로 updated_at을 건드리지 않는다.
+- DB 반영이 실패하면 증가분을 다시 누적기에 돌려놓고 다음 주기에 재시도한다.
+- 아직 반영되지 않은 증가분은 pending_total()로 볼 수 있다 (/words/stats가 합산해 보여준다).
+- 반영한 합계는 같은 커밋에서 word_stats.total_usage에도 더한다.
+"""
+import asyncio
+import threading
+from collections import Counter
+from typing import Dict, Iterable
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.redis_client import hincrby_many, take_hash, hash_values
+from app.models.word import Word
+from app.services import word_stats
+
+PENDING_KEY = "word:usage:pending"
+
+_FLUSH_CHUNK = 1000
+
+_local = Counter()
+_local_lock = threading.Lock()
+
+
+def _add_local(increments: Dict[int, int]) -> None:
+    with _local_lock:
+        _local.update(increments)
+
+
+def _take_local() -> Dict[int, int]:
+    with _local_lock:
+        taken = dict(_local)
+        _local.clear()
+    return taken
+
+
+def clear_local() -> None:
+    with _local_lock:
+        _local.clear()
+
+
+async def _accumulate(increments: Dict[int, int]) -> None:
+    if not await hincrby_many(PENDING_KEY, {str(i): n for i, n in increments.items()}):
+        _add_local(increments)
+
+
+async def record(word_ids: Iterable[int]) -> None:
+    """Count one use per id (repeats add up). Never touches the DB."""
+    increments = Counter(word_ids)
+    if increments:
+        await _accumulate(increments)
+
+
+async def _take_pending() -> Dict[int, int]:
+    pending = Counter(_take_local())
+    from_redis = await take_hash(PENDING_KEY)
+    for field, value in (from_redis or {}).items():
+        try:
+            pending[int(field)] += int(value)
+        except ValueError:
+            continue
+    return dict(pending)
+
+
+async def pending_total() -> int:
+    """Uses counted but not flushed to the DB yet (this process + shared Redis hash)"""
+    with _local_lock:
+        total = sum(_local.values())
+    from_redis = await hash_values(PENDING_KEY)
+    for value in (from_redis or {}).values():
+        try:
+            total += int(value)
+        except ValueError:
+            continue
+    return total
+
+
+def _apply(db: Session, increments: Dict[int, int]) -> None:
+    """One UPDATE per _FLUSH_CHUNK ids, one commit; updated_at is kept (usage is not a content change)"""
+    ids = sorted(increments)  # 인스턴스 간 같은 순서로 잠가 교착을 피한다
+    for start in range(0, len(ids), _FLUSH_CHUNK):
+        chunk = {i: increments[i] for i in ids[start:start + _FLUSH_CHUNK]}
+        db.query(Word).filter(Word.id.in_(list(chunk))).update(
+            {
+                Word.usage_count: Word.usage_count + case(chunk, value=Word.id, else_=0),
+                Word.updated_at: Word.updated_at,
+            },
+            synchronize_session=False,
+        )
+    word_stats.add_usage(db, sum(increments.values()))
+    db.commit()
+
+
+async def flush(db: Session) -> int:
+    """Write accumulated increments to the DB. Returns the number of words updated."""
+    increments = await _take_pending()
+    if not increments:
+        return 0
+    try:
+        _apply(db, increments)
+    except Exception as e:
+        print(f"Usage flush error ({len(increments)} words), will retry: {e}")
+        db.rollback()
+        await _accumulate(increments)
+        return 0
+
+    _refresh_rank(db, list(increments))
+    print(f"OK: usage_count flushed for {len(increments)} words")
+    return len(increments)
+
+
+def _refresh_rank(db: Session, word_ids: list) -> None:
+    # 자동완성 인덱스의 사용량 순위도 같이 맞춘다 (updated_at이 그대로라 주기 갱신에는 안 잡힌다)
+    from app.services.word_index import prefix_index
+
+    if not prefix_index.loaded:
+        return
+    rows = db.execute(
+        select(Word.id, Word.word, Word.usage_count, Word.difficulty).where(Word.id.in_(word_ids))
+    ).all()
+    prefix_index.upsert_many((r.id, r.word, r.usage_count, r.difficulty) for r in rows)
+
+
+async def run_flush_loop() -> None:
+    """Flush every USAGE_FLUSH_INTERVAL_SECONDS for the app's lifetime (and once more on shutdown)"""
+    from app.core.database import SessionLocal
+
+    if settings.USAGE_FLUSH_INTERVAL_SECONDS <= 0:
+        return  # 주기 flush 끔 — flush()를 직접 호출하는 경우 (테스트/스크립트)
+
+    async def _flush_once() -> None:
+        try:
+            with SessionLocal() as db:
+                await flush(db)
+        except Exception as e:
+            print(f"Usage flush loop error: {e}")
+
+    try:
+        while True:
+            await asyncio.sleep(settings.USAGE_FLUSH_INTERVAL_SECONDS)
+            await _flush_once()
+    finally:
+        # 종료 시 남은 증가분을 버리지 않는다
+        await _flush_once()
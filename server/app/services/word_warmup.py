@@ -0,0 +1,104 @@
+"""Startup cache warm-up (lifespan)
+
+Cloud Run 콜드 스타트/스케일 아웃 직후에는 L1이 비어 있어서 가장 흔한 단어들도 처음 몇 분은
+Redis/DB까지 내려간다. 시작할 때 자주 쓰이는 단어를 미리 캐시에 채워 둔다.
+
+- 워밍 파일(WORD_WARMUP_FILE)이 있고 WORD_WARMUP_FILE_MAX_AGE_HOURS 이내에 만든 것이면
+  DB 없이 그 파일로 L1만 채운다. 파일 내용은 만든 뒤에 바뀌었을 수 있으므로 공유되는 Redis에는
+  쓰지 않는다 (L1은 WORD_L1_TTL_SECONDS 뒤 만료되어 낡은 항목이 오래 남지 않는다).
+  파일은 build_warmup_file.py로 만든다.
+- 파일이 없으면 usage_count 상위 WORD_WARMUP_TOP_N개를 묶음 단위로 DB에서 읽어 L1 + Redis를 채운다.
+- 전체가 WORD_WARMUP_BUDGET_SECONDS 안에서 끝나도록 묶음마다 남은 시간을 확인하고, 시간이
+  다 되면 채운 데까지만 하고 시작을 계속한다. 실패해도 시작은 막지 않는다.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.word import Word
+from app.services import word_cache
+
+FILE_FORMAT = 1
+
+_CHUNK = 500
+
+
+def _top_words(db: Session, offset: int, limit: int) -> List[Word]:
+    return db.execute(
+        select(Word).order_by(Word.usage_count.desc(), Word.id).offset(offset).limit(limit)
+    ).scalars().all()
+
+
+def write_file(db: Session, path: str, top_n: int) -> int:
+    """Write the top `top_n` words (cache payload format) to a gzip JSON warm-up file. Returns the count."""
+    entries = [word_cache.word_to_dict(w) for w in _top_words(db, 0, top_n)]
+    payload = {
+        "format": FILE_FORMAT,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "words": entries,
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    return len(entries)
+
+
+def _read_file(path: str) -> Optional[List[Dict[str, Any]]]:
+    """Entries from a warm-up file, or None if it is missing, stale or unreadable"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        generated_at = datetime.fromisoformat(payload["generated_at"])
+        if payload.get("format") != FILE_FORMAT:
+            return None
+        if datetime.now(timezone.utc) - generated_at > timedelta(hours=settings.WORD_WARMUP_FILE_MAX_AGE_HOURS):
+            print(f"Word warm-up file is stale ({generated_at.isoformat()}), using the DB")
+            return None
+        return payload["words"]
+    except Exception as e:
+        print(f"Word warm-up file error: {e}")
+        return None
+
+
+async def warm_up(db: Session) -> int:
+    """Fill the word cache tiers within the time budget. Returns the number of words cached."""
+    top_n = settings.WORD_WARMUP_TOP_N
+    if top_n <= 0:
+        return 0
+    started = time.monotonic()
+    deadline = started + settings.WORD_WARMUP_BUDGET_SECONDS
+
+    entries = _read_file(settings.WORD_WARMUP_FILE)
+    if entries is not None:
+        entries = entries[:top_n]
+        word_cache.word_l1.set_many({word_cache.cache_key(e["word"]): e for e in entries})
+        print(f"OK: word cache warmed from file ({len(entries)} words, {time.monotonic() - started:.2f}s)")
+        return len(entries)
+
+    warmed = 0
+    while warmed < top_n and time.monotonic() < deadline:
+        rows = _top_words(db, warmed, min(_CHUNK, top_n - warmed))
+        if not rows:
+            break
+        await word_cache.set_many({w.word: word_cache.word_to_dict(w) for w in rows})
+        warmed += len(rows)
+    budget_note = " (time budget reached)" if warmed < top_n and time.monotonic() >= deadline else ""
+    print(f"OK: word cache warmed from DB ({warmed} words, {time.monotonic() - started:.2f}s){budget_note}")
+    return warmed
+
+
+async def run_warm_up() -> None:
+    """Lifespan entry point — never raises"""
+    from app.core.database import SessionLocal
+
+    try:
+        with SessionLocal() as db:
+            await warm_up(db)
+    except Exception as e:
+        print(f"Word cache warm-up error: {e}")
@@ -0,0 +1,121 @@
+"""
+Benchmark script: OCR 전처리 컷오프(긴 변 px, JPEG 품질)별 전송 바이트와 인식 결과를 비교한다.
+
+이미지마다 원본과 각 설정으로 전처리한 결과의 크기를 재고, --ocr을 주면 Gemini Vision으로
+실제 단어를 뽑아 정답 대비 재현율(recall)과 Vision 입력 토큰을 함께 보여준다.
+정답은 이미지와 같은 이름의 .txt 파일(단어를 공백/줄바꿈으로 구분)이고, 없으면 원본 이미지의
+인식 결과를 정답으로 쓴다. 결과를 보고 OCR_MAX_LONG_EDGE / OCR_JPEG_QUALITY를 정한다.
+
+사용법:
+    python benchmark_ocr_preprocess.py <이미지 폴더 또는 파일...> [--ocr] [--edges 1024,1280,1600,2048] [--quality 85]
+    python benchmark_ocr_preprocess.py samples/ --ocr
+"""
+import argparse
+import asyncio
+import mimetypes
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.services import gemini_metrics
+from app.services.gemini_service import GeminiService
+from app.services.image_preprocess import Options, preprocess
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+
+def _image_paths(targets: List[str]) -> List[str]:
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths += sorted(
+                os.path.join(target, name) for name in os.listdir(target)
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            )
+        else:
+            paths.append(target)
+    return paths
+
+
+def _ground_truth(path: str) -> Optional[Set[str]]:
+    txt = os.path.splitext(path)[0] + ".txt"
+    if not os.path.exists(txt):
+        return None
+    with open(txt, encoding="utf-8") as f:
+        return {w.lower() for w in f.read().split()}
+
+
+def _vision_tokens() -> int:
+    return gemini_metrics.get_stats()["methods"].get("extract_words_from_image", {}).get("prompt_tokens", 0)
+
+
+async def _ocr(gemini: GeminiService, data: bytes, mime: str) -> tuple:
+    """(words, vision prompt tokens)"""
+    before = _vision_tokens()
+    result = await gemini.extract_words_from_image(data, mime)
+    return {w.lower() for w in (result or {}).get("words", [])}, _vision_tokens() - before
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("targets", nargs="+")
+    parser.add_argument("--ocr", action="store_true", help="Gemini Vision으로 인식률까지 측정 (API 비용 발생)")
+    parser.add_argument("--edges", default="1024,1280,1600,2048")
+    parser.add_argument("--quality", type=int, default=settings.OCR_JPEG_QUALITY)
+    args = parser.parse_args()
+
+    edges = [int(e) for e in args.edges.split(",")]
+    gemini = GeminiService() if args.ocr else None
+    if args.ocr and gemini.vision_model is None:
+        print("GEMINI_API_KEY가 없어 --ocr을 쓸 수 없습니다")
+        return
+
+    # label → 이미지별 측정값 목록
+    rows: Dict[str, List[dict]] = {"original": []}
+    rows.update({f"{edge}px q{args.quality}": [] for edge in edges})
+
+    for path in _image_paths(args.targets):
+        with open(path, "rb") as f:
+            original = f.read()
+        mime = mimetypes.guess_type(path)[0] or "image/jpeg"
+        print(f"\n{path} ({len(original)} bytes)")
+
+        truth = _ground_truth(path)
+        variants = {"original": (original, mime, 0.0)}
+        for edge in edges:
+            options = Options(max_long_edge=edge, jpeg_quality=args.quality,
+                              grayscale=settings.OCR_GRAYSCALE, crop_margins=settings.OCR_CROP_MARGINS)
+            started = time.perf_counter()
+            data, data_mime = preprocess(original, mime, options)
+            variants[f"{edge}px q{args.quality}"] = (data, data_mime, time.perf_counter() - started)
+
+        if gemini and truth is None:
+            truth, _ = await _ocr(gemini, original, mime)
+
+        for label, (data, data_mime, seconds) in variants.items():
+            row = {"bytes": len(data), "ratio": len(data) / len(original), "seconds": seconds}
+            if gemini:
+                words, tokens = await _ocr(gemini, data, data_mime)
+                row["tokens"] = tokens
+                row["recall"] = len(words & truth) / len(truth) if truth else 1.0
+            rows[label].append(row)
+            extra = f"  recall {row['recall']:.1%}  tokens {row['tokens']}" if gemini else ""
+            print(f"  {label:>16}: {row['bytes']:>9} bytes ({row['ratio']:.1%}), {seconds * 1000:.0f}ms{extra}")
+
+    print("\n=== 평균 ===")
+    for label, measured in rows.items():
+        if not measured:
+            continue
+        n = len(measured)
+        line = (f"{label:>16}: {sum(r['bytes'] for r in measured) / n:>11.0f} bytes "
+                f"({sum(r['ratio'] for r in measured) / n:.1%}), "
+                f"{sum(r['seconds'] for r in measured) / n * 1000:.0f}ms")
+        if gemini:
+            line += (f", recall {sum(r['recall'] for r in measured) / n:.1%}, "
+                     f"tokens {sum(r['tokens'] for r in measured) / n:.0f}")
+        print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark script: OCR 업로드 한 건당 메모리 — 이전 경로와 지금 경로 비교.
+
+- read+base64 (이전): 업로드 전체 read() → 전처리(bytes, 원본 해상도/색으로 디코딩)
+  → base64 문자열 → SDK가 다시 bytes로 디코딩
+- file (지금, draft 끔): 업로드 파일(SpooledTemporaryFile)에서 바로 전처리 → JPEG bytes 그대로
+- file+draft (지금): 위 + JPEG를 디코딩 단계에서 흑백/축소
+
+경우마다 새 프로세스에서 --concurrency개 스캔을 스레드로 동시에 돌리고, 프로세스 최대 RSS
+증가량(Pillow 픽셀 버퍼 포함)과 tracemalloc 최대치(파이썬 bytes 사본만)를 잰다. 업로드는
+서버처럼 1MB 넘으면 디스크로 가는 SpooledTemporaryFile에 미리 넣어 둔다. Vision은 부르지 않는다.
+이미지를 주지 않으면 --sizes 크기의 사진 같은 글자 페이지 JPEG를 만들어 쓴다.
+
+사용법:
+    python benchmark_ocr_upload_memory.py [이미지...] [--sizes 3000x4000,4000x6000] [--concurrency 10]
+"""
+import argparse
+import base64
+import mimetypes
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import tempfile
+import threading
+import tracemalloc
+from typing import List
+
+VARIANTS = ["read+base64", "file", "file+draft"]
+MB = 1024 * 1024
+
+
+def _sample_page(path: str, width: int, height: int) -> None:
+    """Noisy photographed-page lookalike (large JPEG, like a phone photo)"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(width * height)
+    page = Image.new("L", (width, height), 235)
+    draw = ImageDraw.Draw(page)
+    line = max(12, height // 60)
+    for y in range(height // 10, height * 9 // 10, line * 2):
+        x = width // 10
+        while x < width * 9 // 10:
+            word = rng.randint(line, line * 5)
+            draw.rectangle([x, y, x + word, y + line], fill=40)
+            x += word + line
+    noise = Image.effect_noise((width, height), 18)
+    photo = Image.merge("RGB", [Image.blend(page, noise, 0.15)] * 3)
+    photo.save(path, format="JPEG", quality=95)
+
+
+def _maxrss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+
+
+def _measure(path: str, variant: str, concurrency: int, results) -> None:
+    from app.services.image_preprocess import Options, preprocess, read_all
+
+    mime = mimetypes.guess_type(path)[0] or "image/jpeg"
+    options = Options.from_settings()
+    options = Options(options.max_long_edge, options.jpeg_quality, options.grayscale, options.crop_margins,
+                      jpeg_draft=variant == "file+draft")
+    uploads = []
+    for _ in range(concurrency):
+        upload = tempfile.SpooledTemporaryFile(max_size=MB)
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, upload)
+        upload.seek(0)
+        uploads.append(upload)
+
+    def scan(upload) -> None:
+        if variant == "read+base64":
+            data = read_all(upload)
+            out, _ = preprocess(data, mime, options)
+            payload = base64.b64encode(out).decode("utf-8")
+            base64.b64decode(payload)  # SDK(proto-plus)가 base64 문자열을 bytes로 되돌림
+        else:
+            preprocess(upload, mime, options)
+
+    baseline = _maxrss_mb()
+    tracemalloc.start()
+    threads = [threading.Thread(target=scan, args=(upload,)) for upload in uploads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    results.put((_maxrss_mb() - baseline, traced_peak / MB))
+
+
+def _run(path: str, variant: str, concurrency: int) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(path, variant, concurrency, results))
+    process.start()
+    measured = results.get()
+    process.join()
+    return measured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--sizes", default="3000x4000,4000x6000", help="이미지를 안 줄 때 만들 샘플 크기")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = None
+    paths: List[str] = list(args.images)
+    if not paths:
+        workdir = tempfile.mkdtemp(prefix="ocr_upload_bench_")
+        for size in args.sizes.split(","):
+            width, height = (int(v) for v in size.split("x"))
+            path = os.path.join(workdir, f"page_{width}x{height}.jpg")
+            _sample_page(path, width, height)
+            paths.append(path)
+
+    try:
+        print(f"동시 스캔 {args.concurrency}건, 값은 전체 최대치 (괄호는 건당)")
+        for path in paths:
+            print(f"\n{os.path.basename(path)} ({os.path.getsize(path) / MB:.1f} MB)")
+            for variant in VARIANTS:
+                rss, traced = _run(path, variant, args.concurrency)
+                print(f"  {variant:>12}: RSS +{rss:7.1f} MB ({rss / args.concurrency:5.1f}), "
+                      f"python bytes {traced:7.1f} MB ({traced / args.concurrency:5.1f})")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Build script: usage_count 상위 단어를 시작 시 캐시 워밍용 파일로 저장한다.
+
+배포 직전(DB에 접근 가능한 환경)에 실행해 이미지에 함께 넣으면, 새 인스턴스는 시작할 때
+DB를 거치지 않고 이 파일로 L1 캐시를 채운다 (app/services/word_warmup.py).
+WORD_WARMUP_FILE 환경변수에 이 파일 경로를 지정해야 사용된다.
+
+사용법:
+    python build_warmup_file.py [출력 경로] [단어 수]
+    python build_warmup_file.py data/word_warmup.json.gz 2000
+"""
+import sys
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.word_warmup import write_file
+
+DEFAULT_PATH = "data/word_warmup.json.gz"
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else settings.WORD_WARMUP_TOP_N
+    db = SessionLocal()
+    try:
+        count = write_file(db, path, top_n)
+        print(f"워밍 파일 저장 완료: {path} ({count}개 단어)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
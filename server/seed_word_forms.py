@@ -0,0 +1,44 @@
+"""
+Pre-seed script: seed_3000words.txt의 파생어 열을 word_forms 테이블에 등록한다.
+
+"/ colour"처럼 철자 변형으로 적힌 항목은 relation='variant'로, "(disagree)"처럼 괄호 안의
+파생어는 relation='derivative'로 넣는다. WordService는 variant를 표제어 항목으로 답하고
+(colour → color), derivative는 별개의 단어로 보고 기록만 한다.
+이미 등록된 형태는 건너뛴다 (재실행 안전).
+
+사용법:
+    python seed_word_forms.py
+"""
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.word_form import WordForm
+from app.services.word_forms import load_seed_forms
+
+WORD_LIST_FILE = "seed_3000words.txt"
+
+
+def main():
+    links = load_seed_forms(WORD_LIST_FILE)
+    db = SessionLocal()
+    try:
+        existing = set(db.scalars(select(WordForm.form)).all())
+        new_rows = [
+            WordForm(form=form, headword=headword, relation=relation)
+            for form, headword, relation in links
+            if form not in existing
+        ]
+        db.add_all(new_rows)
+        db.commit()
+
+        variants = sum(1 for row in new_rows if row.relation == "variant")
+        print(
+            f"word_forms {len(new_rows)}개 등록 완료 "
+            f"(variant {variants}, derivative {len(new_rows) - variants}, 이미 존재: {len(existing)}개)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
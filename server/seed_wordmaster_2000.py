@@ -33,6 +33,7 @@ from app.schemas.wordbook import WordbookWordCreate
 from app.schemas.post import PostCreate
 from app.services.wordbook_service import WordbookService
 from app.services.post_service import PostService
+from app.services import word_stats  # noqa: F401 — Word 추가 시 word_stats 합계 갱신 훅
 
 DEFAULT_EXCEL_PATH = "E:/21.project/scan_voca_etc/워드마스터수능2000.xlsx"
 OWNER_EMAIL = "demo@scanvoca.internal"
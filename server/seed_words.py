@@ -63,7 +63,7 @@ async def main():
     for i in range(0, len(todo), BATCH_SIZE):
         batch = todo[i:i + BATCH_SIZE]
         try:
-            result = await service.get_or_create_words(db, batch)
+            result = await service.get_or_create_words(db, batch, match_variants=False)
         except Exception as e:
             print(f"batch error at {i}: {e}")
             consecutive_failed_batches += 1
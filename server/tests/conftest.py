@@ -15,6 +15,17 @@ os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-testing-only"
 os.environ["REDIS_URL"] = "redis://localhost:6379/1"
 os.environ["GEMINI_API_KEY"] = "test-gemini-key"
+# 자동완성 인덱스의 lifespan 주기 갱신 끔 — 앱 자체 엔진(테스트 DB와 다른 :memory:)을 읽어
+# 인덱스를 덮어쓰지 않도록. 검색 시 테스트 세션으로 지연 로드된다.
+os.environ["WORD_INDEX_REFRESH_SECONDS"] = "0"
+# usage_count 주기 flush도 끔 — 같은 이유(앱 엔진으로 flush). 테스트는 word_usage.flush(db_session)를 직접 부른다.
+os.environ["USAGE_FLUSH_INTERVAL_SECONDS"] = "0"
+# 지연 생성 워커도 끔 — 테스트는 word_jobs.process_once(db_session)를 직접 부른다.
+os.environ["WORD_JOB_POLL_SECONDS"] = "0"
+# 시작 시 캐시 워밍도 끔 — 테스트는 word_warmup.warm_up(db_session)을 직접 부른다.
+os.environ["WORD_WARMUP_TOP_N"] = "0"
+# Gemini 생성 메모도 끔 — 저장소가 앱 엔진을 쓴다. 메모 테스트는 TTL과 gemini_memo.session_factory를 직접 바꾼다.
+os.environ["GEMINI_MEMO_TTL_SECONDS"] = "0"
 
 import pytest
 from fastapi.testclient import TestClient
@@ -27,6 +38,10 @@ from app.core.database import get_db
 from app.models.base import Base
 from app.core.config import settings
 from app.services.blog_service import BlogService
+from app.services.word_cache import word_l1
+from app.services.word_index import prefix_index
+from app.services.word_fuzzy import fuzzy_index
+from app.services import gemini_metrics, ocr_cache, word_snapshot, word_usage
 
 # 테스트용 In-Memory SQLite 데이터베이스
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -79,6 +94,28 @@ def _no_real_search_engine_pings(monkeypatch):
     monkeypatch.setattr(BlogService, "notify_search_engines", staticmethod(_noop))
 
 
+@pytest.fixture(autouse=True)
+def _fresh_word_l1_cache():
+    """The in-process word L1 cache (and the autocomplete/fuzzy indexes, pending usage counts, dictionary snapshot, Gemini/OCR cache metrics) are module-level and
+    outlive each test's throwaway database — without this a word cached by one test shows
+    up as a "cache" hit in the next test, whose DB doesn't even contain it."""
+    word_l1.clear()
+    prefix_index.clear()
+    fuzzy_index.clear()
+    word_usage.clear_local()
+    word_snapshot.clear()
+    gemini_metrics.reset()
+    ocr_cache.reset_stats()
+    yield
+    word_l1.clear()
+    prefix_index.clear()
+    fuzzy_index.clear()
+    word_usage.clear_local()
+    word_snapshot.clear()
+    gemini_metrics.reset()
+    ocr_cache.reset_stats()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """
@@ -1363,3 +1363,95 @@ class TestGetRecentPostsForPrompt:
         result = BlogService.get_recent_posts_for_prompt(db_session, category=None, limit=12)
         slugs = [p["slug"] for p in result]
         assert slugs == ["b", "a"]  # 최신순
+
+
+class TestGeminiMemo:
+    """같은 입력의 Gemini 생성은 gemini_memo에서 재생된다"""
+
+    @pytest.fixture
+    def memo(self, db_session, monkeypatch):
+        from sqlalchemy.orm import sessionmaker
+        from app.services import gemini_memo
+
+        monkeypatch.setattr(settings, "GEMINI_MEMO_TTL_SECONDS", 3600)
+        monkeypatch.setattr(gemini_memo, "session_factory", sessionmaker(bind=db_session.get_bind()))
+        return gemini_memo
+
+    @staticmethod
+    def _service(replies, calls):
+        class FakeResponse:
+            def __init__(self, text):
+                self.text = text
+
+        class FakeModel:
+            model_name = "fake-model"
+
+            def generate_content(self, prompt, generation_config=None):
+                calls.append(prompt)
+                return FakeResponse(replies.pop(0) if len(replies) > 1 else replies[0])
+
+        service = GeminiService.__new__(GeminiService)
+        service.model = FakeModel()
+        return service
+
+    def test_identical_call_is_replayed(self, memo):
+        calls = []
+        service = self._service(['{"tags": ["역접", "환경"]}'], calls)
+
+        first = asyncio.run(service.tag_exam_passage("passage", "question"))
+        second = asyncio.run(service.tag_exam_passage("passage", "question"))
+        other = asyncio.run(service.tag_exam_passage("another passage", "question"))
+
+        assert first == second == other == ["역접", "환경"]
+        assert len(calls) == 2  # 두 번째 호출은 모델을 부르지 않음
+        assert memo.stats(memo.session_factory()) == [{"method": "tag_exam_passage", "entries": 2, "hits": 1}]
+
+    def test_failed_parse_is_not_stored(self, memo):
+        calls = []
+        service = self._service(["not json"], calls)
+
+        assert asyncio.run(service.tag_exam_passage("passage", "question")) is None
+        assert asyncio.run(service.tag_exam_passage("passage", "question")) is None
+        assert len(calls) == 2
+        assert memo.stats(memo.session_factory()) == []
+
+    def test_bypass_generates_fresh_and_refreshes(self, memo):
+        calls = []
+        service = self._service(['{"tags": ["old"]}', '{"tags": ["new"]}'], calls)
+
+        assert asyncio.run(service.tag_exam_passage("p", "q")) == ["old"]
+
+        async def fresh():
+            with memo.bypass():
+                return await service.tag_exam_passage("p", "q")
+
+        assert asyncio.run(fresh()) == ["new"]
+        assert asyncio.run(service.tag_exam_passage("p", "q")) == ["new"]
+        assert len(calls) == 2
+
+    def test_invalidate_by_method(self, memo, client, admin_auth_headers):
+        calls = []
+        service = self._service(['{"tags": ["a"]}'], calls)
+        asyncio.run(service.tag_exam_passage("p", "q"))
+
+        resp = client.get("/api/v1/admin/gemini-memo", headers=admin_auth_headers)
+        assert resp.json()["methods"][0]["method"] == "tag_exam_passage"
+
+        resp = client.delete("/api/v1/admin/gemini-memo?method=plan_blog_images", headers=admin_auth_headers)
+        assert resp.json() == {"deleted": 0}
+        resp = client.delete("/api/v1/admin/gemini-memo?method=tag_exam_passage", headers=admin_auth_headers)
+        assert resp.json() == {"deleted": 1}
+
+        asyncio.run(service.tag_exam_passage("p", "q"))
+        assert len(calls) == 2
+
+    def test_evicts_least_recently_used(self, memo, monkeypatch):
+        monkeypatch.setattr(settings, "GEMINI_MEMO_MAX_ENTRIES", 2)
+        calls = []
+        service = self._service(['{"tags": ["a"]}'], calls)
+
+        for passage in ["p1", "p2", "p3"]:
+            asyncio.run(service.tag_exam_passage(passage, "q"))
+        asyncio.run(service.tag_exam_passage("p1", "q"))  # 가장 오래된 p1은 지워졌다
+        assert len(calls) == 4
+        assert memo.stats(memo.session_factory())[0]["entries"] == 2
@@ -0,0 +1,316 @@
+"""
+캐시 계층 테스트
+Redis 클라이언트(재연결 백오프/폴백 카운터), 단어 L1 메모리 캐시
+"""
+import asyncio
+import time
+
+from fastapi import status
+
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+
+from app.core import redis_client
+from app.core.local_cache import TTLCache
+from app.models.word import Word
+from app.services import word_cache
+from app.services.gemini_service import GeminiService
+
+
+class _FakeRedis:
+    """redis.asyncio.Redis에서 캐시 헬퍼가 쓰는 부분만 흉내 낸 인메모리 클라이언트"""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.calls.append(("mget", tuple(keys)))
+        return [self.store.get(k) for k in keys]
+
+    async def setex(self, key, ttl, value):
+        self.calls.append(("setex", key))
+        self.store[key] = value
+
+    def pipeline(self, transaction=True):
+        fake = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def setex(self, key, ttl, value):
+                self.ops.append((key, value))
+
+            async def execute(self):
+                fake.calls.append(("pipeline", len(self.ops)))
+                fake.store.update(self.ops)
+
+        return _Pipe()
+
+
+class _FakeHashRedis:
+    """Hash/set commands used by redis_client.take_hash; `fail_reads` makes the next read pipelines fail"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.fail_reads = 0
+
+    def _rename(self, key, new_key):
+        if key not in self.hashes:
+            raise ResponseError("no such key")
+        self.hashes[new_key] = self.hashes.pop(key)
+
+    def _hgetall(self, key):
+        if self.fail_reads:
+            self.fail_reads -= 1
+            raise RedisConnectionError("connection lost")
+        return dict(self.hashes.get(key, {}))
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def pipeline(self, transaction=True):
+        fake = self
+        commands = {
+            "sadd": lambda key, member: fake.sets.setdefault(key, set()).add(member),
+            "srem": lambda key, member: fake.sets.get(key, set()).discard(member),
+            "rename": fake._rename,
+            "hgetall": fake._hgetall,
+            "delete": lambda key: fake.hashes.pop(key, None),
+        }
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def __getattr__(self, name):
+                return lambda *args: self.ops.append((commands[name], args))
+
+            async def execute(self, raise_on_error=True):
+                results = []
+                for command, args in self.ops:
+                    try:
+                        results.append(command(*args))
+                    except ResponseError as e:
+                        if raise_on_error:
+                            raise
+                        results.append(e)
+                return results
+
+        return _Pipe()
+
+
+class TestRedisClient:
+    def test_unavailable_redis_falls_back_and_backs_off(self, monkeypatch):
+        monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+        monkeypatch.setattr(redis_client, "_consecutive_failures", 0)
+        monkeypatch.setattr(redis_client, "_client", None)
+        before = redis_client.get_redis_stats()
+
+        # 테스트 환경의 REDIS_URL(localhost:6379/1)에는 서버가 없다
+        assert asyncio.run(redis_client.get_cached("word:apple")) is None
+        assert asyncio.run(redis_client.get_cached_many(["word:a", "word:b"])) == {}
+
+        stats = redis_client.get_redis_stats()
+        assert stats["state"] == "backoff"
+        assert stats["connect_failures"] == before["connect_failures"] + 1  # 백오프 중에는 재시도 안 함
+        assert stats["fallbacks"] == before["fallbacks"] + 3
+
+    def test_reconnects_after_backoff_window(self, monkeypatch):
+        monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+        monkeypatch.setattr(redis_client, "_consecutive_failures", 0)
+        monkeypatch.setattr(redis_client, "_client", None)
+
+        assert asyncio.run(redis_client.get_redis()) is None
+        assert redis_client._consecutive_failures == 1
+
+        # 백오프 창이 지나면 다시 연결을 시도한다 (예전처럼 영구 비활성화되지 않음)
+        monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+        assert asyncio.run(redis_client.get_redis()) is None
+        assert redis_client._consecutive_failures == 2
+        assert redis_client._retry_at > 0
+
+    def test_batch_helpers_use_one_round_trip(self, monkeypatch):
+        fake = _FakeRedis()
+
+        async def fake_get_redis():
+            return fake
+
+        monkeypatch.setattr(redis_client, "get_redis", fake_get_redis)
+
+        async def run():
+            ok = await redis_client.set_cached_many({"word:a": {"word": "a"}, "word:b": {"word": "b"}})
+            found = await redis_client.get_cached_many(["word:a", "word:b", "word:c"])
+            return ok, found
+
+        ok, found = asyncio.run(run())
+
+        assert ok is True
+        assert found == {"word:a": {"word": "a"}, "word:b": {"word": "b"}}
+        assert fake.calls == [("pipeline", 2), ("mget", ("word:a", "word:b", "word:c"))]
+
+    def test_take_hash_recovers_increments_left_by_failed_take(self, monkeypatch):
+        fake = _FakeHashRedis()
+
+        async def fake_get_redis():
+            return fake
+
+        monkeypatch.setattr(redis_client, "get_redis", fake_get_redis)
+        monkeypatch.setattr(redis_client, "_handle_command_error", lambda e, op: None)
+        fake.hashes["usage"] = {"1": "3", "2": "1"}
+
+        # RENAME 뒤 읽기가 실패 — 증가분은 옆으로 치워진 키에 남는다
+        fake.fail_reads = 1
+        assert asyncio.run(redis_client.take_hash("usage")) is None
+        assert "usage" not in fake.hashes
+
+        fake.hashes["usage"] = {"1": "2"}
+        assert asyncio.run(redis_client.take_hash("usage")) == {"1": "5", "2": "1"}
+        assert fake.hashes == {}
+        assert fake.sets["usage:taking"] == set()
+        assert asyncio.run(redis_client.take_hash("usage")) == {}
+
+
+class TestTTLCache:
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a가 최근 사용으로 올라감
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get_many(["a", "c"]) == {"a": 1, "c": 3}
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        cache = TTLCache(max_entries=10, ttl_seconds=5)
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache.set("a", 1)
+
+        now[0] += 4
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestWordL1Cache:
+    def test_content_change_evicts_l1_on_commit(self, db_session):
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        word_cache.word_l1.set("word:apple", word_cache.word_to_dict(word))
+
+        word.meanings = [{"partOfSpeech": "noun", "korean": "사과 (과일)"}]
+        db_session.commit()
+
+        assert word_cache.word_l1.get("word:apple") is None
+
+    def test_usage_count_change_keeps_l1_entry(self, db_session):
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        word_cache.word_l1.set("word:apple", word_cache.word_to_dict(word))
+
+        word.usage_count += 1
+        db_session.commit()
+
+        assert word_cache.word_l1.get("word:apple") is not None
+
+    def test_invalidation_message_from_other_instance(self):
+        word_cache.word_l1.set("word:apple", {"word": "apple"})
+        word_cache._on_invalidation_message(["apple"])
+        assert word_cache.word_l1.get("word:apple") is None
+
+    def test_repeat_lookup_served_from_l1(self, client, auth_headers, db_session, monkeypatch):
+        async def no_gemini(self, words):
+            raise AssertionError("known word must not reach Gemini")
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", no_gemini)
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+
+        first = client.post("/api/v1/words/generate", json={"words": ["apple"]}, headers=auth_headers)
+        second = client.post("/api/v1/words/generate", json={"words": ["apple"]}, headers=auth_headers)
+
+        assert first.json()["db_hits"] == 1
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["cache_hits"] == 1
+        assert second.json()["results"][0]["data"]["word"] == "apple"
+
+
+class TestWarmUp:
+    """시작 시 캐시 워밍 — 상위 단어를 시간 예산 안에서 L1에 미리 채움"""
+
+    def test_top_words_are_cached(self, db_session, monkeypatch):
+        from app.core.config import settings
+        from app.services import word_warmup
+
+        db_session.add_all([
+            Word(word=f"word{i:03d}", meanings=[{"partOfSpeech": "noun", "korean": "단어"}], source="test", usage_count=i)
+            for i in range(10)
+        ])
+        db_session.commit()
+        monkeypatch.setattr(settings, "WORD_WARMUP_TOP_N", 3)
+
+        assert asyncio.run(word_warmup.warm_up(db_session)) == 3
+        assert word_cache.word_l1.get("word:word009") is not None
+        assert word_cache.word_l1.get("word:word007") is not None
+        assert word_cache.word_l1.get("word:word006") is None
+
+    def test_stops_at_time_budget(self, db_session, monkeypatch):
+        from app.core.config import settings
+        from app.services import word_warmup
+
+        db_session.add_all([
+            Word(word=f"word{i:03d}", meanings=[{"partOfSpeech": "noun", "korean": "단어"}], source="test", usage_count=i)
+            for i in range(3)
+        ])
+        db_session.commit()
+        monkeypatch.setattr(settings, "WORD_WARMUP_TOP_N", 100)
+        monkeypatch.setattr(settings, "WORD_WARMUP_BUDGET_SECONDS", 0)
+
+        assert asyncio.run(word_warmup.warm_up(db_session)) == 0
+
+    def test_warm_up_file_fills_l1_without_db(self, db_session, monkeypatch, tmp_path):
+        from app.core.config import settings
+        from app.services import word_warmup
+
+        db_session.add_all([
+            Word(word=f"word{i:03d}", meanings=[{"partOfSpeech": "noun", "korean": "단어"}], source="test", usage_count=i)
+            for i in range(5)
+        ])
+        db_session.commit()
+        path = str(tmp_path / "warmup.json.gz")
+        assert word_warmup.write_file(db_session, path, 2) == 2
+        db_session.query(Word).delete()
+        db_session.commit()
+        monkeypatch.setattr(settings, "WORD_WARMUP_TOP_N", 100)
+        monkeypatch.setattr(settings, "WORD_WARMUP_FILE", path)
+
+        assert asyncio.run(word_warmup.warm_up(db_session)) == 2
+        assert word_cache.word_l1.get("word:word004")["usage_count"] == 4
+
+        # 오래된 파일은 쓰지 않고 DB로 간다 (DB는 비어 있음)
+        monkeypatch.setattr(settings, "WORD_WARMUP_FILE_MAX_AGE_HOURS", -1)
+        word_cache.word_l1.clear()
+        assert asyncio.run(word_warmup.warm_up(db_session)) == 0
@@ -0,0 +1,692 @@
+"""
+OCR API 테스트
+/api/v1/ocr 엔드포인트
+"""
+import json
+
+from fastapi import status
+from app.models.word import Word
+from app.services.gemini_service import GeminiService
+
+
+def _fake_vision(words, raw_text="text"):
+    async def extract(self, image_bytes, mime_type, on_word=None):
+        return {"words": list(words), "raw_text": raw_text}
+    return extract
+
+
+class TestScanStream:
+    """/ocr/scan/stream — OCR 결과, 단어별 정의, 집계 순서의 NDJSON"""
+
+    def test_stream_frames(self, client, auth_headers, db_session, monkeypatch):
+        async def fake_definitions(self, words):
+            return {w: {"is_valid": w != "geet", "word": w, "pronunciation": "", "difficulty": 2,
+                        "meanings": [{"partOfSpeech": "noun", "korean": f"{w} 뜻"}]} for w in words}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", _fake_vision(["apple", "geet", "window"]))
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/ocr/scan/stream",
+            files={"image": ("page.png", b"\x89PNG fake", "image/png")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        assert frames[0] == {"type": "ocr", "raw_text": "text", "total_extracted": 3}
+        assert [(f["index"], f["word"]) for f in frames[1:-1]] == [(0, "apple"), (2, "window")]
+        assert frames[1]["meanings"][0]["korean"] == "사과"
+        summary = frames[-1]
+        assert summary["type"] == "summary"
+        assert summary["total_with_definitions"] == 2
+        assert (summary["db_hits"], summary["gemini_calls"]) == (1, 1)
+
+    def test_invalid_file_is_rejected_before_streaming(self, client, auth_headers):
+        response = client.post(
+            "/api/v1/ocr/scan/stream",
+            files={"image": ("notes.txt", b"hello", "text/plain")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def _page_jpeg(size=(4000, 3000), orientation=None):
+    """흰 종이 가운데에 글자 줄(검은 막대)이 있는 사진"""
+    import io
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for y in range(size[1] // 4, size[1] * 3 // 4, 100):
+        draw.rectangle((size[0] // 4, y, size[0] * 3 // 4, y + 30), fill="black")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=95, exif=exif)
+    return buf.getvalue()
+
+
+class TestPreprocess:
+    """Vision 요청 전 회전/흑백/여백 자르기/축소"""
+
+    def test_downscales_crops_and_grayscales(self):
+        import io
+        from PIL import Image
+        from app.services.image_preprocess import Options, preprocess
+
+        raw = _page_jpeg()
+        out, mime = preprocess(raw, "image/jpeg", Options(1600, 85, True, True))
+
+        img = Image.open(io.BytesIO(out))
+        assert mime == "image/jpeg"
+        assert img.mode == "L"
+        assert max(img.size) == 1600
+        assert img.size[1] < 1200  # 위아래 여백이 잘려 4:3보다 납작하다
+        assert len(out) < len(raw)
+
+    def test_applies_exif_orientation(self):
+        import io
+        from PIL import Image
+        from app.services.image_preprocess import Options, preprocess
+
+        out, _ = preprocess(_page_jpeg(orientation=6), "image/jpeg", Options(1600, 85, True, False))
+        width, height = Image.open(io.BytesIO(out)).size
+        assert (width, height) == (1200, 1600)  # 세로로 찍은 사진은 세로로
+
+    def test_undecodable_upload_is_sent_as_is(self):
+        from app.services.image_preprocess import preprocess
+
+        assert preprocess(b"\x89PNG fake", "image/png") == (b"\x89PNG fake", "image/png")
+
+    def test_scan_sends_preprocessed_image(self, client, auth_headers, monkeypatch):
+        sent = {}
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            sent.update(size=len(image_bytes), mime_type=mime_type)
+            return {"words": [], "raw_text": ""}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        raw = _page_jpeg()
+        response = client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("page.jpg", raw, "image/jpeg")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sent["mime_type"] == "image/jpeg"
+        assert sent["size"] < len(raw) / 2
+
+
+def _text_page(seed, size=(1200, 1600), brightness=1.0, angle=0.0):
+    """줄마다 길이가 다른 단어 막대가 있는 교재 페이지 사진 (seed가 같으면 같은 페이지)"""
+    import io
+    import random
+    from PIL import Image, ImageDraw, ImageEnhance
+
+    rnd = random.Random(seed)
+    img = Image.new("L", size, 255)
+    draw = ImageDraw.Draw(img)
+    for y in range(100, size[1] - 100, 40):
+        x = 80
+        while x < size[0] - 150:
+            width = rnd.randint(30, 140)
+            draw.rectangle((x, y, x + width, y + 18), fill=0)
+            x += width + rnd.randint(15, 40)
+    img = ImageEnhance.Brightness(img).enhance(brightness).rotate(angle, fillcolor=255)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+def _template_page(seed, brightness=1.0, angle=0.0):
+    """같은 양식(머리띠, 그림, 표)에 본문 네 줄만 다른 교재 페이지 사진"""
+    import io
+    import random
+    from PIL import Image, ImageDraw, ImageEnhance
+
+    rnd = random.Random(seed)
+    img = Image.new("L", (1200, 1600), 255)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((60, 60, 1140, 220), fill=40)
+    draw.rectangle((80, 280, 560, 820), fill=120)
+    for y in range(280, 821, 90):
+        draw.line((620, y, 1120, y), fill=0, width=4)
+    for x in (620, 870, 1120):
+        draw.line((x, 280, x, 820), fill=0, width=4)
+    for y in range(1300, 1450, 40):
+        x = 80
+        while x < 1050:
+            width = rnd.randint(30, 140)
+            draw.rectangle((x, y, x + width, y + 18), fill=0)
+            x += width + rnd.randint(15, 40)
+    img = ImageEnhance.Brightness(img).enhance(brightness).rotate(angle, fillcolor=255)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+class TestOcrCache:
+    """같은 페이지를 다시 찍은 사진은 Vision 없이 이전 단어 목록을 쓴다"""
+
+    def _scan(self, client, auth_headers, image):
+        response = client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("page.jpg", image, "image/jpeg")},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def _vision(self, monkeypatch, calls):
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            calls.append(len(image_bytes))
+            return {"words": [f"word{len(calls)}"], "raw_text": ""}
+
+        async def definitions(self, words):
+            return {w: None for w in words}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(GeminiService, "get_word_definitions", definitions)
+
+    def test_near_duplicate_photo_reuses_result(self, client, auth_headers, monkeypatch):
+        from app.services import ocr_cache
+
+        calls = []
+        self._vision(monkeypatch, calls)
+        first = self._scan(client, auth_headers, _text_page(1))
+        again = self._scan(client, auth_headers, _text_page(1, brightness=0.85, angle=0.7))
+        other = self._scan(client, auth_headers, _text_page(2))
+
+        assert len(calls) == 2  # 다시 찍은 사진은 Vision을 부르지 않음
+        assert again["total_extracted"] == first["total_extracted"] == 1
+        assert other["total_extracted"] == 1
+        stats = ocr_cache.get_stats()
+        assert (stats["lookups"], stats["hits"], stats["stores"]) == (3, 1, 2)
+
+    def test_expired_entry_is_not_used(self, client, auth_headers, db_session, monkeypatch):
+        from datetime import datetime
+        from app.models.ocr_cache import OcrCacheEntry
+
+        calls = []
+        self._vision(monkeypatch, calls)
+        self._scan(client, auth_headers, _text_page(1))
+        db_session.query(OcrCacheEntry).update({OcrCacheEntry.expires_at: datetime(2000, 1, 1)})
+        db_session.commit()
+        self._scan(client, auth_headers, _text_page(1))
+
+        assert len(calls) == 2
+        assert db_session.query(OcrCacheEntry).count() == 1  # 만료된 항목은 저장할 때 지워짐
+
+    def test_same_layout_different_page_is_not_reused(self, client, auth_headers, monkeypatch):
+        calls = []
+        self._vision(monkeypatch, calls)
+        self._scan(client, auth_headers, _template_page(1))
+        self._scan(client, auth_headers, _template_page(1, brightness=0.85, angle=0.7))
+        for seed in (3, 5):
+            self._scan(client, auth_headers, _template_page(seed))
+
+        assert len(calls) == 3  # 다시 찍은 사진만 적중, 본문이 다른 페이지는 Vision으로
+
+    def test_fingerprint_distance(self):
+        from app.services.image_preprocess import preprocess
+        from app.services.ocr_cache import detail_difference, fingerprint
+
+        def page_print(image):
+            return fingerprint(preprocess(image, "image/jpeg")[0])
+
+        base = page_print(_text_page(3))
+        same = page_print(_text_page(3, brightness=0.8, angle=-1.0))
+        different = page_print(_text_page(4))
+        assert (base.hash ^ same.hash).bit_count() <= 8
+        assert (base.hash ^ different.hash).bit_count() > 20
+        assert detail_difference(base.detail, same.detail) < 8
+
+        # 같은 양식: 해시는 가깝지만 글자 부분 축소본이 갈린다
+        template = page_print(_template_page(1))
+        other = page_print(_template_page(3))
+        assert (template.hash ^ other.hash).bit_count() <= 8
+        assert detail_difference(template.detail, other.detail) > 10
+
+
+class TestBatchScan:
+    """/ocr/scan/batch — 여러 페이지를 동시에 추출하고 단어는 한 번만 정의 조회"""
+
+    def _setup(self, monkeypatch, pages, lookups):
+        from collections import defaultdict
+        from app.core import rate_limit
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            words = pages[image_bytes.decode()]
+            if words is None:
+                return None
+            return {"words": list(words), "raw_text": " ".join(words)}
+
+        async def definitions(self, words):
+            lookups.append(list(words))
+            return {w: {"is_valid": True, "word": w, "pronunciation": "", "difficulty": 2,
+                        "meanings": [{"partOfSpeech": "noun", "korean": f"{w} 뜻"}]} for w in words}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(GeminiService, "get_word_definitions", definitions)
+        monkeypatch.setattr(rate_limit, "_memory_buckets", defaultdict(list))
+
+    def _post(self, client, auth_headers, names):
+        return client.post(
+            "/api/v1/ocr/scan/batch",
+            files=[("images", (f"{name}.png", name.encode(), "image/png")) for name in names],
+            headers=auth_headers,
+        )
+
+    def test_dedupes_across_pages_with_provenance(self, client, auth_headers, monkeypatch):
+        lookups = []
+        self._setup(monkeypatch, {
+            "p1": ["apple", "window"],
+            "p2": ["Apple", "river"],
+            "p3": None,  # Vision 실패
+        }, lookups)
+
+        response = self._post(client, auth_headers, ["p1", "p2", "p3"])
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [(p["page"], p["filename"], p["words"], p["error"]) for p in data["pages"][:2]] == [
+            (0, "p1.png", ["apple", "window"], None),
+            (1, "p2.png", ["Apple", "river"], None),
+        ]
+        assert data["pages"][2]["error"]
+        assert [(w["word"], w["pages"]) for w in data["words"]] == [
+            ("apple", [0, 1]), ("window", [0]), ("river", [1]),
+        ]
+        assert lookups == [["apple", "window", "river"]]  # 정의 생성은 한 번, 중복 없이
+        assert (data["total_pages"], data["total_extracted"], data["total_unique"]) == (3, 4, 3)
+
+    def test_charges_rate_limit_per_page(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+
+        pages = {f"p{i}": [f"word{i}"] for i in range(ocr.MAX_BATCH_PAGES)}
+        self._setup(monkeypatch, pages, [])
+        names = list(pages)
+
+        assert self._post(client, auth_headers, names).status_code == status.HTTP_200_OK
+        assert self._post(client, auth_headers, names).status_code == status.HTTP_200_OK
+        # 10장 x 2 = 20회로 한도를 다 썼다 — 한 장짜리 /scan도 막힌다
+        response = client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("p0.png", b"p0", "image/png")},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_invalid_upload_does_not_use_quota(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+
+        pages = {f"p{i}": [f"word{i}"] for i in range(ocr.MAX_BATCH_PAGES)}
+        self._setup(monkeypatch, pages, [])
+        files = [("images", (f"{name}.png", name.encode(), "image/png")) for name in pages]
+        files[-1] = ("images", ("notes.txt", b"text", "text/plain"))
+
+        for _ in range(3):
+            response = client.post("/api/v1/ocr/scan/batch", files=files, headers=auth_headers)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        # 검증에 실패한 요청은 한도를 쓰지 않았다
+        assert self._post(client, auth_headers, list(pages)).status_code == status.HTTP_200_OK
+
+    def test_pages_use_their_own_sessions(self, client, auth_headers, db_session, monkeypatch):
+        from app.api.v1 import ocr
+
+        sessions = []
+        original = ocr._ocr_image
+
+        async def tracking(db, image, content_type, on_word=None):
+            sessions.append(db)
+            return await original(db, image, content_type, on_word=on_word)
+
+        self._setup(monkeypatch, {"p1": ["apple"], "p2": ["river"]}, [])
+        monkeypatch.setattr(ocr, "_ocr_image", tracking)
+
+        assert self._post(client, auth_headers, ["p1", "p2"]).status_code == status.HTTP_200_OK
+        assert len({id(s) for s in sessions}) == 2 and db_session not in sessions
+
+    def test_too_many_pages_is_rejected(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+
+        lookups = []
+        self._setup(monkeypatch, {}, lookups)
+        response = self._post(client, auth_headers, [f"p{i}" for i in range(ocr.MAX_BATCH_PAGES + 1)])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert lookups == []
+
+    def test_all_pages_failing_is_503(self, client, auth_headers, monkeypatch):
+        self._setup(monkeypatch, {"p1": None, "p2": None}, [])
+
+        assert self._post(client, auth_headers, ["p1", "p2"]).status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class TestVisionStreaming:
+    """Vision 응답을 스트리밍으로 파싱해 완성된 단어부터 정의 조회를 시작한다"""
+
+    def test_parser_yields_elements_as_they_complete(self):
+        from app.services.gemini_service import WordArrayParser
+
+        parser = WordArrayParser()
+        chunks = ['```json\n["app', 'le", "be go', 'od at", "it\\"s"', ', 3, "x', 'y"]\n```', ' "after"']
+        assert [parser.feed(c) for c in chunks] == [[], ["apple"], ["be good at", 'it"s'], [], ["xy"], []]
+        assert parser.done
+
+    def test_extract_streams_words_from_sdk(self):
+        import asyncio
+
+        class Response:
+            usage_metadata = None
+            text = '["one", "two", "three"]'
+
+            def __iter__(self):
+                for part in ('["one", "tw', 'o", "thr', 'ee"]'):
+                    yield type("Chunk", (), {"text": part})()
+
+        class Model:
+            model_name = "models/gemini-2.5-flash"
+
+            def generate_content(self, contents, stream=False, **kwargs):
+                assert stream
+                return Response()
+
+        service = GeminiService()
+        service.vision_model = Model()
+        streamed = []
+        result = asyncio.run(service.extract_words_from_image(b"img", "image/png", on_word=streamed.append))
+
+        assert streamed == ["one", "two", "three"]
+        assert result["words"] == ["one", "two", "three"]
+
+    def test_scan_defines_words_while_extracting(self, client, auth_headers, monkeypatch):
+        import asyncio
+
+        log = []
+        words = [f"word{i}" for i in range(12)]
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            for word in words:
+                on_word(word)
+                await asyncio.sleep(0.01)
+            log.append("extracted")
+            return {"words": list(words), "raw_text": ""}
+
+        async def definitions(self, batch):
+            log.append(list(batch))
+            return {w: {"is_valid": True, "word": w, "pronunciation": "", "difficulty": 2,
+                        "meanings": [{"partOfSpeech": "noun", "korean": f"{w} 뜻"}]} for w in batch}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(GeminiService, "get_word_definitions", definitions)
+
+        response = client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("page.png", b"\x89PNG fake", "image/png")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert log == [words[:10], "extracted", words[10:]]  # 첫 묶음은 추출이 끝나기 전에 시작
+        data = response.json()
+        assert [w["word"] for w in data["words"]] == words
+        assert data["total_extracted"] == 12
+
+    def test_definer_uses_its_own_session(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+        from app.services.word_service import WordService
+
+        extract_sessions, define_sessions = [], []
+        original_ocr, original_define = ocr._ocr_image, WordService.get_or_create_words
+
+        async def tracking_ocr(db, image, content_type, on_word=None):
+            extract_sessions.append(db)
+            return await original_ocr(db, image, content_type, on_word=on_word)
+
+        async def tracking_define(self, db, words, **kwargs):
+            define_sessions.append(db)
+            return await original_define(self, db, words, **kwargs)
+
+        async def definitions(self, batch):
+            return {w: None for w in batch}
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            on_word("apple")
+            return {"words": ["apple"], "raw_text": ""}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(GeminiService, "get_word_definitions", definitions)
+        monkeypatch.setattr(ocr, "_ocr_image", tracking_ocr)
+        monkeypatch.setattr(WordService, "get_or_create_words", tracking_define)
+
+        response = client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("page.png", b"\x89PNG fake", "image/png")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(extract_sessions) == len(define_sessions) == 1
+        assert define_sessions[0] is not extract_sessions[0]
+
+
+def _pdf(pages):
+    """최소 PDF — 문자열 페이지는 텍스트 레이어 한 줄, None은 빈 페이지(텍스트 레이어 없음)"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        content = f"BT /F1 14 Tf 72 720 Td ({text}) Tj ET" if text else ""
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return out
+
+
+class TestPdfScan:
+    """/ocr/scan PDF — 텍스트 레이어는 Vision 없이, 텍스트 레이어 없는 페이지만 Vision"""
+
+    def _setup(self, monkeypatch, vision_words):
+        calls = []
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            calls.append(mime_type)
+            return {"words": list(vision_words), "raw_text": ""}
+
+        async def definitions(self, words):
+            return {w: {"is_valid": True, "word": w, "pronunciation": "", "difficulty": 2,
+                        "meanings": [{"partOfSpeech": "noun", "korean": f"{w} 뜻"}]} for w in words}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(GeminiService, "get_word_definitions", definitions)
+        return calls
+
+    def _scan(self, client, auth_headers, pdf):
+        return client.post(
+            "/api/v1/ocr/scan",
+            files={"image": ("handout.pdf", pdf, "application/pdf")},
+            headers=auth_headers,
+        )
+
+    def test_text_layer_is_read_without_vision(self, client, auth_headers, monkeypatch):
+        calls = self._setup(monkeypatch, [])
+
+        response = self._scan(client, auth_headers, _pdf(["Reluctant students give up", "Students are reluctant 42"]))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert calls == []
+        assert [w["word"] for w in data["words"]] == ["reluctant", "students", "give", "up", "are"]
+        assert "Reluctant students give up" in data["raw_text"]
+
+    def test_image_only_page_falls_back_to_vision(self, client, auth_headers, monkeypatch):
+        calls = self._setup(monkeypatch, ["harvest", "meadow"])
+
+        response = self._scan(client, auth_headers, _pdf([None, "Meadow and river"]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert calls == ["image/jpeg"]  # 빈 페이지만 렌더링해 Vision으로
+        assert [w["word"] for w in response.json()["words"]] == ["harvest", "meadow", "and", "river"]
+
+    def test_image_pages_use_their_own_sessions(self, client, auth_headers, db_session, monkeypatch):
+        from app.api.v1 import ocr
+
+        sessions = []
+        original = ocr._ocr_image
+
+        async def tracking(db, image, content_type, on_word=None):
+            sessions.append(db)
+            return await original(db, image, content_type, on_word=on_word)
+
+        self._setup(monkeypatch, ["harvest"])
+        monkeypatch.setattr(ocr, "_ocr_image", tracking)
+
+        response = self._scan(client, auth_headers, _pdf([None, "Meadow", None]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len({id(s) for s in sessions}) == 2 and db_session not in sessions
+
+    def _fail_first_vision_call(self, monkeypatch, calls, failures=1):
+        """첫 `failures`번의 Vision 호출은 실패 (None → 503). 실패는 OCR 캐시에 남지 않는다"""
+        from collections import defaultdict
+        from app.core import rate_limit
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            calls.append(mime_type)
+            return None if len(calls) <= failures else {"words": ["harvest"], "raw_text": "harvest"}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        monkeypatch.setattr(rate_limit, "_memory_buckets", defaultdict(list))
+        return rate_limit._memory_buckets
+
+    def test_failed_image_page_is_reported_and_refunded(self, client, auth_headers, monkeypatch):
+        calls = self._setup(monkeypatch, [])
+        buckets = self._fail_first_vision_call(monkeypatch, calls)
+
+        response = self._scan(client, auth_headers, _pdf([None, "Meadow", None]))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert {w["word"] for w in data["words"]} == {"harvest", "meadow"}  # 순서는 실패한 페이지에 따라
+        assert len(data["failed_pages"]) == 1 and data["failed_pages"][0]["page"] in (1, 3)
+        # 요청 1회 + 두 번째 이미지 페이지 1회를 세고, 실패한 페이지 몫은 돌려준다
+        assert [len(v) for k, v in buckets.items() if k.startswith("ratelimit:ocr_scan:")] == [1]
+
+    def test_all_image_pages_failing_is_503_despite_text_pages(self, client, auth_headers, monkeypatch):
+        calls = self._setup(monkeypatch, [])
+        buckets = self._fail_first_vision_call(monkeypatch, calls, failures=2)
+
+        response = self._scan(client, auth_headers, _pdf([None, "Meadow", None]))
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert [len(v) for k, v in buckets.items() if k.startswith("ratelimit:ocr_scan:")] == [1]
+
+    def test_text_only_pdf_reports_no_failed_pages(self, client, auth_headers, monkeypatch):
+        self._setup(monkeypatch, [])
+
+        response = self._scan(client, auth_headers, _pdf(["Meadow"]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["failed_pages"] == []
+
+    def test_too_many_pages_is_rejected(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+
+        calls = self._setup(monkeypatch, [])
+        response = self._scan(client, auth_headers, _pdf(["page"] * (ocr.MAX_PDF_PAGES + 1)))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert calls == []
+
+    def test_words_from_text(self):
+        from app.services.pdf_text import words_from_text
+
+        text = "Don’t give up!\n① a 2024 I x well-known Give"
+        assert words_from_text(text) == ["don't", "give", "up", "a", "i", "well-known"]
+
+
+class TestUploadMemory:
+    """업로드를 통째로 메모리에 올리지 않는다 — 받는 도중 크기 제한, 파일에서 바로 전처리"""
+
+    def _multipart(self, payload_size):
+        boundary = "scanvoca-test"
+        head = (f'--{boundary}\r\nContent-Disposition: form-data; name="image"; filename="big.jpg"\r\n'
+                f"Content-Type: image/jpeg\r\n\r\n").encode()
+        return boundary, head + b"\0" * payload_size + f"\r\n--{boundary}--\r\n".encode()
+
+    def test_oversized_body_is_rejected_before_parsing(self, client, auth_headers, monkeypatch):
+        from app.api.v1 import ocr
+
+        calls = []
+
+        async def extract(self, image_bytes, mime_type, on_word=None):
+            calls.append(len(image_bytes))
+            return {"words": [], "raw_text": ""}
+
+        monkeypatch.setattr(GeminiService, "extract_words_from_image", extract)
+        boundary, body = self._multipart(ocr.MAX_FILE_SIZE + 128 * 1024)
+        headers = {**auth_headers, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+        declared = client.post("/api/v1/ocr/scan", content=body, headers=headers)
+        # 길이 없이(chunked) 보내면 받은 바이트를 세다가 끊는다
+        chunks = (body[start:start + 1024 * 1024] for start in range(0, len(body), 1024 * 1024))
+        streamed = client.post("/api/v1/ocr/scan", content=chunks, headers=headers)
+
+        assert declared.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert streamed.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert calls == []
+
+    def test_preprocess_reads_upload_file_directly(self):
+        import tempfile
+        from app.services.image_preprocess import Options, preprocess
+
+        raw = _page_jpeg()
+        options = Options(max_long_edge=1600, jpeg_quality=85, grayscale=True, crop_margins=True)
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as upload:
+            upload.write(raw)
+            upload.seek(0)
+            assert preprocess(upload, "image/jpeg", options) == preprocess(raw, "image/jpeg", options)
+
+            # 전처리가 도움이 안 되면 원본 바이트를 그대로 (파일 처음부터)
+            upload.seek(0)
+            upload.truncate()
+            upload.write(b"not an image")
+            upload.seek(5)
+            assert preprocess(upload, "image/png", options) == (b"not an image", "image/png")
+
+    def test_vision_payload_is_raw_bytes(self):
+        import asyncio
+
+        sent = {}
+
+        class Model:
+            model_name = "models/gemini-2.5-flash"
+
+            def generate_content(self, contents, **kwargs):
+                sent["data"] = contents[1]["inline_data"]["data"]
+                return type("Response", (), {"text": "[]", "usage_metadata": None})()
+
+        service = GeminiService()
+        service.vision_model = Model()
+        asyncio.run(service.extract_words_from_image(b"\xff\xd8 jpeg", "image/jpeg"))
+
+        assert sent["data"] == b"\xff\xd8 jpeg"  # base64 문자열 사본 없이
@@ -2,9 +2,17 @@
 단어 API 테스트
 /api/v1/words 엔드포인트
 """
+import asyncio
+import json
+
 import pytest
 from fastapi import status
+from app.core.config import settings
+from app.models.rejected_word import RejectedWord
+from app.models.user import User
+from app.models.word_form import WordForm
 from app.models.word import Word
+from app.services.gemini_service import GeminiService
 
 
 class TestSearchWords:
@@ -85,6 +93,82 @@ class TestSearchWords:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestAutocompleteIndex:
+    """/words/search 자동완성 인덱스 — 사용량 순 정렬, 커밋 즉시 반영, 삭제된 행 자가 치유"""
+
+    def test_ranked_by_usage_then_difficulty(self, client, auth_headers, db_session):
+        db_session.add_all([
+            Word(word="apply", meanings=[{"partOfSpeech": "verb", "korean": "신청하다"}], source="test",
+                 usage_count=3, difficulty=3),
+            Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test",
+                 usage_count=3, difficulty=1),
+            Word(word="appeal", meanings=[{"partOfSpeech": "noun", "korean": "호소"}], source="test", usage_count=10),
+            Word(word="append", meanings=[{"partOfSpeech": "verb", "korean": "덧붙이다"}], source="test"),
+            Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test", usage_count=50),
+        ])
+        db_session.commit()
+
+        response = client.get("/api/v1/words/search?q=App", headers=auth_headers)
+        assert [w["word"] for w in response.json()] == ["appeal", "apple", "apply", "append"]
+
+        # 짧은 접두어(메모 대상)도 같은 순서, limit만큼
+        response = client.get("/api/v1/words/search?q=a&limit=2", headers=auth_headers)
+        assert [w["word"] for w in response.json()] == ["appeal", "apple"]
+
+    def test_commits_update_loaded_index(self, client, auth_headers, db_session):
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test", usage_count=1))
+        db_session.commit()
+        assert [w["word"] for w in client.get("/api/v1/words/search?q=a", headers=auth_headers).json()] == ["apple"]
+
+        db_session.add(Word(word="apricot", meanings=[{"partOfSpeech": "noun", "korean": "살구"}], source="test", usage_count=5))
+        db_session.commit()
+        data = client.get("/api/v1/words/search?q=a", headers=auth_headers).json()
+        assert [w["word"] for w in data] == ["apricot", "apple"]
+
+        db_session.delete(db_session.query(Word).filter(Word.word == "apricot").one())
+        db_session.commit()
+        data = client.get("/api/v1/words/search?q=a", headers=auth_headers).json()
+        assert [w["word"] for w in data] == ["apple"]
+
+    def test_rows_deleted_elsewhere_are_dropped(self, client, auth_headers, db_session):
+        from sqlalchemy import delete
+        from app.services.word_index import prefix_index
+
+        db_session.add_all([
+            Word(word=f"test{i:02d}", meanings=[{"partOfSpeech": "noun", "korean": f"테스트{i}"}], source="test", usage_count=i)
+            for i in range(5)
+        ])
+        db_session.commit()
+        client.get("/api/v1/words/search?q=test", headers=auth_headers)
+        assert len(prefix_index) == 5
+
+        # 다른 인스턴스의 삭제 — 이 세션의 ORM 이벤트를 거치지 않는다
+        db_session.execute(delete(Word).where(Word.word.in_(["test04", "test03"])))
+        db_session.commit()
+
+        data = client.get("/api/v1/words/search?q=test&limit=3", headers=auth_headers).json()
+        assert [w["word"] for w in data] == ["test02", "test01", "test00"]
+        assert len(prefix_index) == 3
+
+    def test_refresh_pulls_rows_written_elsewhere(self, db_session):
+        from sqlalchemy import insert
+        from app.services import word_index
+
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+        word_index.load(db_session)
+
+        db_session.execute(insert(Word).values(
+            word="apricot", meanings=[{"partOfSpeech": "noun", "korean": "살구"}], source="test",
+            gpt_generated=False, usage_count=7,
+        ))
+        db_session.commit()
+        assert word_index.prefix_index.search("ap", 10) == [(1, "apple")]
+
+        assert word_index.refresh(db_session) >= 1
+        assert [w for _, w in word_index.prefix_index.search("ap", 10)] == ["apricot", "apple"]
+
+
 class TestGetWordById:
     """단어 ID로 조회 테스트"""
 
@@ -238,6 +322,61 @@ class TestGetStats:
         assert data["total_usage"] == 15
         assert data["avg_usage_per_word"] == 7.5
 
+    def test_counters_follow_writes(self, client, auth_headers, db_session):
+        """word_stats 한 행이 추가/수정/삭제/usage flush를 따라간다 (조회 때 다시 집계하지 않음)"""
+        from app.models.word_stats import WordStats
+        from app.services import word_stats, word_usage
+
+        meanings = [{"partOfSpeech": "noun", "korean": "뜻"}]
+        db_session.add(Word(word="seed", meanings=meanings, source="json-db", usage_count=2))
+        db_session.commit()
+        assert word_stats.get(db_session) == {"total_words": 1, "gpt_generated": 0, "total_usage": 2}  # 행 생성
+
+        gpt_word = Word(word="fresh", meanings=meanings, source="gpt", gpt_generated=True, usage_count=1)
+        db_session.add(gpt_word)
+        db_session.commit()
+        asyncio.run(word_usage.record([gpt_word.id, gpt_word.id]))
+        asyncio.run(word_usage.flush(db_session))
+        assert word_stats.get(db_session) == {"total_words": 2, "gpt_generated": 1, "total_usage": 5}
+
+        db_session.expire_all()
+        gpt_word.gpt_generated = False
+        gpt_word.usage_count = 10
+        db_session.commit()
+        assert word_stats.get(db_session) == {"total_words": 2, "gpt_generated": 0, "total_usage": 12}
+
+        db_session.delete(gpt_word)
+        db_session.commit()
+        data = client.get("/api/v1/words/stats", headers=auth_headers).json()
+        assert (data["total_words"], data["gpt_generated"], data["total_usage"]) == (1, 0, 2)
+        assert db_session.query(WordStats).count() == 1
+
+    def test_bulk_insert_updates_counter_row_once(self, db_session):
+        from sqlalchemy import event
+        from app.services import word_stats
+
+        word_stats.rebuild(db_session)
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE word_stats"):
+                statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            db_session.add_all([
+                Word(word=f"bulk{i}", meanings=[{"partOfSpeech": "noun", "korean": "뜻"}], source="gpt",
+                     gpt_generated=i % 2 == 0, usage_count=1)
+                for i in range(20)
+            ])
+            db_session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert len(statements) == 1
+        assert word_stats.get(db_session) == {"total_words": 20, "gpt_generated": 10, "total_usage": 20}
+
 
 class TestGenerateWords:
     """GPT 단어 생성 테스트 (모킹 필요)"""
@@ -263,3 +402,1106 @@ class TestGenerateWords:
         """캐시된 단어 조회 (모킹 필요)"""
         # TODO: 캐시 테스트 구현
         pass
+
+
+class TestGeminiDispatcher:
+    """Gemini 호출이 이벤트 루프를 막지 않고 병렬로 진행되는지 검증"""
+
+    @staticmethod
+    def _service_with_slow_model(delay, active, peak):
+        import threading
+        import time
+
+        lock = threading.Lock()
+
+        class FakeResponse:
+            def __init__(self, word):
+                self.text = json.dumps({
+                    "is_valid": True, "word": word, "pronunciation": "", "difficulty": 1,
+                    "meanings": [{"partOfSpeech": "noun", "korean": "뜻", "english": "meaning"}],
+                })
+
+        class FakeModel:
+            def generate_content(self, prompt, generation_config=None):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(delay)
+                with lock:
+                    active[0] -= 1
+                word = prompt.split('Input: "', 1)[1].split('"', 1)[0]
+                return FakeResponse(word)
+
+        service = GeminiService.__new__(GeminiService)
+        service.model = FakeModel()
+        return service
+
+    def test_word_definitions_run_concurrently(self):
+        import time
+
+        active, peak = [0], [0]
+        service = self._service_with_slow_model(0.2, active, peak)
+        words = ["alpha", "bravo", "charlie", "delta"]
+
+        async def run():
+            return await asyncio.gather(*(service.get_word_definition(w) for w in words))
+
+        started = time.monotonic()
+        results = asyncio.run(run())
+        elapsed = time.monotonic() - started
+
+        assert [r["word"] for r in results] == words
+        assert peak[0] > 1
+        assert elapsed < 0.2 * len(words)
+
+    def test_concurrency_is_capped(self, monkeypatch):
+        import app.services.gemini_service as gemini_module
+
+        monkeypatch.setattr(settings, "GEMINI_MAX_CONCURRENCY", 2)
+        monkeypatch.setattr(gemini_module, "_gemini_executor", None)
+
+        active, peak = [0], [0]
+        service = self._service_with_slow_model(0.05, active, peak)
+
+        async def run():
+            return await asyncio.gather(*(service.get_word_definition(f"w{i}") for i in range(6)))
+
+        asyncio.run(run())
+        # 테스트용 2-스레드 풀은 닫는다 (monkeypatch가 원래 풀로 되돌린다)
+        gemini_module._gemini_executor.shutdown(wait=True)
+
+        assert peak[0] == 2
+
+
+class TestBatchWordDefinitions:
+    """여러 단어를 한 프롬프트로 정의하는 배치 모드"""
+
+    @staticmethod
+    def _entry(word):
+        return {
+            "is_valid": True, "word": word, "pronunciation": "", "difficulty": 2,
+            "meanings": [{"partOfSpeech": "noun", "korean": f"{word} 뜻", "english": word}],
+        }
+
+    def _service(self, batch_payload, calls):
+        entry = self._entry
+
+        class FakeResponse:
+            def __init__(self, text):
+                self.text = text
+
+        class FakeModel:
+            def generate_content(self, prompt, generation_config=None):
+                calls.append(prompt)
+                if "Inputs (JSON array)" in prompt:
+                    return FakeResponse(batch_payload)
+                word = prompt.split('Input: "', 1)[1].split('"', 1)[0]
+                return FakeResponse(json.dumps(entry(word)))
+
+        service = GeminiService.__new__(GeminiService)
+        service.model = FakeModel()
+        return service
+
+    def test_one_call_defines_all_words(self):
+        words = ["apple", "banana", "geet"]
+        payload = json.dumps([
+            self._entry("apple"),
+            self._entry("Banana"),
+            {"is_valid": False, "word": "geet", "reason": "Not a valid English word"},
+        ])
+        calls = []
+        out = asyncio.run(self._service(payload, calls).get_word_definitions(words))
+
+        assert len(calls) == 1
+        assert out["apple"]["meanings"][0]["korean"] == "apple 뜻"
+        assert out["banana"]["word"] == "banana"
+        assert out["geet"]["is_valid"] is False
+
+    def test_missing_or_malformed_entries_fall_back_to_single_calls(self):
+        words = ["apple", "banana", "cherry"]
+        payload = json.dumps([
+            self._entry("apple"),
+            {"is_valid": True, "word": "banana", "meanings": []},
+        ])
+        calls = []
+        out = asyncio.run(self._service(payload, calls).get_word_definitions(words))
+
+        assert len(calls) == 3  # 배치 1회 + banana/cherry 단일 호출
+        assert set(out) == set(words)
+        assert all(out[w]["is_valid"] for w in words)
+
+    def test_unparseable_batch_falls_back_for_every_word(self):
+        calls = []
+        out = asyncio.run(self._service("[{not json", calls).get_word_definitions(["apple", "banana"]))
+
+        assert len(calls) == 3
+        assert out["banana"]["word"] == "banana"
+
+    def test_chunks_by_batch_size(self, monkeypatch):
+        monkeypatch.setattr(settings, "GEMINI_WORD_BATCH_SIZE", 2)
+        calls = []
+        words = ["a1", "a2", "a3", "a4"]
+
+        class FakeModel:
+            def generate_content(self, prompt, generation_config=None):
+                calls.append(prompt)
+                chunk = json.loads(prompt.split("Inputs (JSON array): ", 1)[1].split("\n", 1)[0])
+
+                class R:
+                    text = json.dumps([TestBatchWordDefinitions._entry(w) for w in chunk])
+                return R()
+
+        service = GeminiService.__new__(GeminiService)
+        service.model = FakeModel()
+        out = asyncio.run(service.get_word_definitions(words + ["a1"]))
+
+        assert len(calls) == 2
+        assert list(out) == words
+
+    def test_generate_endpoint_uses_batch_definitions(self, client, auth_headers, db_session, monkeypatch):
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add(Word(word="known", meanings=[{"partOfSpeech": "adjective", "korean": "알려진"}], source="test"))
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/words/generate",
+            json={"words": ["Known", "fresh", "novel", "fresh"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert requested == [["fresh", "novel"]]
+        assert data["db_hits"] == 1
+        assert data["gemini_calls"] == 2
+        assert [r["source"] for r in data["results"]] == ["db", "gemini", "gemini", "gemini"]
+        assert db_session.query(Word).count() == 3
+
+
+class TestGeminiMetrics:
+    """모델 호출별 지연/토큰/비용 기록과 /words/stats 절감액"""
+
+    @staticmethod
+    def _service(replies):
+        class Usage:
+            prompt_token_count = 1000
+            candidates_token_count = 500
+
+        class FakeResponse:
+            usage_metadata = Usage()
+
+            def __init__(self, text):
+                self.text = text
+
+        class FakeModel:
+            model_name = "models/gemini-2.5-flash-lite"
+
+            def generate_content(self, prompt, generation_config=None):
+                return FakeResponse(replies.pop(0))
+
+        service = GeminiService.__new__(GeminiService)
+        service.model = FakeModel()
+        return service
+
+    def test_records_tokens_and_cost_per_method(self):
+        from app.services import gemini_metrics
+
+        payload = json.dumps([TestBatchWordDefinitions._entry("apple"), TestBatchWordDefinitions._entry("banana")])
+        asyncio.run(self._service([payload]).get_word_definitions(["apple", "banana"]))
+
+        stats = gemini_metrics.get_stats()
+        batch = stats["methods"][gemini_metrics.WORD_BATCH_DEFINITION]
+        assert batch["calls"] == 1
+        assert batch["prompt_tokens"] == 1000 and batch["output_tokens"] == 500
+        assert batch["cost_usd"] == pytest.approx((1000 * 0.10 + 500 * 0.40) / 1_000_000)
+        assert batch["latency_histogram"]["le_inf"] == 1
+        assert stats["totals"]["words_defined"] == 2
+        assert gemini_metrics.cost_per_word() == pytest.approx(batch["cost_usd"] / 2)
+
+    def test_counts_parse_failures_and_retries(self):
+        from app.services import gemini_metrics
+
+        good = json.dumps(TestBatchWordDefinitions._entry("apple"))
+        result = asyncio.run(self._service(["{broken", good]).get_word_definition("apple"))
+
+        assert result["word"] == "apple"
+        single = gemini_metrics.get_stats()["methods"][gemini_metrics.WORD_DEFINITION]
+        assert single["calls"] == 2
+        assert single["parse_failures"] == 1
+        assert single["retries"] == 1
+        assert single["parse_failure_rate"] == 50.0
+
+    def test_stats_savings_use_observed_cost(self, client, auth_headers, db_session):
+        from app.services import gemini_metrics
+
+        db_session.add(Word(
+            word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="gpt", usage_count=11,
+        ))
+        db_session.commit()
+
+        data = client.get("/api/v1/words/stats", headers=auth_headers).json()
+        assert data["estimated_cost_saved_usd"] is None  # 아직 관측한 비용 없음
+
+        class Response:
+            class usage_metadata:
+                prompt_token_count = 20000
+                candidates_token_count = 0
+
+        # 20000 입력 토큰 × $0.10/1M = $0.002, 4단어 → 단어당 $0.0005
+        gemini_metrics.record_call(gemini_metrics.WORD_BATCH_DEFINITION, "gemini-2.5-flash-lite", 0.2, Response())
+        gemini_metrics.record_words_defined(4)
+
+        data = client.get("/api/v1/words/stats", headers=auth_headers).json()
+        assert data["cost_per_word_usd"] == 0.0005
+        assert data["estimated_cost_saved_usd"] == 0.005  # 10번 재사용 × 단어당 비용
+
+
+class TestSingleFlightGeneration:
+    """같은 새 단어를 동시에 요청해도 생성은 한 번만, 충돌해도 배치 전체가 실패하지 않음"""
+
+    @staticmethod
+    def _entry(word):
+        return TestBatchWordDefinitions._entry(word)
+
+    def test_concurrent_requests_share_one_generation(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        requested = []
+
+        async def slow_definitions(self, words):
+            requested.append(list(words))
+            await asyncio.sleep(0.05)
+            return {w: TestSingleFlightGeneration._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", slow_definitions)
+        service = WordService()
+
+        async def run():
+            return await asyncio.gather(
+                service.get_or_create_words(db_session, ["handout", "unique"]),
+                service.get_or_create_words(db_session, ["handout"]),
+            )
+
+        first, second = asyncio.run(run())
+
+        assert requested == [["handout", "unique"]]
+        assert first["gemini_calls"] == 2
+        assert second["gemini_calls"] == 0
+        assert second["cache_hits"] == 1
+        assert second["results"][0]["data"]["word"] == "handout"
+        assert db_session.query(Word).filter(Word.word == "handout").count() == 1
+
+    def test_waits_for_other_instance_holding_the_lease(self, db_session, monkeypatch):
+        from app.services import word_service as word_service_module
+
+        async def no_gemini(self, words):
+            raise AssertionError("word leased by another instance must not be generated here")
+
+        async def leased_elsewhere(keys, ttl):
+            # 다른 인스턴스가 리스를 잡고 곧바로 생성 결과를 커밋한 상황
+            db_session.add(Word(word="handout", meanings=[{"partOfSpeech": "noun", "korean": "유인물"}], source="gemini"))
+            db_session.commit()
+            return {key: None for key in keys}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", no_gemini)
+        monkeypatch.setattr(word_service_module, "acquire_leases", leased_elsewhere)
+        monkeypatch.setattr(word_service_module, "_WAIT_POLL_INTERVAL_SECONDS", 0.01)
+
+        out = asyncio.run(word_service_module.WordService().get_or_create_words(db_session, ["handout"]))
+
+        assert out["results"][0]["source"] == "db"
+        assert out["results"][0]["data"]["meanings"][0]["korean"] == "유인물"
+
+    def test_unique_conflict_reuses_committed_row(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        async def racing_definitions(self, words):
+            # 생성하는 사이 다른 요청이 같은 단어를 먼저 커밋
+            db_session.add(Word(word="handout", meanings=[{"partOfSpeech": "noun", "korean": "먼저 저장됨"}], source="gemini"))
+            db_session.commit()
+            return {w: TestSingleFlightGeneration._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", racing_definitions)
+
+        out = asyncio.run(WordService().get_or_create_words(db_session, ["handout", "quiz"]))
+
+        by_word = {r["word"]: r for r in out["results"]}
+        assert by_word["handout"]["source"] == "db"
+        assert by_word["handout"]["data"]["meanings"][0]["korean"] == "먼저 저장됨"
+        assert by_word["quiz"]["source"] == "gemini"
+        assert db_session.query(Word).count() == 2
+
+
+class TestRejectedWords:
+    """Gemini가 거절한 토큰(OCR 노이즈)은 기록해 두고 다시 생성하지 않음"""
+
+    @pytest.fixture
+    def admin_auth_headers(self, client, db_session, test_user_data):
+        client.post("/api/v1/auth/register", json=test_user_data)
+        user = db_session.query(User).filter(User.email == test_user_data["email"]).first()
+        user.is_admin = True
+        db_session.commit()
+        response = client.post("/api/v1/auth/login", json={
+            "email": test_user_data["email"],
+            "password": test_user_data["password"],
+        })
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    @staticmethod
+    def _fake_definitions(requested):
+        async def fake(self, words):
+            requested.append(list(words))
+            return {
+                w: ({"is_valid": False, "word": w, "reason": "Not a valid English word"}
+                    if w == "geet" else TestBatchWordDefinitions._entry(w))
+                for w in words
+            }
+        return fake
+
+    def test_rejected_token_is_recorded_and_skipped(self, db_session, monkeypatch):
+        from app.services import word_cache
+        from app.services.word_service import WordService
+
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions", self._fake_definitions(requested))
+        service = WordService()
+
+        first = asyncio.run(service.get_or_create_words(db_session, ["geet", "apple"]))
+        assert first["results"][0]["source"] == "invalid"
+        assert first["results"][0]["error"] == "Not a valid English word"
+        assert db_session.query(RejectedWord).filter(RejectedWord.word == "geet").count() == 1
+
+        # 음성 캐시가 비어도 테이블에서 걸러낸다
+        word_cache.word_l1.clear()
+        second = asyncio.run(service.get_or_create_words(db_session, ["Geet", "apple"]))
+
+        assert requested == [["geet", "apple"]]
+        assert second["gemini_calls"] == 0
+        assert [r["source"] for r in second["results"]] == ["invalid", "db"]
+        assert asyncio.run(service.get_or_create_word(db_session, "geet")) == (None, "invalid")
+
+    def test_admin_override_allows_regeneration(self, client, admin_auth_headers, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions", self._fake_definitions(requested))
+        asyncio.run(WordService().get_or_create_words(db_session, ["geet"]))
+
+        listed = client.get("/api/v1/admin/rejected-words?search=gee", headers=admin_auth_headers)
+        assert listed.status_code == status.HTTP_200_OK
+        assert listed.json()["total"] == 1
+        assert listed.json()["items"][0]["reason"] == "Not a valid English word"
+
+        response = client.delete("/api/v1/admin/rejected-words/geet", headers=admin_auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert db_session.query(RejectedWord).count() == 0
+        missing = client.delete("/api/v1/admin/rejected-words/geet", headers=admin_auth_headers)
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+        asyncio.run(WordService().get_or_create_words(db_session, ["geet"]))
+        assert requested == [["geet"], ["geet"]]
+
+    def test_rejected_words_admin_only(self, client, auth_headers):
+        response = client.get("/api/v1/admin/rejected-words", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestFuzzyMatching:
+    """거절된 OCR 토큰만 자주 쓰이는 사전 단어로 교정 — 유효한 단어와 직접 입력은 교정하지 않음"""
+
+    def test_matcher_rules(self):
+        from app.services.word_fuzzy import SymSpellIndex
+
+        index = SymSpellIndex()
+        index.build([("believe", 10), ("modern", 5), ("modem", 1), ("different", 3),
+                     ("window", 4), ("meet", 9), ("feet", 9), ("river", 3), ("rover", 3)])
+
+        assert index.lookup("beleive") == ("believe", 1)   # 인접 글자 뒤바뀜
+        assert index.lookup("diferrent") == ("different", 2)
+        assert index.lookup("rnodern") == ("modern", 1)    # rn → m
+        assert index.lookup("vvindow") == ("window", 1)    # vv → w
+        assert index.lookup("believe") is None             # 이미 사전 단어
+        assert index.lookup("geet") is None                # 너무 짧음
+        assert index.lookup("raver") is None               # river/rover 중 어느 쪽인지 모름
+
+        # 거리가 달라도 비슷하게 쓰이는 후보가 있으면 고르지 않는다
+        index.build([("reliable", 10), ("reliably", 8)])
+        assert index.lookup("reliabel") is None
+        assert index.lookup("xylophone") is None
+
+    @staticmethod
+    def _rejecting_definitions(requested, invalid):
+        async def fake(self, words):
+            requested.append(list(words))
+            return {
+                w: ({"is_valid": False, "word": w, "reason": "Not a valid English word"}
+                    if w in invalid else TestBatchWordDefinitions._entry(w))
+                for w in words
+            }
+        return fake
+
+    def test_rejected_ocr_token_resolves_to_known_word(self, db_session, monkeypatch):
+        from app.services import word_cache
+        from app.services.word_service import WordService
+
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions",
+                            self._rejecting_definitions(requested, {"beleive"}))
+        db_session.add(Word(word="believe", meanings=[{"partOfSpeech": "verb", "korean": "믿다"}],
+                            source="test", usage_count=12))
+        db_session.commit()
+
+        data = asyncio.run(WordService().get_or_create_words(db_session, ["beleive", "handout"], correct_typos=True))
+
+        assert requested == [["beleive", "handout"]]
+        corrected = data["results"][0]
+        assert corrected["word"] == "beleive"
+        assert corrected["matched_word"] == "believe"
+        assert corrected["match_type"] == "fuzzy"
+        assert corrected["data"]["meanings"][0]["korean"] == "믿다"
+        assert data["results"][1].get("match_type") is None
+        assert db_session.query(Word).filter(Word.word == "beleive").count() == 0
+
+        # 거절 기록이 있는 토큰은 Gemini 없이 바로 교정
+        word_cache.word_l1.clear()
+        again = asyncio.run(WordService().get_or_create_words(db_session, ["beleive"], correct_typos=True))
+        assert requested == [["beleive", "handout"]]
+        assert again["results"][0]["matched_word"] == "believe"
+
+    def test_typed_words_are_never_corrected(self, client, auth_headers, db_session, monkeypatch):
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions",
+                            self._rejecting_definitions(requested, {"beleive"}))
+        db_session.add(Word(word="believe", meanings=[{"partOfSpeech": "verb", "korean": "믿다"}],
+                            source="test", usage_count=12))
+        db_session.commit()
+
+        response = client.post("/api/v1/words/generate", json={"words": ["beleive"]}, headers=auth_headers)
+
+        result = response.json()["results"][0]
+        assert result["source"] == "invalid"
+        assert result.get("matched_word") is None
+
+    def test_valid_neighbours_of_known_words_are_not_corrected(self, client, auth_headers, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        known = ["adapt", "desert", "device", "advice", "angle", "diary", "latter", "principal", "through", "county"]
+        requested_words = ["adopt", "dessert", "devise", "advise", "angel", "dairy", "later", "principle",
+                           "thorough", "count"]
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions", self._rejecting_definitions(requested, set()))
+        db_session.add_all([
+            Word(word=w, meanings=[{"partOfSpeech": "noun", "korean": w}], source="test", usage_count=500)
+            for w in known
+        ])
+        db_session.commit()
+
+        ocr = asyncio.run(WordService().get_or_create_words(db_session, requested_words[:5], correct_typos=True))
+        typed = client.post("/api/v1/words/generate", json={"words": requested_words[5:]}, headers=auth_headers)
+
+        results = ocr["results"] + typed.json()["results"]
+        assert [r["word"] for r in results] == requested_words
+        assert all(r["source"] == "gemini" and r.get("matched_word") is None for r in results)
+        assert db_session.query(Word).count() == len(known) + len(requested_words)
+
+    def test_unused_words_are_not_correction_targets(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        requested = []
+        monkeypatch.setattr(GeminiService, "get_word_definitions",
+                            self._rejecting_definitions(requested, {"beleive"}))
+        db_session.add(Word(word="believe", meanings=[{"partOfSpeech": "verb", "korean": "믿다"}],
+                            source="test", usage_count=1))
+        db_session.commit()
+
+        out = asyncio.run(WordService().get_or_create_words(db_session, ["beleive"], correct_typos=True))
+        assert requested == [["beleive"]]
+        assert out["results"][0]["source"] == "invalid"
+
+
+class TestHeadwordNormalization:
+    """굴절형/철자 변형은 이미 있는 표제어 항목으로 답하고 새 단어를 만들지 않음"""
+
+    def test_lemma_candidates(self):
+        from app.services.word_forms import lemma_candidates
+
+        assert "abandon" in lemma_candidates("abandoned")
+        assert "abandon" in lemma_candidates("abandoning")
+        assert lemma_candidates("abandons") == ["abandon"]
+        assert lemma_candidates("studies")[0] == "study"
+        assert lemma_candidates("notes")[0] == "note"
+        assert lemma_candidates("hoping")[0] == "hope"
+        assert lemma_candidates("running")[0] == "run"
+        assert lemma_candidates("went") == ["go"]
+        assert lemma_candidates("news") == []
+        assert lemma_candidates("teacher") == []
+        assert lemma_candidates("agreed") == ["agree"]
+        assert lemma_candidates("visited")[-1] == "visit"
+
+    def test_real_words_are_not_cut_to_other_headwords(self):
+        from app.services.word_forms import lemma_candidates
+
+        wrong = {"seed": "see", "shed": "she", "feed": "fee", "weed": "wee", "cares": "car",
+                 "caring": "car", "hated": "hat", "left": "leave", "found": "find", "bit": "bite",
+                 "saw": "see", "rose": "rise", "lay": "lie", "better": "good"}
+        for token, headword in wrong.items():
+            assert headword not in lemma_candidates(token), token
+        assert lemma_candidates("cares") == ["care"]
+        assert lemma_candidates("hated") == ["hate"]
+
+    def test_homographs_are_generated_as_themselves(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add_all([
+            Word(word=w, meanings=[{"partOfSpeech": "noun", "korean": w}], source="test")
+            for w in ["see", "she", "fee", "car", "hat", "leave", "find", "good"]
+        ])
+        db_session.commit()
+
+        tokens = ["seed", "shed", "feed", "cares", "hated", "left", "found", "better"]
+        out = asyncio.run(WordService().get_or_create_words(db_session, tokens))
+
+        assert requested == [tokens]
+        assert all(r["source"] == "gemini" and r.get("matched_word") is None for r in out["results"])
+
+    def test_parse_seed_derived_column(self):
+        from app.services.word_forms import parse_derived_column
+
+        assert parse_derived_column("color", "/ colour") == [("colour", "color", "variant")]
+        assert parse_derived_column("agree", "(disagree)") == [("disagree", "agree", "derivative")]
+        assert parse_derived_column("program", "/ programme (programmatic)") == [
+            ("programmatic", "program", "derivative"),
+            ("programme", "program", "variant"),
+        ]
+        assert parse_derived_column("okay", "/ okey / OK") == [
+            ("okey", "okay", "variant"), ("ok", "okay", "variant"),
+        ]
+
+    def test_inflections_and_variants_resolve_to_headword(self, client, auth_headers, db_session, monkeypatch):
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add_all([
+            Word(word="abandon", meanings=[{"partOfSpeech": "verb", "korean": "버리다"}], source="test"),
+            Word(word="color", meanings=[{"partOfSpeech": "noun", "korean": "색"}], source="test"),
+            Word(word="agree", meanings=[{"partOfSpeech": "verb", "korean": "동의하다"}], source="test"),
+            WordForm(form="colour", headword="color", relation="variant"),
+            WordForm(form="disagree", headword="agree", relation="derivative"),
+        ])
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/words/generate",
+            json={"words": ["abandoned", "Abandons", "abandoning", "colour", "disagree"]},
+            headers=auth_headers,
+        )
+
+        results = response.json()["results"]
+        assert [(r["matched_word"], r["match_type"]) for r in results] == [
+            ("abandon", "lemma"), ("abandon", "lemma"), ("abandon", "lemma"),
+            ("color", "variant"), (None, None),
+        ]
+        assert results[0]["data"]["meanings"][0]["korean"] == "버리다"
+        # 파생어는 뜻이 다른 별개 단어 — 새로 생성
+        assert requested == [["disagree"]]
+        assert db_session.query(Word).count() == 4
+
+    def test_seeding_can_skip_normalization(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add(Word(word="build", meanings=[{"partOfSpeech": "verb", "korean": "짓다"}], source="test"))
+        db_session.commit()
+
+        out = asyncio.run(WordService().get_or_create_words(db_session, ["building"], match_variants=False))
+        assert requested == [["building"]]
+        assert out["results"][0]["source"] == "gemini"
+
+
+class TestUsageWriteBehind:
+    """usage_count는 요청마다 UPDATE하지 않고 누적했다가 한 번에 반영"""
+
+    def test_lookups_are_counted_on_flush(self, db_session):
+        from app.services import word_usage
+        from app.services.word_service import WordService
+
+        db_session.add_all([
+            Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test", usage_count=1),
+            Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test", usage_count=2),
+            Word(word="cherry", meanings=[{"partOfSpeech": "noun", "korean": "체리"}], source="test"),
+        ])
+        db_session.commit()
+        service = WordService()
+
+        asyncio.run(service.get_or_create_words(db_session, ["apple", "banana"]))
+        asyncio.run(service.get_or_create_word(db_session, "cherry"))
+
+        counts = dict(db_session.query(Word.word, Word.usage_count).all())
+        assert counts == {"apple": 1, "banana": 2, "cherry": 0}  # 아직 DB에 안 씀
+        assert asyncio.run(word_usage.pending_total()) == 3
+
+        assert asyncio.run(word_usage.flush(db_session)) == 3
+        db_session.expire_all()
+        counts = dict(db_session.query(Word.word, Word.usage_count).all())
+        assert counts == {"apple": 2, "banana": 3, "cherry": 1}
+        assert asyncio.run(word_usage.pending_total()) == 0
+        assert asyncio.run(word_usage.flush(db_session)) == 0
+
+    def test_flush_keeps_updated_at(self, db_session):
+        from app.services import word_usage
+
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        updated_at = word.updated_at
+
+        asyncio.run(word_usage.record([word.id, word.id]))
+        asyncio.run(word_usage.flush(db_session))
+
+        db_session.expire_all()
+        assert word.usage_count == 2
+        assert word.updated_at == updated_at
+
+    def test_failed_flush_keeps_increments(self, db_session, monkeypatch):
+        from app.services import word_usage
+
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        asyncio.run(word_usage.record([word.id]))
+
+        def broken_apply(db, increments):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(word_usage, "_apply", broken_apply)
+        assert asyncio.run(word_usage.flush(db_session)) == 0
+        assert asyncio.run(word_usage.pending_total()) == 1
+
+        monkeypatch.undo()
+        assert asyncio.run(word_usage.flush(db_session)) == 1
+        db_session.expire_all()
+        assert word.usage_count == 1
+
+    def test_stats_include_pending_usage(self, client, auth_headers, db_session):
+        from app.services import word_usage
+
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test", usage_count=4)
+        db_session.add(word)
+        db_session.commit()
+        asyncio.run(word_usage.record([word.id]))
+
+        data = client.get("/api/v1/words/stats", headers=auth_headers).json()
+        assert data["total_usage"] == 5
+        assert data["avg_usage_per_word"] == 5.0
+
+
+class TestWordSnapshot:
+    """사전 전체 스냅샷 — ETag/If-None-Match로 바뀌었을 때만 내려받음"""
+
+    def test_snapshot_contains_dictionary(self, client, auth_headers, db_session):
+        db_session.add_all([
+            Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"),
+            Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test"),
+        ])
+        db_session.commit()
+
+        response = client.get("/api/v1/words/snapshot", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"]
+        data = response.json()
+        assert data["fields"] == ["id", "word", "pronunciation", "difficulty", "meanings"]
+        words = [dict(zip(data["fields"], row)) for row in data["words"]]
+        assert [w["word"] for w in words] == ["apple", "banana"]
+        assert words[0]["meanings"][0]["korean"] == "사과"
+
+    def test_if_none_match_returns_304(self, client, auth_headers, db_session):
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+        etag = client.get("/api/v1/words/snapshot", headers=auth_headers).headers["etag"]
+
+        response = client.get("/api/v1/words/snapshot", headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_version_follows_dictionary_changes(self, client, auth_headers, db_session):
+        from app.services import word_usage
+
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        first = client.get("/api/v1/words/snapshot", headers=auth_headers).headers["etag"]
+
+        # 사용량 flush는 사전 내용이 아니므로 버전을 바꾸지 않는다
+        asyncio.run(word_usage.record([word.id]))
+        asyncio.run(word_usage.flush(db_session))
+        assert client.get("/api/v1/words/snapshot", headers=auth_headers).headers["etag"] == first
+
+        db_session.add(Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test"))
+        db_session.commit()
+        response = client.get("/api/v1/words/snapshot", headers={**auth_headers, "If-None-Match": first})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != first
+        assert len(response.json()["words"]) == 2
+
+    def test_build_reads_off_the_event_loop_on_its_own_session(self, client, auth_headers, db_session, monkeypatch):
+        import threading
+        from app.services import word_snapshot
+
+        reads, loop_threads = [], []
+        rows, current_version = word_snapshot._rows, word_snapshot.current_version
+
+        def tracking_rows(db):
+            reads.append((db, threading.current_thread()))
+            return rows(db)
+
+        def tracking_version(db):
+            loop_threads.append(threading.current_thread())  # 버전 확인은 이벤트 루프에서
+            return current_version(db)
+
+        monkeypatch.setattr(word_snapshot, "_rows", tracking_rows)
+        monkeypatch.setattr(word_snapshot, "current_version", tracking_version)
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+
+        response = client.get("/api/v1/words/snapshot", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        [(db, thread)] = reads
+        assert db is not db_session and thread not in loop_threads
+
+    def test_snapshot_no_auth(self, client):
+        response = client.get("/api/v1/words/snapshot")
+
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+
+class TestWordChanges:
+    """커서 이후 추가/수정/삭제된 단어만 페이지 단위로 받는 증분 동기화"""
+
+    @pytest.fixture(autouse=True)
+    def _no_settle_delay(self, monkeypatch):
+        monkeypatch.setattr(settings, "WORD_CHANGES_SETTLE_SECONDS", 0)
+
+    def _sync(self, client, auth_headers, since=None, limit=None):
+        params = {k: v for k, v in {"since": since, "limit": limit}.items() if v is not None}
+        response = client.get("/api/v1/words/changes", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def test_pages_through_dictionary(self, client, auth_headers, db_session):
+        db_session.add_all([
+            Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"),
+            Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test"),
+            Word(word="cherry", meanings=[{"partOfSpeech": "noun", "korean": "체리"}], source="test"),
+        ])
+        db_session.commit()
+
+        first = self._sync(client, auth_headers, limit=2)
+        assert [w["word"] for w in first["changes"]] == ["apple", "banana"]
+        assert first["has_more"] is True
+
+        second = self._sync(client, auth_headers, since=first["next_cursor"], limit=2)
+        assert [w["word"] for w in second["changes"]] == ["cherry"]
+        assert second["has_more"] is False
+
+        third = self._sync(client, auth_headers, since=second["next_cursor"])
+        assert third["changes"] == [] and third["deleted"] == []
+        assert third["next_cursor"] == second["next_cursor"]
+
+    def test_updates_and_deletes_after_cursor(self, client, auth_headers, db_session):
+        apple = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        banana = Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test")
+        db_session.add_all([apple, banana])
+        db_session.commit()
+        cursor = self._sync(client, auth_headers)["next_cursor"]
+
+        apple.pronunciation = "ˈæpl"
+        db_session.commit()
+        banana_id = banana.id
+        db_session.delete(banana)
+        db_session.commit()
+
+        page = self._sync(client, auth_headers, since=cursor)
+        assert [w["word"] for w in page["changes"]] == ["apple"]
+        assert page["changes"][0]["pronunciation"] == "ˈæpl"
+        assert [(d["word_id"], d["word"]) for d in page["deleted"]] == [(banana_id, "banana")]
+
+    def test_usage_flush_is_not_a_change(self, client, auth_headers, db_session):
+        from app.services import word_usage
+
+        word = Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test")
+        db_session.add(word)
+        db_session.commit()
+        cursor = self._sync(client, auth_headers)["next_cursor"]
+
+        asyncio.run(word_usage.record([word.id]))
+        asyncio.run(word_usage.flush(db_session))
+
+        assert self._sync(client, auth_headers, since=cursor)["changes"] == []
+
+    def test_recent_rows_wait_for_settle_window(self, client, auth_headers, db_session, monkeypatch):
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+        monkeypatch.setattr(settings, "WORD_CHANGES_SETTLE_SECONDS", 60)
+
+        assert self._sync(client, auth_headers)["changes"] == []
+
+    def test_snapshot_cursor_continues_sync(self, client, auth_headers, db_session):
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+        cursor = client.get("/api/v1/words/snapshot", headers=auth_headers).json()["cursor"]
+
+        db_session.add(Word(word="banana", meanings=[{"partOfSpeech": "noun", "korean": "바나나"}], source="test"))
+        db_session.commit()
+
+        page = self._sync(client, auth_headers, since=cursor)
+        assert "banana" in [w["word"] for w in page["changes"]]
+
+    def test_invalid_cursor(self, client, auth_headers):
+        response = client.get("/api/v1/words/changes?since=not-a-cursor", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestStreamingGenerate:
+    """/words/generate/stream — 확정된 단어부터 한 줄씩, 마지막 줄은 집계"""
+
+    @staticmethod
+    def _frames(response):
+        return [json.loads(line) for line in response.text.splitlines() if line]
+
+    def test_known_words_stream_before_generated_ones(self, client, auth_headers, db_session, monkeypatch):
+        async def fake_definitions(self, words):
+            await asyncio.sleep(0.05)
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/words/generate/stream",
+            json={"words": ["handout", "Apple", "apple"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        frames = self._frames(response)
+        assert [(f["type"], f.get("index")) for f in frames] == [
+            ("result", 1), ("result", 2), ("result", 0), ("summary", None),
+        ]
+        assert frames[0]["word"] == "Apple" and frames[0]["source"] == "db"
+        assert frames[2]["source"] == "gemini"
+        assert frames[-1] == {"type": "summary", "cache_hits": 0, "db_hits": 1, "gemini_calls": 1}
+
+    def test_gemini_batches_stream_independently(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        async def fake_definitions(self, words):
+            # "slow"가 든 묶음만 늦게 끝난다
+            await asyncio.sleep(0.2 if "slow" in words else 0)
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+
+        async def collect():
+            return [f async for f in WordService().stream_words(db_session, ["slow", "quick", "fast"], chunk_size=1)]
+
+        frames = asyncio.run(collect())
+        assert [f["word"] for f in frames if f["type"] == "result"][-1] == "slow"
+        assert frames[-1]["gemini_calls"] == 3
+
+    def test_concurrent_batches_use_their_own_sessions(self, db_session, monkeypatch):
+        from app.services.word_service import WordService
+
+        sessions = []
+        original = WordService._resolve_unknown_words
+
+        async def tracking(self, db, words):
+            sessions.append(db)
+            return await original(self, db, words)
+
+        async def fake_definitions(self, words):
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        monkeypatch.setattr(WordService, "_resolve_unknown_words", tracking)
+
+        async def collect():
+            return [f async for f in WordService().stream_words(db_session, ["alpha", "beta", "gamma"], chunk_size=1)]
+
+        frames = asyncio.run(collect())
+        assert frames[-1]["gemini_calls"] == 3
+        assert len({id(s) for s in sessions}) == 3 and db_session not in sessions
+        assert db_session.query(Word).count() == 3
+
+    def test_matches_non_streaming_results(self, client, auth_headers, db_session, monkeypatch):
+        async def fake_definitions(self, words):
+            return {
+                w: {"is_valid": False, "word": w, "reason": "Not a valid English word"} if w == "geet"
+                else TestBatchWordDefinitions._entry(w)
+                for w in words
+            }
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        words = ["banana", "geet", "banana"]
+
+        streamed = self._frames(client.post("/api/v1/words/generate/stream", json={"words": words},
+                                            headers=auth_headers))
+        results = sorted((f for f in streamed if f["type"] == "result"), key=lambda f: f["index"])
+        assert [(r["source"], r["error"]) for r in results] == [
+            ("gemini", None), ("invalid", "Not a valid English word"), ("gemini", None),
+        ]
+
+        # 같은 입력을 다시 요청하면 (이제 캐시/거절 기록 적중) 일반 응답과 같은 모양
+        plain = client.post("/api/v1/words/generate", json={"words": words}, headers=auth_headers).json()
+        assert [r["source"] for r in plain["results"]] == ["cache", "invalid", "cache"]
+        assert plain["cache_hits"] == 2
+
+
+class TestDeferredGeneration:
+    """defer=true — 새 단어는 큐에 넣고 바로 응답, 워커가 재시도하며 생성"""
+
+    def _generate(self, client, auth_headers, words):
+        response = client.post("/api/v1/words/generate", json={"words": words, "defer": True},
+                               headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def _poll(self, client, auth_headers, words):
+        response = client.get("/api/v1/words/jobs", params={"words": words}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return {s["word"]: s for s in response.json()}
+
+    def test_unknown_words_are_queued_then_generated(self, client, auth_headers, db_session, monkeypatch):
+        from app.services import word_jobs
+
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        db_session.add(Word(word="apple", meanings=[{"partOfSpeech": "noun", "korean": "사과"}], source="test"))
+        db_session.commit()
+
+        data = self._generate(client, auth_headers, ["apple", "handout"])
+        assert requested == []  # 요청 안에서는 Gemini를 부르지 않는다
+        assert [(r["source"], r["queued"]) for r in data["results"]] == [("db", False), ("queued", True)]
+        assert self._poll(client, auth_headers, ["handout"])["handout"]["status"] == "pending"
+
+        assert asyncio.run(word_jobs.process_once(db_session)) == 1
+        assert requested == [["handout"]]
+
+        statuses = self._poll(client, auth_headers, ["handout", "never-asked"])
+        assert statuses["handout"]["status"] == "done"
+        assert statuses["handout"]["data"]["meanings"][0]["korean"] == "handout 뜻"
+        assert statuses["never-asked"]["status"] == "unknown"
+        assert asyncio.run(word_jobs.process_once(db_session)) == 0
+
+    def test_failed_words_are_retried_alone(self, client, auth_headers, db_session, monkeypatch):
+        from app.models.word_job import WordJob
+        from app.services import word_jobs
+
+        requested = []
+
+        async def fake_definitions(self, words):
+            requested.append(list(words))
+            return {w: None if w == "broken" else TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        monkeypatch.setattr(settings, "WORD_JOB_MAX_ATTEMPTS", 2)
+        monkeypatch.setattr(settings, "WORD_JOB_RETRY_BASE_SECONDS", 0)
+        self._generate(client, auth_headers, ["broken", "handout"])
+
+        asyncio.run(word_jobs.process_once(db_session))
+        assert requested == [["broken", "handout"]]
+        assert self._poll(client, auth_headers, ["handout"])["handout"]["status"] == "done"
+        job = db_session.query(WordJob).filter(WordJob.word == "broken").one()
+        assert (job.status, job.attempts) == ("pending", 1)
+
+        asyncio.run(word_jobs.process_once(db_session))
+        assert requested[-1] == ["broken"]
+        failed = self._poll(client, auth_headers, ["broken"])["broken"]
+        assert failed["status"] == "failed" and failed["error"]
+
+        # 다시 요청하면 처음부터 다시 큐에 들어간다
+        self._generate(client, auth_headers, ["broken"])
+        assert self._poll(client, auth_headers, ["broken"])["broken"]["status"] == "pending"
+
+    def test_concurrent_groups_use_their_own_sessions(self, client, auth_headers, db_session, monkeypatch):
+        from app.services import word_jobs
+        from app.services.word_service import WordService
+
+        sessions = []
+        original = WordService.generate_queued
+
+        async def tracking(self, db, words):
+            sessions.append(db)
+            return await original(self, db, words)
+
+        async def fake_definitions(self, words):
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        monkeypatch.setattr(WordService, "generate_queued", tracking)
+        monkeypatch.setattr(settings, "GEMINI_WORD_BATCH_SIZE", 1)
+        self._generate(client, auth_headers, ["handout", "quiz"])
+
+        assert asyncio.run(word_jobs.process_once(db_session)) == 2
+        assert len({id(s) for s in sessions}) == 2 and db_session not in sessions
+        assert self._poll(client, auth_headers, ["handout", "quiz"])["quiz"]["status"] == "done"
+
+    def test_rejected_tokens_are_not_queued(self, client, auth_headers, db_session):
+        from app.models.rejected_word import RejectedWord
+
+        db_session.add(RejectedWord(word="geet", reason="Not a valid English word"))
+        db_session.commit()
+
+        data = self._generate(client, auth_headers, ["geet"])
+        assert (data["results"][0]["source"], data["results"][0]["queued"]) == ("invalid", False)
+        assert self._poll(client, auth_headers, ["geet"])["geet"]["status"] == "invalid"
+
+    def test_expired_lease_is_reclaimed(self, client, auth_headers, db_session, monkeypatch):
+        from app.services import word_jobs
+
+        async def fake_definitions(self, words):
+            return {w: TestBatchWordDefinitions._entry(w) for w in words}
+
+        monkeypatch.setattr(GeminiService, "get_word_definitions", fake_definitions)
+        self._generate(client, auth_headers, ["handout"])
+        monkeypatch.setattr(settings, "WORD_JOB_LEASE_SECONDS", -1)  # 가져간 워커가 죽은 것처럼
+        assert word_jobs.claim(db_session, 10) == [("handout", 1)]
+
+        monkeypatch.setattr(settings, "WORD_JOB_LEASE_SECONDS", 120)
+        assert asyncio.run(word_jobs.process_once(db_session)) == 1
+        assert self._poll(client, auth_headers, ["handout"])["handout"]["status"] == "done"